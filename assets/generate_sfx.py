@@ -7,9 +7,13 @@ SAMPLE_RATE = 44100  # Hz
 
 
 def make_lofi_sweep(
-    start_freq=440, end_freq=440, duration_ms=100, volume=0.5, decay=0.95
+    start_freq=440, end_freq=440, duration_ms=100, volume=0.5, decay=0.95, rng=None
 ):
-    """Generate a short lo-fi sound with a linear pitch sweep."""
+    """Generate a short lo-fi sound with a linear pitch sweep.
+
+    The noise comes from `rng` (a NumPy `Generator`) if given, for
+    reproducible sounds, and from the global NumPy random state otherwise.
+    """
     n_samples = int(SAMPLE_RATE * (duration_ms / 1000.0))
     t = np.linspace(0, duration_ms / 1000.0, n_samples, False)
 
@@ -18,7 +22,7 @@ def make_lofi_sweep(
     tone = np.sin(2 * np.pi * freqs * t)
 
     # Gentle noise overlay
-    noise = np.random.uniform(-0.3, 0.3, n_samples)
+    noise = (rng or np.random).uniform(-0.3, 0.3, n_samples)
     signal = (tone * np.linspace(1, 0, n_samples)) + noise * 0.1
 
     # Apply decay and volume
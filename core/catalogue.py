@@ -0,0 +1,437 @@
+"""Catalogue of the known patterns, free of any Pygame dependency.
+
+Objects are stored in an SQLite file under their object code (apgsearch
+style, see `object_code`) together with their period, movement and, for
+some, a name and an achievement. When an object is added, every phase in
+every orientation is hashed once and indexed, so recognizing an isolated
+object later is one hash and one lookup, without stepping it. Recent
+lookups are kept in a small in-memory cache.
+
+The file is built from the well-known objects below on the first start
+and only read afterwards. Objects found by the soup search can be added
+from its results, thousands at a time:
+
+    python -m core.catalogue import census.json
+
+Used by the `AchievementManager` in game and by the headless soup search.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from core.life import next_generation
+from core.models.achievement import Achievement
+from core.models.pattern import Pattern
+from utils.settings import (
+    PATTERN_CATALOGUE_PATH,
+    PATTERN_HOT_CACHE_SIZE,
+    SEARCH_MAX_PERIOD,
+)
+
+# Objects are the 8-connected groups of live cells
+CONNECTIVITY = np.ones((3, 3), dtype=bool)
+
+# Well-known objects: key, achievement title and description (None for
+# objects that are only named), and the cells ("O" alive, "." dead, "/"
+# between rows)
+WELL_KNOWN = (
+    (
+        "block",
+        "Still-Live: BLOCK",
+        "Well, this one does nothing... (except survive)",
+        "OO/OO",
+    ),
+    (
+        "tub",
+        "Still-Live: TUB",
+        "Looks more like a star to me, but I wasn't asked...",
+        ".O./O.O/.O.",
+    ),
+    (
+        "beehive",
+        "Still-Live: BEEHIVE",
+        "Can you hear them humming?!",
+        ".OO./O..O/.OO.",
+    ),
+    (
+        "loaf",
+        "Still-Live: LOAF",
+        "I think, they never saw real bread...",
+        ".OO./O..O/.O.O/..O.",
+    ),
+    (
+        "boat",
+        "Still-Live: BOAT",
+        "Maybe you see it if you squint reeealy hard?",
+        "OO./O.O/.O.",
+    ),
+    ("blinker", "Oscillator: BLINKER", "At least it does something!", "OOO"),
+    (
+        "glider",
+        "Spaceship: GLIDER",
+        "Now, that's what I call some moves!",
+        ".O./..O/OOO",
+    ),
+    ("ship", None, None, "OO./O.O/.OO"),
+    ("pond", None, None, ".OO./O..O/O..O/.OO."),
+    ("long boat", None, None, "OO../O.O./.O.O/..O."),
+    ("barge", None, None, ".O../O.O./.O.O/..O."),
+    ("toad", None, None, ".OOO/OOO."),
+    ("beacon", None, None, "OO../OO../..OO/..OO"),
+    ("lightweight spaceship", None, None, ".O..O/O..../O...O/OOOO."),
+)
+
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE patterns (
+    code TEXT PRIMARY KEY,
+    name TEXT UNIQUE,
+    title TEXT,
+    description TEXT,
+    min_population INTEGER NOT NULL,
+    max_population INTEGER NOT NULL,
+    period INTEGER NOT NULL,
+    dx INTEGER NOT NULL,
+    dy INTEGER NOT NULL,
+    extent INTEGER NOT NULL,
+    occurrences INTEGER NOT NULL DEFAULT 0
+);
+-- every phase of every object in every orientation, by `pattern_hash`
+CREATE TABLE variants (
+    hash INTEGER PRIMARY KEY,
+    code TEXT NOT NULL REFERENCES patterns (code)
+);
+"""
+
+
+class PatternCatalogue:
+    """Known objects on disk, looked up by the hash of their cells."""
+
+    def __init__(
+        self,
+        path: str | Path = PATTERN_CATALOGUE_PATH,
+        hot_cache_size: int = PATTERN_HOT_CACHE_SIZE,
+    ) -> None:
+        """Open the catalogue, building it first if it is missing or outdated.
+
+        Args:
+            path (str | Path): SQLite file of the catalogue.
+            hot_cache_size (int): Recent lookups (hits and misses) kept in
+                memory.
+        """
+        self.path = Path(path)
+        self.hot_cache_size = hot_cache_size
+        # pattern hash -> object, None for unknown cells
+        self.hot: OrderedDict[int, Pattern | None] = OrderedDict()
+        # lookups come from the analysis threads of every world
+        self._lock = threading.Lock()
+        if _schema_version(self.path) != SCHEMA_VERSION:
+            self._build()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+
+    def __len__(self) -> int:
+        """Number of objects in the catalogue."""
+        with self._lock:
+            return self._db.execute("SELECT count(*) FROM patterns").fetchone()[0]
+
+    def lookup(self, cells: np.ndarray, *, cropped: bool = False) -> Pattern | None:
+        """The object an isolated group of cells is a phase of, if known.
+
+        Args:
+            cells (np.ndarray): The group of cells (non-zero for alive).
+            cropped (bool): Whether `cells` is cut to the group's bounding
+                box already, which saves finding it.
+        """
+        key = pattern_hash(cells if cropped else _crop(cells)[0])
+        with self._lock:
+            if key in self.hot:
+                self.hot.move_to_end(key)
+                return self.hot[key]
+            row = self._db.execute(
+                "SELECT patterns.* FROM variants JOIN patterns USING (code)"
+                " WHERE hash = ?",
+                (key,),
+            ).fetchone()
+            pattern = self.hot[key] = Pattern(*row) if row else None
+            if len(self.hot) > self.hot_cache_size:
+                self.hot.popitem(last=False)
+            return pattern
+
+    def named(self, name: str) -> Pattern | None:
+        """A well-known object by its key."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT * FROM patterns WHERE name = ?", (name,)
+            ).fetchone()
+        return Pattern(*row) if row else None
+
+    def most_common(self, limit: int) -> list[Pattern]:
+        """The objects seen most often in the imported censuses."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT * FROM patterns ORDER BY occurrences DESC, rowid LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [Pattern(*row) for row in rows]
+
+    def achievements(self) -> dict[str, Achievement]:
+        """The objects that unlock achievements, by key."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT name, title, description, code FROM patterns"
+                " WHERE title IS NOT NULL ORDER BY rowid"
+            ).fetchall()
+        return {
+            name: Achievement(title, description, pattern=decode(code))
+            for name, title, description, code in rows
+        }
+
+    def import_census(self, path: str | Path) -> int:
+        """Add the objects of a soup search's results, counting their occurrences.
+
+        Returns:
+            int: Number of objects that were new to the catalogue.
+        """
+        objects = json.loads(Path(path).read_text())["objects"]
+        with self._lock, self._db:
+            before = self._db.execute("SELECT count(*) FROM patterns").fetchone()[0]
+            for name, entry in objects.items():
+                if name.startswith(("xs", "xp", "xq")):
+                    _insert(self._db, decode(name), occurrences=entry["count"])
+                elif not name.startswith("ov"):  # a well-known object's key
+                    self._db.execute(
+                        "UPDATE patterns SET occurrences = occurrences + ?"
+                        " WHERE name = ?",
+                        (entry["count"], name),
+                    )
+            after = self._db.execute("SELECT count(*) FROM patterns").fetchone()[0]
+            self.hot.clear()  # cached misses may be known now
+        return after - before
+
+    def close(self) -> None:
+        """Close the database."""
+        self._db.close()
+
+    def _build(self) -> None:
+        """Create the catalogue from the well-known objects.
+
+        Built next to the target and moved in place, so several processes
+        starting at once (e.g. soup search workers) don't get in each
+        other's way.
+        """
+        print("Building the pattern catalogue...")
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.unlink(missing_ok=True)
+        db = sqlite3.connect(tmp_path)
+        try:
+            db.executescript(SCHEMA)
+            for name, title, description, picture in WELL_KNOWN:
+                _insert(db, _parse(picture), name, title, description)
+            db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            db.commit()
+        finally:
+            db.close()
+        tmp_path.replace(self.path)
+
+
+@lru_cache(maxsize=1)
+def pattern_catalogue() -> PatternCatalogue:
+    """The catalogue of this process (shared by all its users)."""
+    return PatternCatalogue()
+
+
+@lru_cache(maxsize=1)
+def achievement_catalogue() -> dict[str, Achievement]:
+    """Return the patterns that unlock achievements, by key (shared, read-only)."""
+    return pattern_catalogue().achievements()
+
+
+@lru_cache(maxsize=4096)
+def object_code(shape: tuple[int, int], data: bytes) -> str:
+    """Identify an isolated object independent of phase, position and orientation.
+
+    The code starts with `xs<population>` for still lifes, `xp<period>` for
+    oscillators and `xq<period>` for spaceships (like apgsearch), followed by
+    the smallest of the object's bit-packed phases over all orientations.
+    Objects that do not repeat within SEARCH_MAX_PERIOD get `ov<population>`.
+    """
+    cells = np.frombuffer(data, dtype=np.uint8).reshape(shape)
+    return evolve(cells)[0]
+
+
+def evolve(cells: np.ndarray) -> tuple[str, list[np.ndarray], tuple[int, int]]:
+    """Step an isolated object through one period.
+
+    Returns:
+        tuple[str, list[np.ndarray], tuple[int, int]]: Its object code, its
+        (cropped) phases and the cells it moves per period, the larger
+        distance first.
+    """
+    margin = SEARCH_MAX_PERIOD // 2 + 2  # room for c/2 spaceships to move
+    board = np.pad(cells.astype(np.uint8), margin)
+    start, start_origin = _crop(board)
+    phases = [start]
+    for period in range(1, SEARCH_MAX_PERIOD + 1):
+        board = next_generation(board)
+        phase, origin = _crop(board)
+        if phase.shape == start.shape and np.array_equal(phase, start):
+            moved = sorted(
+                (abs(origin[0] - start_origin[0]), abs(origin[1] - start_origin[1])),
+                reverse=True,
+            )
+            if origin != start_origin:
+                prefix = f"xq{period}"
+            elif period == 1:
+                prefix = f"xs{int(start.sum())}"
+            else:
+                prefix = f"xp{period}"
+            code = f"{prefix}_{min(_encode(p) for p in phases)}"
+            return code, phases, (int(moved[0]), int(moved[1]))
+        phases.append(phase)
+    return f"ov{int(start.sum())}_{_encode(start)}", phases, (0, 0)
+
+
+def decode(code: str) -> np.ndarray:
+    """The cells of an object's canonical phase, from its object code."""
+    shape, data = code.split("_")[1:]
+    height, width = map(int, shape.split("x"))
+    bits = np.frombuffer(bytes.fromhex(data), dtype=np.uint8)
+    return np.unpackbits(bits, count=height * width).reshape(height, width)
+
+
+def orientations(cells: np.ndarray) -> list[np.ndarray]:
+    """The eight rotations and reflections of a pattern (some may be equal)."""
+    return [
+        np.rot90(flipped, turns)
+        for flipped in (cells, np.fliplr(cells))
+        for turns in range(4)
+    ]
+
+
+def pattern_hash(cells: np.ndarray) -> int:
+    """64-bit hash of a cropped pattern, including its shape."""
+    height, width = cells.shape
+    data = f"{height}x{width}".encode() + np.packbits(cells != 0).tobytes()
+    digest = hashlib.blake2b(data, digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)  # SQLite's INTEGER
+
+
+def _insert(
+    db: sqlite3.Connection,
+    cells: np.ndarray,
+    name: str | None = None,
+    title: str | None = None,
+    description: str | None = None,
+    occurrences: int = 0,
+) -> None:
+    """Add an object and index its phases, or count more occurrences of it."""
+    code, phases, (dx, dy) = evolve(cells)
+    if code.startswith("ov"):
+        return  # not periodic, so not an object
+    db.execute(
+        "INSERT INTO patterns VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        " ON CONFLICT (code) DO UPDATE SET"
+        " occurrences = occurrences + excluded.occurrences,"
+        " name = coalesce(name, excluded.name),"
+        " title = coalesce(title, excluded.title),"
+        " description = coalesce(description, excluded.description)",
+        (
+            code,
+            name,
+            title,
+            description,
+            min(int(phase.sum()) for phase in phases),
+            max(int(phase.sum()) for phase in phases),
+            len(phases),
+            dx,
+            dy,
+            max(max(phase.shape) for phase in phases),
+            occurrences,
+        ),
+    )
+    db.executemany(
+        "INSERT OR IGNORE INTO variants VALUES (?, ?)",
+        {
+            (pattern_hash(form), code)
+            for phase in phases
+            for form in orientations(phase)
+        },
+    )
+
+
+def _schema_version(path: Path) -> int | None:
+    """Schema version of a catalogue file, None if there is none."""
+    if not path.exists():
+        return None
+    try:
+        db = sqlite3.connect(path)
+        try:
+            return db.execute("PRAGMA user_version").fetchone()[0]
+        finally:
+            db.close()
+    except sqlite3.DatabaseError:
+        return None
+
+
+def _parse(picture: str) -> np.ndarray:
+    """Cells of a picture like ".O./..O/OOO"."""
+    return np.array([[c == "O" for c in row] for row in picture.split("/")], np.uint8)
+
+
+def _crop(board: np.ndarray) -> tuple[np.ndarray, tuple[int, int]]:
+    """The live part of a board and its top-left position."""
+    rows = np.flatnonzero(board.any(axis=1))
+    cols = np.flatnonzero(board.any(axis=0))
+    if not len(rows):
+        return board[:0, :0], (0, 0)
+    top, left = rows[0], cols[0]
+    return board[top : rows[-1] + 1, left : cols[-1] + 1], (top, left)
+
+
+def _encode(cells: np.ndarray) -> str:
+    """Smallest encoding of a pattern over its eight orientations."""
+    return min(
+        f"{form.shape[0]}x{form.shape[1]}_{np.packbits(form).tobytes().hex()}"
+        for form in orientations(cells)
+    )
+
+
+def main() -> None:
+    """Command line entry point: import soup search results, or list the catalogue."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("import", help="add the objects of soup censuses")
+    add.add_argument("census", type=Path, nargs="+")
+    show = commands.add_parser("show", help="list the most common objects")
+    show.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    catalogue = pattern_catalogue()
+    if args.command == "import":
+        for path in args.census:
+            print(f"{path}: {catalogue.import_census(path)} new objects")
+        print(f"{len(catalogue)} objects in {catalogue.path}")
+    else:
+        for pattern in catalogue.most_common(args.limit):
+            moves = f", moves {pattern.dx},{pattern.dy}" if pattern.dx else ""
+            print(
+                f"  {pattern.occurrences:>8}  {pattern.name or pattern.code}"
+                f" (period {pattern.period}{moves})"
+            )
+        print(f"{len(catalogue)} objects in {catalogue.path}")
+    catalogue.close()
+
+
+if __name__ == "__main__":
+    main()
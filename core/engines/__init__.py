@@ -0,0 +1,6 @@
+"""Interchangeable strategies for stepping the board.
+
+All engines compute the same generations; they differ in how fast they do
+it for a given board size and density. `EngineSelector` picks the fastest
+one based on a calibration measured once per machine.
+"""
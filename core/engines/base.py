@@ -0,0 +1,61 @@
+"""Common interface of the stepping engines."""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+
+
+class StepResult(NamedTuple):
+    """A new generation and the bookkeeping `GameState` needs about it."""
+
+    grid: np.ndarray
+    births: np.ndarray  # bool masks
+    deaths: np.ndarray
+    n_births: int
+    n_deaths: int
+
+
+class Engine:
+    """A strategy for computing the next generation of a toroidal board.
+
+    Engines never modify the board they are given and return a new array of
+    the same shape and dtype. They may keep state between generations (e.g.
+    which areas are active), which `reset` discards whenever the board was
+    changed by anything other than the engine itself.
+    """
+
+    name = "engine"
+
+    @property
+    def status(self) -> str:
+        """Engine specific statistics for diagnostics, empty if there are none."""
+        return ""
+
+    def supports(self, shape: tuple[int, int]) -> bool:
+        """Whether the engine can (and should) step boards of this shape."""
+        return True
+
+    def reset(self) -> None:
+        """Forget everything about previous generations."""
+
+    def fork(self) -> Engine:
+        """An engine for another board: itself, unless it keeps per-board state."""
+        return self
+
+    def step(self, grid: np.ndarray) -> np.ndarray:
+        """Return the next generation of `grid`."""
+        raise NotImplementedError
+
+    def step_fused(self, grid: np.ndarray) -> StepResult:
+        """Return the next generation together with its births and deaths."""
+        new_grid = self.step(grid)
+        births, deaths = new_grid > grid, new_grid < grid
+        return StepResult(
+            new_grid,
+            births,
+            deaths,
+            int(np.count_nonzero(births)),
+            int(np.count_nonzero(deaths)),
+        )
@@ -0,0 +1,75 @@
+"""Cluster engine: the board is stepped by worker processes, block by block."""
+
+import numpy as np
+
+from core.engines.base import Engine, StepResult
+from core.services.cluster import Cluster, ClusterError, partition
+from utils.settings import CLUSTER_WORKERS
+
+
+class ClusterEngine(Engine):
+    """Hands the board to a cluster of workers (see `core.services.cluster`).
+
+    The workers keep the board between generations and only send back the
+    births and deaths, so the board is transferred again only after it was
+    edited (or after `reset`). The cluster is started on the first step;
+    it costs a few processes, so the engine is only used when ENGINE selects
+    it, never picked automatically.
+    """
+
+    name = "cluster"
+
+    def __init__(self, workers: int = CLUSTER_WORKERS) -> None:
+        """Create an engine stepping on `workers` worker processes."""
+        self.workers = workers
+        self.cluster: Cluster | None = None
+        self._last_grid: np.ndarray | None = None  # the board the workers hold
+
+    @property
+    def status(self) -> str:
+        """Size of the cluster and how often it was restarted."""
+        if self.cluster is None:
+            return "not started"
+        return f"{self.workers} workers, {self.cluster.restarts} restarts"
+
+    def supports(self, shape: tuple[int, int]) -> bool:
+        """Any board that can be split into a block per worker."""
+        try:
+            partition(shape, self.workers)
+        except ClusterError:
+            return False
+        return True
+
+    def reset(self) -> None:
+        """The board was changed: send it to the workers again next step."""
+        self._last_grid = None
+
+    def fork(self) -> Engine:
+        """Another cluster for another board."""
+        return ClusterEngine(self.workers)
+
+    def step(self, grid: np.ndarray) -> np.ndarray:
+        """Return the next generation of `grid`."""
+        return self.step_fused(grid).grid
+
+    def step_fused(self, grid: np.ndarray) -> StepResult:
+        """Step the workers' board, loading `grid` first if they don't hold it."""
+        if self.cluster is None or self.cluster.shape != grid.shape:
+            self.close()
+            self.cluster = Cluster(grid.shape, self.workers)
+        if grid is not self._last_grid:
+            # keep counting generations, the checkpoints are named after them
+            self.cluster.load(grid, self.cluster.generation)
+        births, deaths, n_births, n_deaths = self.cluster.step()
+        new_grid = grid.copy()
+        new_grid[births] = 1
+        new_grid[deaths] = 0
+        self._last_grid = new_grid
+        return StepResult(new_grid, births, deaths, n_births, n_deaths)
+
+    def close(self) -> None:
+        """Stop the workers (a later step starts new ones)."""
+        if self.cluster is not None:
+            self.cluster.close()
+            self.cluster = None
+        self._last_grid = None
@@ -0,0 +1,41 @@
+"""Bit-packed engine: eight cells per byte, neighbours summed with bit logic."""
+
+import numpy as np
+
+from core.engines.base import Engine
+
+
+class PackedEngine(Engine):
+    """Steps the board as packed bit rows with bitwise adders.
+
+    Only the horizontal neighbours are gathered on the unpacked board; the
+    vertical neighbours and the rule itself work on 1/8 of the memory.
+    """
+
+    name = "packed"
+
+    def step(self, grid: np.ndarray) -> np.ndarray:
+        """Return the next generation of `grid`."""
+        width = grid.shape[1]
+        alive = grid != 0
+        west = np.packbits(np.roll(alive, 1, axis=1), axis=1)
+        east = np.packbits(np.roll(alive, -1, axis=1), axis=1)
+        center = np.packbits(alive, axis=1)
+
+        # each row's sum of west, center and east as a 2 bit number
+        low = west ^ center ^ east
+        high = (west & center) | (east & (west ^ center))
+        # add the sums of the rows above and below: the total of the 3x3
+        # block (cell included) is `odd + 2 * pairs`
+        low_up, low_down = np.roll(low, 1, axis=0), np.roll(low, -1, axis=0)
+        odd = low_up ^ low ^ low_down
+        carry = (low_up & low) | (low_down & (low_up ^ low))
+        high_up, high_down = np.roll(high, 1, axis=0), np.roll(high, -1, axis=0)
+        # pairs = p + q + 2 * (pp + qq) from the four weight-2 bits
+        p, pp = high_up ^ high, high_up & high
+        q, qq = high_down ^ carry, high_down & carry
+        one_pair = (p ^ q) & ~(pp | qq)
+        two_pairs = ((pp ^ qq) & ~(p | q)) | (p & q)
+        # a block total of 3 means birth or survival, 4 means survival only
+        new = (odd & one_pair) | (~odd & two_pairs & center)
+        return np.unpackbits(new, axis=1, count=width).astype(grid.dtype)
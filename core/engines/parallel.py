@@ -0,0 +1,45 @@
+"""Parallel engine: horizontal bands of the board stepped on a thread pool."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from core.engines.base import Engine
+from core.life import next_generation_interior
+from utils.settings import ENGINE_MIN_BAND_ROWS
+
+
+class ParallelEngine(Engine):
+    """Splits the board into one band of rows per core.
+
+    NumPy releases the GIL in its array loops, so the bands really are
+    computed at the same time.
+    """
+
+    name = "parallel"
+
+    def __init__(self, workers: int | None = None) -> None:
+        """Create the thread pool (one worker per core by default)."""
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="engine")
+
+    def supports(self, shape: tuple[int, int]) -> bool:
+        """Only worth it with several cores and enough rows to share."""
+        return self.workers > 1 and shape[0] >= 2 * ENGINE_MIN_BAND_ROWS
+
+    def step(self, grid: np.ndarray) -> np.ndarray:
+        """Return the next generation of `grid`."""
+        height = grid.shape[0]
+        bands = min(self.workers, height // ENGINE_MIN_BAND_ROWS)
+        edges = np.linspace(0, height, bands + 1).astype(int)
+        new_grid = np.empty_like(grid)
+
+        def step_band(top: int, bottom: int) -> None:
+            # the band plus a wrapped-around halo of one row and column
+            band = grid.take(np.arange(top - 1, bottom + 1), axis=0, mode="wrap")
+            band = np.concatenate([band[:, -1:], band, band[:, :1]], axis=1)
+            new_grid[top:bottom] = next_generation_interior(band)
+
+        list(self._pool.map(step_band, edges[:-1], edges[1:]))
+        return new_grid
@@ -0,0 +1,179 @@
+"""Picks the fastest engine for a board from a per-machine calibration.
+
+On the first start, every engine is timed on a few random boards of
+different sizes and densities. The measured throughputs are cached on disk
+per machine (and NumPy version), so later starts only read the file.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+import platform
+import time
+from pathlib import Path
+
+import numpy as np
+
+from core.engines.base import Engine
+from core.engines.cluster import ClusterEngine
+from core.engines.dense import DenseEngine
+from core.engines.memo import MemoEngine
+from core.engines.numba_engine import NumbaEngine, numba
+from core.engines.packed import PackedEngine
+from core.engines.parallel import ParallelEngine
+from core.engines.sparse import SparseEngine
+from core.engines.tiled import TiledEngine
+from utils.settings import (
+    ENGINE,
+    ENGINE_CALIBRATION_DENSITIES,
+    ENGINE_CALIBRATION_PATH,
+    ENGINE_CALIBRATION_SIZES,
+    ENGINE_CALIBRATION_TIME,
+)
+
+
+def available_engines() -> list[Engine]:
+    """One instance of every engine that can run on this machine."""
+    engines = [
+        DenseEngine(),
+        PackedEngine(),
+        SparseEngine(),
+        TiledEngine(),
+        ParallelEngine(),
+        MemoEngine(),
+    ]
+    if numba is not None:
+        engines.append(NumbaEngine())
+    if ENGINE == "cluster":
+        engines.append(ClusterEngine())  # only on request, it starts processes
+    return engines
+
+
+def machine_key(engines: list[Engine]) -> str:
+    """Identify the machine and setup a calibration is valid for."""
+    return "|".join([
+        platform.node(),
+        platform.machine(),
+        str(os.cpu_count()),
+        f"numpy {np.__version__}",
+        ",".join(engine.name for engine in engines),
+        ",".join(map(str, ENGINE_CALIBRATION_SIZES)),
+        ",".join(map(str, ENGINE_CALIBRATION_DENSITIES)),
+    ])
+
+
+def measure(engine: Engine, board: np.ndarray) -> tuple[float, float]:
+    """Time an engine on an evolving board.
+
+    Returns:
+        tuple[float, float]: Cells per second, and the density of the board
+        during the measurement (mean of its first and last generation).
+    """
+    engine.reset()
+    grid = engine.step(board)  # warm-up, also the full first step of stateful engines
+    density = np.count_nonzero(grid) / board.size
+    steps = 0
+    start = time.perf_counter()
+    while True:
+        grid = engine.step(grid)
+        steps += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= ENGINE_CALIBRATION_TIME:
+            break
+    density = (density + np.count_nonzero(grid) / board.size) / 2
+    engine.reset()
+    return steps * board.size / elapsed, density
+
+
+class EngineSelector:
+    """Predicts the throughput of every engine and picks the best one."""
+
+    def __init__(
+        self,
+        engines: list[Engine] | None = None,
+        cache_path: str | Path = ENGINE_CALIBRATION_PATH,
+    ) -> None:
+        """Load the calibration of this machine, or calibrate now.
+
+        Args:
+            engines (list[Engine] | None): Engines to choose from, all
+                available ones by default.
+            cache_path (str | Path): JSON file holding the calibrations.
+        """
+        engines = engines if engines is not None else available_engines()
+        self.engines = {engine.name: engine for engine in engines}
+        self.cache_path = Path(cache_path)
+        self.key = machine_key(engines)
+        # engine name -> [board cells, density, cells per second] measurements
+        self.table: dict[str, list[list[float]]] = (
+            {} if ENGINE in self.engines else self._load() or self.calibrate()
+        )  # nothing to choose between if the settings fix the engine
+
+    def calibrate(self) -> dict[str, list[list[float]]]:
+        """Time every engine on random boards and cache the results."""
+        print("Calibrating simulation engines...")
+        rng = np.random.default_rng(0)
+        table: dict[str, list[list[float]]] = {name: [] for name in self.engines}
+        for edge in ENGINE_CALIBRATION_SIZES:
+            for density in ENGINE_CALIBRATION_DENSITIES:
+                board = (rng.random((edge, edge)) < density).astype(int)
+                for name, engine in self.engines.items():
+                    if engine.supports(board.shape):
+                        throughput, measured = measure(engine, board)
+                        table[name].append([board.size, measured, throughput])
+        self._save(table)
+        return table
+
+    def fork(self) -> EngineSelector:
+        """A selector for another board, sharing the calibration.
+
+        Stateless engines are shared too, and with them e.g. the threads of
+        the parallel engine; stateful ones are copied.
+        """
+        forked = copy.copy(self)
+        forked.engines = {name: e.fork() for name, e in self.engines.items()}
+        return forked
+
+    def predict(self, name: str, cells: int, density: float) -> float:
+        """Expected cells per second of an engine on a board.
+
+        Uses the measurements of the calibration board closest in size,
+        interpolated by density.
+        """
+        points = self.table.get(name)
+        if not points:
+            return 0.0
+        sizes = np.array([size for size, _, _ in points])
+        nearest = sizes[np.argmin(np.abs(np.log(sizes / cells)))]
+        nearby = sorted((d, t) for size, d, t in points if size == nearest)
+        densities, throughputs = zip(*nearby, strict=True)
+        return float(np.interp(density, densities, throughputs))
+
+    def choose(self, shape: tuple[int, int], population: int) -> Engine:
+        """The engine expected to be fastest for a board with this population."""
+        if ENGINE in self.engines:
+            return self.engines[ENGINE]  # fixed in the settings
+        cells = shape[0] * shape[1]
+        density = population / cells
+        candidates = [e for e in self.engines.values() if e.supports(shape)]
+        return max(candidates, key=lambda e: self.predict(e.name, cells, density))
+
+    def _load(self) -> dict[str, list[list[float]]] | None:
+        try:
+            calibrations = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            return None
+        return calibrations.get(self.key)
+
+    def _save(self, table: dict[str, list[list[float]]]) -> None:
+        try:
+            calibrations = json.loads(self.cache_path.read_text())
+        except (OSError, ValueError):
+            calibrations = {}
+        calibrations[self.key] = table
+        try:
+            self.cache_path.write_text(json.dumps(calibrations, indent=1))
+        except OSError as e:
+            print(f"Could not cache the engine calibration: {e}")
@@ -0,0 +1,33 @@
+"""Sparse engine: works on the coordinates of the live cells only."""
+
+import numpy as np
+
+from core.engines.base import Engine
+
+# Offsets of the eight neighbours
+NEIGHBOR_DY = np.array([-1, -1, -1, 0, 0, 1, 1, 1])
+NEIGHBOR_DX = np.array([-1, 0, 1, -1, 1, -1, 0, 1])
+
+
+class SparseEngine(Engine):
+    """Counts neighbours by scattering from the live cells.
+
+    The cost grows with the population instead of the board size, which
+    makes it the fastest choice for large boards with little life on them.
+    """
+
+    name = "sparse"
+
+    def step(self, grid: np.ndarray) -> np.ndarray:
+        """Return the next generation of `grid`."""
+        height, width = grid.shape
+        ys, xs = np.nonzero(grid)
+        neighbors = ((ys[:, None] + NEIGHBOR_DY) % height) * width + (
+            (xs[:, None] + NEIGHBOR_DX) % width
+        )
+        cells, counts = np.unique(neighbors, return_counts=True)
+        alive = grid.ravel()[cells] != 0
+        survivors = cells[(counts == 3) | ((counts == 2) & alive)]
+        new_grid = np.zeros_like(grid)
+        new_grid.ravel()[survivors] = 1
+        return new_grid
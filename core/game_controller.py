@@ -4,11 +4,37 @@ This module handles user input and event management, connecting the
 game's model (`GameState`) and view (`GameView`) layers.
 """
 
+import time
+from pathlib import Path
+
+import numpy as np
 import pygame
 
 from core.game_model import GameState
+from core.services.journal import GenerationJournal
+from core.services.recorder import RECORDING_SUFFIXES, Recorder, RecordingFormat
 from core.view import GameView
-from utils.settings import GRID_PIXEL_WIDTH, TILE_SIZE
+from utils.settings import PAN_STEP, RECORDING_FORMAT, RECORDINGS_DIR
+
+# Arrow keys pan the view (direction the board is dragged)
+PAN_KEYS = {
+    pygame.K_LEFT: (1, 0),
+    pygame.K_RIGHT: (-1, 0),
+    pygame.K_UP: (0, 1),
+    pygame.K_DOWN: (0, -1),
+}
+
+
+def line_cells(
+    start: tuple[int, int], end: tuple[int, int]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Cells on the line between two cells, without gaps (x and y arrays)."""
+    (x0, y0), (x1, y1) = start, end
+    steps = max(abs(x1 - x0), abs(y1 - y0), 1)
+    t = np.arange(steps + 1) / steps
+    xs = np.rint(x0 + (x1 - x0) * t).astype(int)
+    ys = np.rint(y0 + (y1 - y0) * t).astype(int)
+    return xs, ys
 
 
 class GameController:
@@ -22,29 +48,53 @@ class GameController:
     state: GameState
     view: GameView
 
-    def __init__(self, state: GameState, view: GameView) -> None:
+    def __init__(
+        self,
+        state: GameState,
+        view: GameView,
+        journal: GenerationJournal | None = None,
+    ) -> None:
         """Initialize the game controller.
 
         Args:
             state (GameState): The current state of the game grid and rules.
             view (GameView): The rendering view responsible for drawing.
+            journal (GenerationJournal | None): History used to scrub through
+                generations, scrubbing is disabled without one.
         """
         self.state = state
         self.view = view
+        self.journal = journal
         self.first_time = True
-
-    def handle_events(self) -> bool:
+        self.panning = False
+        # left-drag painting: value painted and the last cell of the stroke
+        self.painting = False
+        self.paint_alive = True
+        self.last_paint_cell: tuple[int, int] | None = None
+        self.stroke: list[tuple[np.ndarray, np.ndarray]] = []
+        self.recorder: Recorder | None = None
+
+    def handle_events(self, events: list[pygame.event.Event] | None = None) -> bool:
         """Process Pygame events such as clicks, keypresses, and window close.
 
         Handles:
             - Quit events (closes the window)
-            - Mouse clicks (toggles cells)
+            - Mouse clicks (toggles cells), left-drag (paints cells)
+            - Mouse wheel (zooms the camera), right-drag and arrow keys (pan)
             - Spacebar keypress (starts/stops simulation)
+            - R keypress (starts/stops recording the run)
+            - Comma/period keypress (scrubs one generation back/forward)
+
+        Args:
+            events (list[pygame.event.Event] | None): Events to process, taken
+                from the Pygame queue if omitted.
 
         Returns:
             bool: False if the application should exit, True otherwise.
         """
-        for event in pygame.event.get():
+        if events is None:
+            events = pygame.event.get()
+        for event in events:
             if event.type == pygame.QUIT:
                 return False
 
@@ -54,21 +104,66 @@ class GameController:
                 self.handle_sidebar_action(sidebar_action)
                 continue
 
+            grid_interactible = (
+                not self.state.achievements_visible and not self.state.rules_visible
+            )
+            camera = self.view.camera
+
             if event.type == pygame.MOUSEBUTTONDOWN:
-                x = event.pos[0]
-                if (
-                    x < GRID_PIXEL_WIDTH
-                    and not self.state.achievements_visible
-                    and not self.state.rules_visible
-                ):  # inside grid and grid interactible
+                if not camera.viewport.collidepoint(event.pos) or not grid_interactible:
+                    continue
+                if event.button == 1:
                     self.handle_grid_interaction(event.pos)
+                elif event.button == 3:
+                    self.panning = True
+
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+                self.painting = False
+
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 3:
+                self.panning = False
+
+            elif event.type == pygame.MOUSEMOTION:
+                if self.painting and grid_interactible:
+                    self.paint_to(event.pos)
+                if self.panning:
+                    camera.pan(*event.rel)
+
+            elif event.type == pygame.MOUSEWHEEL and grid_interactible:
+                # replayed wheel events carry the pointer position they had
+                mouse = getattr(event, "pos", None) or pygame.mouse.get_pos()
+                if camera.viewport.collidepoint(mouse):
+                    camera.zoom_at(mouse, event.y)
 
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
                     self.state.running = not self.state.running
-
+                elif event.key == pygame.K_r:
+                    self.toggle_recording()
+                elif event.key == pygame.K_COMMA:
+                    self.scrub(-1)
+                elif event.key == pygame.K_PERIOD:
+                    self.scrub(1)
+                elif event.key in PAN_KEYS:
+                    camera.pan(*(PAN_STEP * d for d in PAN_KEYS[event.key]))
+
+        self.flush_stroke()
         return True
 
+    def wait_for_events(self, timeout: float | None) -> list[pygame.event.Event]:
+        """Block until input arrives or `timeout` seconds passed (idle frame pacing).
+
+        Returns:
+            list[pygame.event.Event]: The pending events, empty on timeout.
+        """
+        if timeout is None:
+            event = pygame.event.wait()
+        else:
+            event = pygame.event.wait(max(1, int(timeout * 1000)))
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event, *pygame.event.get()]
+
     def handle_grid_interaction(self, pos: tuple[int, int]) -> None:
         """Check if Grid was clicked and act accordingly."""
         # FIXME: Part of the tutorial had to be moved here
@@ -77,10 +172,64 @@ class GameController:
             self.view.marker_manager.create_marker(pos, symbol="!")
             self.first_time = False
 
-        x, y = pos
-        grid_x = x // TILE_SIZE
-        grid_y = y // TILE_SIZE
-        self.state.toggle_cell(grid_x, grid_y)
+        cell = self.view.camera.screen_to_cell(pos)
+        if cell is not None:
+            # a click toggles the cell, dragging on paints the same value
+            x, y = cell
+            # an earlier stroke of the same batch of events must land first
+            self.flush_stroke()
+            self.paint_alive = not self.state.is_alive(x, y)
+            self.painting = True
+            self.last_paint_cell = cell
+            self.stroke.append((np.array([x]), np.array([y])))
+
+    def paint_to(self, pos: tuple[int, int]) -> None:
+        """Extend the painted stroke to `pos`, filling cells skipped by the mouse."""
+        cell = self.view.camera.screen_to_cell(pos)
+        if cell is None:
+            return
+        self.stroke.append(line_cells(self.last_paint_cell or cell, cell))
+        self.last_paint_cell = cell
+
+    def flush_stroke(self) -> None:
+        """Apply the cells painted since the last call as one edit."""
+        if not self.stroke:
+            return
+        xs = np.concatenate([xs for xs, _ in self.stroke])
+        ys = np.concatenate([ys for _, ys in self.stroke])
+        self.stroke = []
+        self.state.set_cells(xs, ys, self.paint_alive)
+
+    def scrub(self, generations: int) -> None:
+        """Move through the journaled history, simulating when stepping past its end."""
+        journal = self.journal
+        if journal is None or journal.first_generation is None:
+            return
+        self.state.running = False
+        target = self.state.generation + generations
+        if target > journal.last_generation:
+            self.state.step()  # at the head of the run: record a new generation
+            return
+        journal.rewind(max(target, journal.first_generation))
+
+    def toggle_recording(self) -> None:
+        """Start recording the run, or finish the current recording."""
+        if self.recorder is not None:
+            self.recorder.detach()
+            self.recorder.stop()
+            self.recorder = None
+            return
+        if self.state.world is not None:
+            print("Recordings need an in-memory board, not a chunked world")
+            return
+
+        fmt = RecordingFormat(RECORDING_FORMAT)
+        suffix = RECORDING_SUFFIXES[fmt]
+        name = time.strftime("run-%Y%m%d-%H%M%S") + suffix
+        self.recorder = Recorder(Path(RECORDINGS_DIR) / name, fmt)
+        self.recorder.attach(self.state)
+        self.recorder.start()
+        print(f"Recording to {self.recorder.output}")
 
     def handle_sidebar_action(self, action: str) -> None:
         """Perform logical actions based on sidebar button name."""
@@ -12,11 +12,23 @@ from typing import TYPE_CHECKING
 
 import numpy as np
 
-from core.services.sound_manager import SoundManager
-from utils.settings import GRID_HEIGHT, GRID_WIDTH, STEP_INTERVAL
+from core.engines.selector import EngineSelector
+from core.life import next_generation
+from core.services.metrics import GENERATIONS, STEP_SECONDS
+from core.services.sound_manager import SoundManager, horizontal_pan
+from utils.settings import (
+    ENGINE_REEVALUATE_INTERVAL,
+    ENGINE_SWITCH_GAIN,
+    GRID_HEIGHT,
+    GRID_WIDTH,
+    STEP_INTERVAL,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Sequence
+
+    from core.engines.base import Engine
+    from core.services.world_store import ChunkedWorld
 
 
 from enum import Enum, auto
@@ -31,7 +43,14 @@ class UpdateType(Enum):
 
 
 class GameState:
-    """Stores the state of the grid and controls simulation updates."""
+    """Stores the state of the grid and controls simulation updates.
+
+    The board is either kept in memory (`grid`, with the `births` and `deaths`
+    of the last change), or in a `ChunkedWorld` on disk for boards larger
+    than memory. A world steps its own active chunks, and `grid`, `births`
+    and `deaths` stay empty: read the board with `read_window` and
+    `is_alive`, and the chunks of the last change from the world.
+    """
 
     width: int
     height: int
@@ -39,34 +58,74 @@ class GameState:
     grid: np.ndarray
     births: np.ndarray
     deaths: np.ndarray
+    generation: int
+    population: int
     subscribers: list[Callable[[UpdateType], None]]
+    world: ChunkedWorld | None
 
     # for the simulation
+    engines: EngineSelector
+    engine: Engine
+    engine_throughput: float
     running: bool
+    clock: Callable[[], float]
     last_update_time: float
     sound: SoundManager
-
-    def __init__(self, width: int = GRID_WIDTH, height: int = GRID_HEIGHT) -> None:
+    audible: bool
+
+    def __init__(
+        self,
+        width: int = GRID_WIDTH,
+        height: int = GRID_HEIGHT,
+        seed: int | None = None,
+        sound: SoundManager | None = None,
+        engines: EngineSelector | None = None,
+        world: ChunkedWorld | None = None,
+    ) -> None:
         """Initialize a new Game of Life model.
 
         Args:
             width: Number of cells horizontally.
             height: Number of cells vertically.
+            seed: Seed for the randomness of the sound effects.
+            sound: Sound manager shared with other boards (e.g. worlds of a
+                `WorldScheduler`), a new one playing the music by default.
+            engines: Engine selector for this board (see `EngineSelector.fork`),
+                a new one by default.
+            world: Chunked world to play on instead of an in-memory board
+                (its size replaces `width` and `height`).
         """
+        self.world = world
+        if world is not None:
+            width, height = world.width, world.height
         # the size
         self.width = width
         self.height = height
         self.total_cells = width * height
         # the grid
-        self.grid = np.zeros((height, width), dtype=int)
-        self.births = np.zeros((height, width), dtype=int)
-        self.deaths = np.zeros((height, width), dtype=int)
+        shape = (height, width) if world is None else (0, 0)
+        self.grid = np.zeros(shape, dtype=int)
+        self.births = np.zeros(shape, dtype=int)
+        self.deaths = np.zeros(shape, dtype=int)
+        self.generation = 0 if world is None else world.generation
+        # live cells, kept up to date by every change
+        self.population = 0 if world is None else world.population
+        # set while `grid` is shared with a reader (e.g. autosave), see `share_grid`
+        self.grid_shared = False
         # the simulation
+        self.engines = engines if engines is not None else EngineSelector()
+        self.engine = self.engines.choose((height, width), 0)
+        self.engine_throughput = 0.0  # measured cells per second (moving average)
         self.running = False
-        self.last_update_time = time.time()
+        # source of the time deciding when to step (replays substitute their own)
+        self.clock = time.time
+        self.last_update_time = self.clock()
         # sound
-        self.sound = SoundManager()
-        self.sound.play_music()
+        self.audible = True  # boards that are not on screen stay silent
+        if sound is None:
+            sound = SoundManager(seed=seed)
+            sound.play_music()
+        self.sound = sound
         # the view
         self.achievements_visible = False
         self.rules_visible = False
@@ -79,7 +138,7 @@ class GameState:
         if not self.running:
             return
 
-        now = time.time()
+        now = self.clock()
         if now - self.last_update_time < STEP_INTERVAL:
             return  # not yet time for the next step
 
@@ -92,6 +151,10 @@ class GameState:
         """Register a view callback to be called on state updates."""
         self.subscribers.append(callback)
 
+    def unsubscribe(self, callback: Callable[[UpdateType], None]) -> None:
+        """Remove a previously registered callback."""
+        self.subscribers.remove(callback)
+
     def notify(self, update_type: UpdateType) -> None:
         """Notify all subscribed views."""
         for cb in self.subscribers:
@@ -99,19 +162,118 @@ class GameState:
 
     def toggle_cell(self, x: int, y: int) -> None:
         """Toggle a single cell's alive/dead state."""
-        old_grid = self.grid.copy()
-        # the actual update of the cell
-        self.grid[y, x] = 1 - self.grid[y, x]
-
-        self.births = (self.grid == 1) & (old_grid == 0)
-        self.deaths = (self.grid == 0) & (old_grid == 1)
-        n_births = np.sum(self.births)
-        n_deaths = np.sum(self.deaths)
-        live_cells = np.sum(self.grid)
+        self.toggle_cells([x], [y])
+
+    def is_alive(self, x: int, y: int) -> bool:
+        """Return whether a single cell is alive."""
+        if self.world is not None:
+            return bool(self.world.get_cell(x, y))
+        return bool(self.grid[y, x])
+
+    def read_window(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        """Return a rectangle of cells (e.g. the visible viewport), read-only.
+
+        Of a chunked world, only the chunks under the rectangle are read.
+        """
+        if self.world is not None:
+            return self.world.read_window(x, y, width, height)
+        return self.grid[y : y + height, x : x + width]
+
+    def set_cells(
+        self, xs: Sequence[int], ys: Sequence[int], alive: bool = True
+    ) -> None:
+        """Bring many cells to life (or kill them) as a single edit."""
+        ys, xs = self._unique_cells(xs, ys)
+        self._apply_edits(ys, xs, np.full(len(xs), int(alive)))
+
+    def toggle_cells(self, xs: Sequence[int], ys: Sequence[int]) -> None:
+        """Toggle many cells as a single edit (each cell at most once)."""
+        ys, xs = self._unique_cells(xs, ys)
+        self._apply_edits(ys, xs, 1 - self._cells(ys, xs))
+
+    def fill_rect(
+        self, x: int, y: int, width: int, height: int, alive: bool = True
+    ) -> None:
+        """Fill a rectangle of cells (wrapping around the edges) as a single edit."""
+        ys, xs = np.mgrid[y : y + height, x : x + width]
+        self.set_cells(xs.ravel(), ys.ravel(), alive)
+
+    def stamp(
+        self,
+        pattern: np.ndarray,
+        x: int,
+        y: int,
+        rotation: int = 0,
+        flip: bool = False,
+    ) -> None:
+        """Copy a pattern onto the board with its top-left corner at (x, y).
+
+        Args:
+            pattern (np.ndarray): 2D array, non-zero for live cells.
+            x (int): Column of the pattern's top-left corner.
+            y (int): Row of the pattern's top-left corner.
+            rotation (int): Quarter turns counterclockwise.
+            flip (bool): Mirror the pattern horizontally before rotating.
+        """
+        if flip:
+            pattern = np.fliplr(pattern)
+        pattern = np.rot90(pattern, rotation)
+        height, width = pattern.shape
+        ys, xs = np.mgrid[y : y + height, x : x + width]
+        ys, xs = ys.ravel() % self.height, xs.ravel() % self.width
+        self._apply_edits(ys, xs, (pattern.ravel() != 0).astype(int))
+
+    def _unique_cells(
+        self, xs: Sequence[int], ys: Sequence[int]
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Wrap coordinates onto the board and drop duplicates."""
+        ys = np.asarray(ys, dtype=np.intp) % self.height
+        xs = np.asarray(xs, dtype=np.intp) % self.width
+        flat = np.unique(ys * self.width + xs)
+        return flat // self.width, flat % self.width
+
+    def _cells(self, ys: np.ndarray, xs: np.ndarray) -> np.ndarray:
+        """Return the states of distinct cells."""
+        if self.world is not None:
+            return self.world.get_cells(xs, ys).astype(int)
+        return self.grid[ys, xs]
+
+    def _apply_edits(self, ys: np.ndarray, xs: np.ndarray, values: np.ndarray) -> None:
+        """Write `values` into distinct cells and notify subscribers once.
+
+        The bookkeeping only touches the edited cells, not the whole board.
+        """
+        old = self._cells(ys, xs)
+        born = (values == 1) & (old == 0)
+        died = (values == 0) & (old == 1)
+        n_births = int(np.count_nonzero(born))
+        n_deaths = int(np.count_nonzero(died))
+        if n_births == 0 and n_deaths == 0:
+            return
+        if self.world is not None:
+            self.world.set_cells(xs, ys, values)
+        else:
+            if self.grid_shared:
+                # copy-on-write: never modify a grid array that may be shared
+                self.grid = self.grid.copy()
+                self.grid_shared = False
+            self.grid[ys, xs] = values
+            self.engine.reset()
+            self.births = np.zeros(self.grid.shape, dtype=bool)
+            self.deaths = np.zeros(self.grid.shape, dtype=bool)
+            self.births[ys[born], xs[born]] = True
+            self.deaths[ys[died], xs[died]] = True
+        self.population += n_births - n_deaths
         # Trigger Sounds relative to GameState
-        self.sound.play_generation_batch(
-            n_births, n_deaths, live_cells, self.total_cells
-        )
+        if self.audible:
+            self.sound.play_generation_batch(
+                n_births,
+                n_deaths,
+                self.population,
+                self.total_cells,
+                horizontal_pan(np.bincount(xs[born], minlength=self.width)),
+                horizontal_pan(np.bincount(xs[died], minlength=self.width)),
+            )
         self.notify(UpdateType.CELL_TOGGLE)
 
     def step(self) -> bool:
@@ -120,28 +282,89 @@ class GameState:
         Returns:
             bool: False if the step hasn't changed anything, True otherwise.
         """
-        old_grid = self.grid.copy()
-        new_grid = self.compute_next_generation(self.grid)
+        start = time.perf_counter()
+        if self.world is None:
+            new_grid, self.births, self.deaths, n_births, n_deaths = (
+                self.engine.step_fused(self.grid)
+            )
+            birth_columns = self.births.sum(axis=0)
+            death_columns = self.deaths.sum(axis=0)
+        else:
+            self.world.step()
+            n_births, n_deaths = self.world.births, self.world.deaths
+            # per column of chunks, close enough for the stereo position
+            birth_columns = self.world.birth_columns
+            death_columns = self.world.death_columns
+        self._measure_engine(time.perf_counter() - start)
 
-        # Sound effects
-        # Identify births and deaths
-        self.births = (new_grid == 1) & (old_grid == 0)
-        self.deaths = (new_grid == 0) & (old_grid == 1)
-        n_births = np.sum(self.births)
-        n_deaths = np.sum(self.deaths)
-
-        live_cells = np.sum(self.grid)
         # Trigger Sounds relative to GameState
-        self.sound.play_generation_batch(
-            n_births, n_deaths, live_cells, self.total_cells
-        )
-
-        self.grid = new_grid
+        if self.audible:
+            self.sound.play_generation_batch(
+                n_births,
+                n_deaths,
+                self.population,
+                self.total_cells,
+                horizontal_pan(birth_columns),
+                horizontal_pan(death_columns),
+            )
+
+        if self.world is None:
+            self.grid = new_grid
+            self.grid_shared = False
+        self.population += n_births - n_deaths
+        self.generation += 1
+        if self.generation % ENGINE_REEVALUATE_INTERVAL == 0:
+            self.select_engine()
         # Analyze the current generation
         self.notify(UpdateType.STEP)
+        GENERATIONS.inc()
+        STEP_SECONDS.observe(time.perf_counter() - start)
+
+        changed = n_births > 0 or n_deaths > 0
+        return changed and self.population > 0
 
-        changed = not np.array_equal(new_grid, old_grid)
-        return changed and bool(new_grid.any())
+    def select_engine(self) -> None:
+        """Switch to a faster engine if the board's density calls for one.
+
+        Subscribers are not involved: the engines compute the same
+        generations, only the speed changes. A chunked world steps itself.
+        """
+        if self.world is not None:
+            return
+        engine = self.engines.choose(self.grid.shape, self.population)
+        if engine is self.engine:
+            return
+        cells, density = self.total_cells, self.population / self.total_cells
+        gain = self.engines.predict(engine.name, cells, density) / max(
+            self.engines.predict(self.engine.name, cells, density), 1.0
+        )
+        if gain < ENGINE_SWITCH_GAIN:
+            return
+        engine.reset()
+        self.engine = engine
+        self.engine_throughput = 0.0
+        print(f"Switched to the {engine.name} engine ({gain:.1f}x expected)")
+
+    def _measure_engine(self, elapsed: float) -> None:
+        """Update the measured throughput of the current engine."""
+        throughput = self.total_cells / max(elapsed, 1e-9)
+        if self.engine_throughput == 0.0:
+            self.engine_throughput = throughput
+        else:
+            self.engine_throughput += 0.1 * (throughput - self.engine_throughput)
+
+    @property
+    def engine_status(self) -> str:
+        """The current engine and its measured throughput, for diagnostics."""
+        if self.world is not None:
+            rate = self.engine_throughput / 1e6
+            return f"chunked world, {rate:.1f} Mcells/s, {self.world.status}"
+        status = (
+            f"{self.engine.name} engine, {self.engine_throughput / 1e6:.1f} Mcells/s"
+        )
+        if self.engine.status:
+            status += f", {self.engine.status}"
+        return status
 
     def start(self) -> None:
         """Start automatic simulation."""
@@ -153,7 +376,41 @@ class GameState:
 
     def clear_grid(self) -> None:
         """Clear grid (kill all living cells)."""
-        self.grid = np.zeros((self.height, self.width), dtype=int)
+        if self.world is not None:
+            self.world.clear()
+        else:
+            self.grid = np.zeros((self.height, self.width), dtype=int)
+            self.grid_shared = False
+        self.population = 0
+        self.engine.reset()
+        self.select_engine()
+        self.notify(UpdateType.CLEAR)
+
+    def share_grid(self) -> np.ndarray:
+        """Return the current grid for read-only use, e.g. by another thread.
+
+        The model treats the returned array as copy-on-write: it is never
+        modified in place afterwards, so no copy is needed to snapshot it.
+        """
+        self.grid_shared = True
+        return self.grid
+
+    def load_grid(self, grid: np.ndarray, generation: int = 0) -> None:
+        """Replace the board (e.g. with a loaded session) and notify subscribers."""
+        self.generation = generation
+        if self.world is not None:
+            self.world.clear()
+            self.world.write_window(0, 0, grid)
+            self.world.generation = generation
+            self.population = self.world.population
+        else:
+            self.grid = grid.astype(int)
+            self.grid_shared = False
+            self.births = np.zeros_like(self.grid)
+            self.deaths = np.zeros_like(self.grid)
+            self.population = int(np.count_nonzero(self.grid))
+        self.engine.reset()
+        self.select_engine()
         self.notify(UpdateType.CLEAR)
 
     def compute_next_generation(self, current_generation: np.ndarray) -> np.ndarray:
@@ -178,17 +435,7 @@ class GameState:
             np.ndarray: A new 2D NumPy array of the same shape as the input,
             representing the next generation of the grid.
         """
-        new_grid = np.zeros_like(current_generation)
-        neighbors = sum(
-            np.roll(np.roll(self.grid, i, 0), j, 1)
-            for i in (-1, 0, 1)
-            for j in (-1, 0, 1)
-            if (i != 0 or j != 0)
-        )
-        new_grid = ((neighbors == 3) | ((self.grid == 1) & (neighbors == 2))).astype(
-            int
-        )
-        return new_grid
+        return next_generation(current_generation)
 
     def toggle_view_achievements(self) -> None:
         """Toggle achievements view; ensure rules view is hidden."""
@@ -0,0 +1,51 @@
+"""Pure NumPy implementation of Conway's rules, free of any Pygame dependency."""
+
+import numpy as np
+
+
+def count_neighbors(grid: np.ndarray) -> np.ndarray:
+    """Count the live neighbours of every cell on a toroidal grid.
+
+    Args:
+        grid (np.ndarray): 2D array with `1` for live and `0` for dead cells,
+            or a stack of such boards (the last two axes are the board).
+
+    Returns:
+        np.ndarray: Array of the same shape holding the neighbour counts.
+    """
+    return sum(
+        np.roll(np.roll(grid, i, -2), j, -1)
+        for i in (-1, 0, 1)
+        for j in (-1, 0, 1)
+        if (i != 0 or j != 0)
+    )
+
+
+def next_generation(grid: np.ndarray) -> np.ndarray:
+    """Apply Conway's rules once (toroidal wrap) and return the new grid.
+
+    1. Any live cell with two or three live neighbors survives.
+    2. Any dead cell with exactly three live neighbors becomes alive.
+    3. All other cells die or remain dead.
+    """
+    neighbors = count_neighbors(grid)
+    return ((neighbors == 3) | ((grid == 1) & (neighbors == 2))).astype(grid.dtype)
+
+
+def next_generation_interior(padded: np.ndarray) -> np.ndarray:
+    """Apply Conway's rules to the interior of a block with a one-cell halo.
+
+    Unlike `next_generation` nothing wraps around: the outermost rows and
+    columns only provide the neighbours of the interior (e.g. cells of the
+    adjacent chunks) and are not part of the result. Works on the last two
+    axes, so a whole stack of blocks can be stepped at once.
+    """
+    height, width = padded.shape[-2:]
+    neighbors = sum(
+        padded[..., 1 + i : height - 1 + i, 1 + j : width - 1 + j]
+        for i in (-1, 0, 1)
+        for j in (-1, 0, 1)
+        if (i != 0 or j != 0)
+    )
+    cells = padded[..., 1:-1, 1:-1]
+    return ((neighbors == 3) | ((cells == 1) & (neighbors == 2))).astype(padded.dtype)
@@ -1,12 +1,30 @@
 """Controller Orchestrating persistance and Meta-Systems."""
 
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+
 import numpy as np
 
 from core.game_model import GameState, UpdateType
+from core.models.session_snapshot import SessionSnapshot
+from core.models.step_snapshot import StepSnapshot
 from core.services.achievement_manager import AchievementManager
+from core.services.analysis_scheduler import AnalysisScheduler
+from core.services.metrics import ANALYSIS_SECONDS
 from core.services.notification_service import NotificationService
 from core.services.rule_manager import RuleManager
 from core.services.tutorial_manager import TutorialManager
+from utils.settings import (
+    FPS,
+    META_FRAME_BUDGET,
+    META_MAX_STRIDE,
+    META_QUEUE_SIZE,
+    WORLD_ANALYSIS_CHUNKS,
+    WORLD_ANALYSIS_MARGIN,
+)
 
 
 class MetaController:
@@ -16,44 +34,281 @@ class MetaController:
     notifier: NotificationService
     old_grid: np.ndarray
 
-    def __init__(self, state: GameState, notifier: NotificationService) -> None:
+    def __init__(
+        self,
+        state: GameState,
+        notifier: NotificationService,
+        threaded: bool = True,
+        queue_size: int = META_QUEUE_SIZE,
+        wakeup: Callable[[], None] | None = None,
+    ) -> None:
+        """Create the meta-systems and (optionally) their analysis worker.
+
+        Args:
+            state (GameState): The model whose updates are analyzed.
+            notifier (NotificationService): UI-side notification sink.
+            threaded (bool): Analyze on a background worker instead of inline
+                (during `update` and `dispatch_notifications`).
+            queue_size (int): Maximum number of pending snapshots for the worker.
+            wakeup (Callable | None): Called (from any thread) when a notification
+                is waiting, so an idle UI loop can wake up to dispatch it.
+        """
         self.state = state
         self.state.subscribe(self.update)
         self.notifier = notifier
-        self.rules = RuleManager(notifier)
-        self.achievements = AchievementManager(notifier)
-        self.tutorial = TutorialManager(notifier)
+        self.wakeup = wakeup
+        # The managers never talk to the UI directly, their messages are
+        # collected here and handed to `notifier` on the UI thread.
+        self._outbox: queue.SimpleQueue = queue.SimpleQueue()
+        self.rules = RuleManager(self._post_notification)
+        self.achievements = AchievementManager(self._post_notification)
+        self.tutorial = TutorialManager(self._post_notification)
         self.old_grid = self.state.grid.copy()
+        # the cheap analyzers first, so their messages are not held up
+        self.analysis = AnalysisScheduler([
+            self.rules,
+            self.tutorial,
+            self.achievements,
+        ])
+
+        self.threaded = threaded
+        self.queue_size = queue_size
+        self.dropped_snapshots = 0
+        # only every `stride`-th generation is analyzed while falling behind
+        self.stride = 1
+        self._steps = 0
+        # chunks of a chunked world edited since the last analyzed step
+        self._edited: set[tuple[int, int]] = set()
+        self._snapshots: deque[StepSnapshot] = deque()
+        self._condition = threading.Condition()
+        # held while the analysis changes the managers' progress, so a save
+        # never reads it halfway through an update
+        self._progress = threading.Lock()
+        self._stopped = False
+        self._worker: threading.Thread | None = None
+        if threaded:
+            self._worker = threading.Thread(
+                target=self._run, name="meta-analysis", daemon=True
+            )
+            self._worker.start()
 
     def update(self, update_type: UpdateType) -> None:
         """Forward state to the Meta-Progression-Systems so they can update achievements, tutorials and others."""
+        if self.state.world is not None:
+            self._update_world(update_type)
+            return
         grid = self.state.grid.copy()
         # Don't do anything, if the grid hasn't changed
         if np.array_equal(self.old_grid, grid):
             return
 
-        # Get the relevant state
-        births = self.state.births.copy()
-        deaths = self.state.deaths.copy()
-        # Tell the managers to check!
         if update_type == UpdateType.STEP:
-            self.rules.update(grid, self.old_grid)
-            self.achievements.update(grid, births, deaths)
-            self.tutorial.update(
-                grid,
-                births,
-                deaths,
-                from_step=(update_type == UpdateType.STEP),
-                old_grid=self.old_grid,
-            )
-        elif update_type == UpdateType.CELL_TOGGLE:
-            self.tutorial.update(
-                grid,
-                births,
-                deaths,
-                from_step=(update_type == UpdateType.STEP),
+            self._steps += 1
+            if self._steps % self.stride:
+                self.old_grid = grid  # sampled out, the next one compares to this
+                return
+
+        if update_type in (UpdateType.STEP, UpdateType.CELL_TOGGLE):
+            snapshot = StepSnapshot(
+                update_type=update_type,
+                grid=grid,
                 old_grid=self.old_grid,
+                births=self.state.births.copy(),
+                deaths=self.state.deaths.copy(),
             )
+            self._submit(snapshot)
+            if not self.threaded:
+                self.analyze()
 
         # remember the grid
         self.old_grid = grid
+
+    def dispatch_notifications(self) -> None:
+        """Deliver notifications raised by the analysis to the UI (on the UI thread).
+
+        Without a worker, the analysis of queued generations continues here,
+        within the frame budget.
+        """
+        if not self.threaded and (self._snapshots or self.analysis.busy):
+            self.analyze()
+        while True:
+            try:
+                args, kwargs = self._outbox.get_nowait()
+            except queue.Empty:
+                return
+            self.notifier(*args, **kwargs)
+
+    @property
+    def pending_notifications(self) -> int:
+        """Notifications waiting for `dispatch_notifications`."""
+        return self._outbox.qsize()
+
+    @property
+    def pending_snapshots(self) -> int:
+        """Generations waiting for the analysis worker."""
+        return len(self._snapshots)
+
+    @property
+    def falling_behind(self) -> bool:
+        """Whether generations are skipped to keep up with the simulation."""
+        return self.stride > 1
+
+    def _update_world(self, update_type: UpdateType) -> None:
+        """Hand the chunks changed in a chunked world to the analysis.
+
+        Instead of a copy of the board, the snapshot stacks a block per
+        changed chunk, with WORLD_ANALYSIS_MARGIN cells of its neighbours,
+        after and before the change. At most WORLD_ANALYSIS_CHUNKS chunks
+        are taken per update, a different part of them each generation.
+        """
+        world = self.state.world
+        keys = world.last_changed
+        if update_type == UpdateType.CLEAR:
+            self._edited = set(keys)  # a loaded board is new to the analyzers
+            return
+        if update_type == UpdateType.CELL_TOGGLE:
+            # still lifes drawn by hand don't change in the next step, the
+            # analyzers see them with it all the same
+            self._edited.update(keys)
+        else:
+            self._steps += 1
+            if self._steps % self.stride:
+                return
+            keys += sorted(self._edited.difference(keys))
+            self._edited.clear()
+        if not keys:
+            return
+        if len(keys) > WORLD_ANALYSIS_CHUNKS:
+            first = self._steps * WORLD_ANALYSIS_CHUNKS % len(keys)
+            keys = (keys[first:] + keys[:first])[:WORLD_ANALYSIS_CHUNKS]
+
+        margin = WORLD_ANALYSIS_MARGIN
+        grid = np.stack([world.read_block(key, margin) for key in keys])
+        old_grid = np.stack([
+            world.read_block(key, margin, previous=True) for key in keys
+        ])
+        size = world.chunk_size
+        snapshot = StepSnapshot(
+            update_type=update_type,
+            grid=grid,
+            old_grid=old_grid,
+            births=grid > old_grid,
+            deaths=grid < old_grid,
+            margin=margin,
+            origins=tuple((cx * size, cy * size) for cx, cy in keys),
+        )
+        self._submit(snapshot)
+        if not self.threaded:
+            self.analyze()
+
+    def analyze(self, budget: float = META_FRAME_BUDGET) -> None:
+        """Analyze queued generations for up to `budget` seconds.
+
+        A generation that is not finished in time is resumed by the next call.
+        Used inline; the worker calls it once per frame's worth of time.
+        """
+        deadline = time.perf_counter() + budget
+        while time.perf_counter() < deadline:
+            if not self.analysis.busy:
+                with self._condition:
+                    if not self._snapshots:
+                        return
+                    snapshot = self._snapshots.popleft()
+                self.analysis.start(snapshot)
+            with self._progress:
+                finished = self.analysis.run(deadline)
+            if finished:
+                ANALYSIS_SECONDS.observe(self.analysis.spent)
+                self._adapt_sampling()
+
+    def capture_snapshot(self) -> SessionSnapshot:
+        """Capture the board and all meta-progression state for saving."""
+        with self._progress:
+            meta = {
+                "achievements": self.achievements.export_state(),
+                "rules": self.rules.export_state(),
+                "tutorial": self.tutorial.export_state(),
+            }
+        return SessionSnapshot(
+            grid=self.state.share_grid(),
+            generation=self.state.generation,
+            meta=meta,
+        )
+
+    def restore_snapshot(self, snapshot: SessionSnapshot) -> None:
+        """Resume a saved session: board, achievements, rules and tutorial."""
+        with self._progress:
+            self.achievements.restore_state(snapshot.meta.get("achievements", {}))
+            self.rules.restore_state(snapshot.meta.get("rules", {}))
+            self.tutorial.restore_state(snapshot.meta.get("tutorial", {}))
+        self.state.load_grid(snapshot.grid, snapshot.generation)
+
+    def stop(self) -> None:
+        """Stop the analysis worker, discarding snapshots that are still queued."""
+        with self._condition:
+            self._stopped = True
+            self._snapshots.clear()
+            self._condition.notify()
+        if self._worker is not None:
+            self._worker.join(timeout=1.0)
+        # the worker may still be inside analysis.run if the join timed out
+        with self._progress:
+            self.analysis.cancel()
+
+    def _post_notification(self, *args: object, **kwargs: object) -> None:
+        """NotificationService handed to the managers, safe to call from any thread."""
+        self._outbox.put((args, kwargs))
+        if self.wakeup is not None:
+            self.wakeup()
+
+    def _submit(self, snapshot: StepSnapshot) -> None:
+        """Queue a snapshot for the worker, dropping old generations when full."""
+        with self._condition:
+            if len(self._snapshots) >= self.queue_size:
+                # Every snapshot carries its own predecessor grid, so intermediate
+                # generations can be dropped safely. Manual edits are kept, the
+                # tutorial depends on seeing them.
+                for i, pending in enumerate(self._snapshots):
+                    if pending.update_type == UpdateType.STEP:
+                        del self._snapshots[i]
+                        break
+                else:
+                    self._snapshots.popleft()
+                self.dropped_snapshots += 1
+            self._snapshots.append(snapshot)
+            self._condition.notify()
+
+    def _run(self) -> None:
+        """Worker loop: analyze snapshots until stopped, a budget per frame."""
+        frame = 1 / FPS
+        while True:
+            with self._condition:
+                while (
+                    not self._snapshots and not self.analysis.busy and not self._stopped
+                ):
+                    self._condition.wait()
+                if self._stopped:
+                    return
+            start = time.perf_counter()
+            self.analyze()
+            if not self.analysis.busy and not self._snapshots:
+                continue
+            # leave the rest of the frame to the simulation and the UI
+            with self._condition:
+                while not self._stopped:
+                    remaining = start + frame - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+    def _adapt_sampling(self) -> None:
+        """Analyze fewer generations while they pile up, all of them once caught up."""
+        backlog = len(self._snapshots)
+        if backlog >= max(self.queue_size // 2, 1) and self.stride < META_MAX_STRIDE:
+            self.stride *= 2
+            if self.stride == 2:
+                print("Analysis is falling behind, skipping generations")
+        elif backlog == 0 and self.stride > 1:
+            self.stride //= 2
+            if self.stride == 1:
+                print("Analysis caught up, checking every generation again")
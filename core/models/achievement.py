@@ -1,4 +1,3 @@
-from collections.abc import Sequence
 from dataclasses import dataclass
 
 import numpy as np
@@ -12,6 +11,5 @@ class Achievement:
     title: str
     description: str
     pattern: np.ndarray
-    variants: Sequence[np.ndarray] | None = None
     icon_path: str = ACHIEVEMENT_ICON_PATH
     color: tuple[int, int, int] = ACHIEVEMENT_COLOUR
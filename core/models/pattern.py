@@ -0,0 +1,18 @@
+"""Data model for the objects of the pattern catalogue."""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Pattern:
+    code: str  # object code, see `core.catalogue.object_code`
+    name: str | None  # catalogue key of well-known objects
+    title: str | None  # set for the objects that unlock an achievement
+    description: str | None
+    min_population: int  # over all phases
+    max_population: int
+    period: int
+    dx: int  # cells moved per period (absolute, the larger first)
+    dy: int
+    extent: int  # longest bounding box edge over all phases
+    occurrences: int  # in the imported soup censuses
@@ -0,0 +1,13 @@
+"""Data model for a saved game session."""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SessionSnapshot:
+    grid: np.ndarray
+    generation: int = 0
+    # exported state of the meta-progression managers, keyed by manager name
+    meta: dict = field(default_factory=dict)
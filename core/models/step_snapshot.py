@@ -0,0 +1,59 @@
+"""Immutable snapshot of a single model update for the meta-progression systems."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    import numpy as np
+
+    from core.game_model import UpdateType
+
+
+@dataclass(frozen=True)
+class StepSnapshot:
+    """The board before and after an update, or the parts of it that changed.
+
+    A snapshot of an in-memory board holds 2-D arrays of the whole board. A
+    snapshot of a `ChunkedWorld` stacks a block per changed chunk instead
+    (3-D arrays): the chunk with `margin` cells of its neighbours around it,
+    which only complete the neighbourhoods and objects of the cells inside.
+    """
+
+    update_type: UpdateType
+    grid: np.ndarray
+    old_grid: np.ndarray
+    births: np.ndarray
+    deaths: np.ndarray
+    margin: int = 0
+    # board position (x, y) of the first cell inside the margin, per block
+    origins: tuple[tuple[int, int], ...] = ((0, 0),)
+
+    def __post_init__(self) -> None:
+        """Freeze the captured arrays so the worker can never mutate them."""
+        for array in (self.grid, self.old_grid, self.births, self.deaths):
+            array.setflags(write=False)
+
+    def regions(self) -> Iterator[StepSnapshot]:
+        """The parts of the board to analyze one by one, as 2-D snapshots."""
+        if self.grid.ndim == 2:
+            yield self
+            return
+        for i, origin in enumerate(self.origins):
+            yield StepSnapshot(
+                self.update_type,
+                self.grid[i],
+                self.old_grid[i],
+                self.births[i],
+                self.deaths[i],
+                self.margin,
+                (origin,),
+            )
+
+    def inner(self, array: np.ndarray) -> np.ndarray:
+        """The cells of one of the arrays inside the margin."""
+        m = self.margin
+        return array[..., m : array.shape[-2] - m, m : array.shape[-1] - m]
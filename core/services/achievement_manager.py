@@ -1,12 +1,25 @@
 """Handles unlocking and tracking of achievements."""
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import numpy as np
-import pygame
+from scipy import ndimage
 
+from core.catalogue import CONNECTIVITY, achievement_catalogue, pattern_catalogue
+from core.game_model import UpdateType
 from core.models.achievement import Achievement
 from core.services.notification_service import NotificationService
 from ui.icons import ACHIEVEMENT_ICON_PATH
 from ui.notification_manager import NotificationType
+from ui.utils import load_icon
+from utils.settings import META_SCAN_ROWS
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from core.models.step_snapshot import StepSnapshot
 
 
 class AchievementManager:
@@ -14,101 +27,87 @@ class AchievementManager:
 
     def __init__(self, notifier: NotificationService) -> None:
         self.unlocked: set[str] = set()
-        self.achievements: dict[str, Achievement] = {}
         self.notify = notifier
 
-        self.icon_sprite = pygame.image.load(ACHIEVEMENT_ICON_PATH).convert_alpha()
-        self.icon_sprite = pygame.transform.smoothscale(self.icon_sprite, (32, 32))
-        self._register_achievements()
-
-    def _register_achievements(self) -> None:
-        self.achievements["block"] = Achievement(
-            title="Still-Live: BLOCK",
-            description="Well, this one does nothing... (except survive)",
-            pattern=np.array([[1, 1], [1, 1]]),
-        )
-        tub = np.array([[0, 1, 0], [1, 0, 1], [0, 1, 0]])
-        self.achievements["tub"] = Achievement(
-            title="Still-Live: TUB",
-            description="Looks more like a star to me, but I wasn't asked...",
-            pattern=tub,
-        )
-        beehive = np.array([[0, 1, 1, 0], [1, 0, 0, 1], [0, 1, 1, 0]])
-        self.achievements["beehive"] = Achievement(
-            title="Still-Live: BEEHIVE",
-            description="Can you hear them humming?!",
-            pattern=beehive,
-            variants=[np.rot90(beehive)],
-        )
-        loaf = np.array([[0, 1, 1, 0], [1, 0, 0, 1], [0, 1, 0, 1], [0, 0, 1, 0]])
-        self.achievements["loaf"] = Achievement(
-            title="Still-Live: LOAF",
-            description="I think, they never saw real bread...",
-            pattern=loaf,
-            variants=[
-                np.rot90(loaf),
-                np.rot90(np.rot90(loaf)),
-                np.rot90(np.rot90(np.rot90(loaf))),
-            ],
-        )
-        boat = np.array([[1, 1, 0], [1, 0, 1], [0, 1, 0]])
-        self.achievements["boat"] = Achievement(
-            title="Still-Live: BOAT",
-            description="Maybe you see it if you squint reeealy hard?",
-            pattern=boat,
-            variants=[
-                np.rot90(boat),
-                np.rot90(np.rot90(boat)),
-                np.rot90(np.rot90(np.rot90(boat))),
-            ],
-        )
-        # TODO: add more oscillators
-        blinker = np.array([[1, 1, 1]])
-        self.achievements["blinker"] = Achievement(
-            title="Oscillator: BLINKER",
-            description="At least it does something!",
-            pattern=blinker,
-            variants=[np.rot90(blinker)],
-        )
-        # TODO: add more spaceships
-        glider = np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]])
-        self.achievements["glider"] = Achievement(
-            title="Spaceship: GLIDER",
-            description="Now, that's what I call some moves!",
-            pattern=glider,
-            variants=[
-                np.rot90(glider),
-                np.rot90(np.rot90(glider)),
-                np.rot90(np.rot90(np.rot90(glider))),
-            ],
-        )
+        self.icon_sprite = load_icon(ACHIEVEMENT_ICON_PATH)
+        self.achievements: dict[str, Achievement] = achievement_catalogue()
+        self.catalogue = pattern_catalogue()
+        # size and population of the patterns, to skip objects early
+        self.patterns = {key: self.catalogue.named(key) for key in self.achievements}
+
+    @property
+    def done(self) -> bool:
+        """Whether every achievement is unlocked, so there is nothing left to find."""
+        return len(self.unlocked) == len(self.achievements)
 
     def update(self, grid: np.ndarray, births: np.ndarray, deaths: np.ndarray) -> None:
         """Check for all registered achievements in the current grid."""
-        for key, achievement in self.achievements.items():
-            if key in self.unlocked:
-                continue
-            if self._contains_pattern(grid, achievement):
-                self._unlock(key, achievement)
-
-    def _contains_pattern(self, grid: np.ndarray, achievement: Achievement) -> bool:
-        """Return True if the grid contains the given pattern anywhere."""
-        patterns = [achievement.pattern]
-        if achievement.variants:
-            patterns += achievement.variants
-
-        for pattern in patterns:
-            ph, pw = pattern.shape
-            gh, gw = grid.shape
-
-            # simple sliding-window check using correlation
-            # match means all live cells of pattern match live cells in grid
-            for y in range(gh - ph + 1):
-                for x in range(gw - pw + 1):
-                    sub = grid[y : y + ph, x : x + pw]
-                    if np.array_equal(sub, pattern):
-                        return True
-        return False
+        for _ in self._search(grid):
+            pass
+
+    def scan(self, snapshot: StepSnapshot) -> Iterator[None]:
+        """Check a generation in slices of META_SCAN_ROWS rows."""
+        if snapshot.update_type == UpdateType.STEP:
+            for region in snapshot.regions():
+                yield from self._search(region.grid, region.margin)
+
+    def _search(self, grid: np.ndarray, margin: int = 0) -> Iterator[None]:
+        """Look up the objects of the grid, pausing after every band of rows.
+
+        Every isolated object (8-connected group of cells) that could be one
+        of the locked patterns by size and population is looked up in the
+        pattern catalogue, so any phase and orientation counts. Objects
+        don't wrap around the board's edges. Objects entirely within `margin`
+        of the edges are left to the neighbouring region.
+        """
+        locked = self.achievements.keys() - self.unlocked
+        if not locked:
+            return
+        extent = max(self.patterns[key].extent for key in locked)
+        fewest = min(self.patterns[key].min_population for key in locked)
+        most = max(self.patterns[key].max_population for key in locked)
+        height, width = grid.shape
+        for top in range(0, grid.shape[0], META_SCAN_ROWS):
+            # one row above the band, so objects reaching into the band before
+            # show as such, and enough below for objects starting in the band
+            start = max(top - 1, 0)
+            band = grid[start : top + META_SCAN_ROWS + extent]
+            labels, _ = ndimage.label(band, structure=CONNECTIVITY)
+            populations = np.bincount(labels.ravel())
+            areas = ndimage.find_objects(labels)
+            for label in np.flatnonzero(populations >= fewest).tolist():
+                if not label or populations[label] > most:
+                    continue
+                rows, cols = areas[label - 1]
+                if (
+                    not top <= start + rows.start < top + META_SCAN_ROWS
+                    or max(rows.stop - rows.start, cols.stop - cols.start) > extent
+                ):
+                    continue
+                if margin and (
+                    start + rows.stop <= margin
+                    or start + rows.start >= height - margin
+                    or cols.stop <= margin
+                    or cols.start >= width - margin
+                ):
+                    continue
+                pattern = self.catalogue.lookup(
+                    labels[rows, cols] == label, cropped=True
+                )
+                if pattern is not None and pattern.name in locked:
+                    locked.remove(pattern.name)
+                    self._unlock(pattern.name, self.achievements[pattern.name])
+            if not locked:
+                return
+            yield
+
+    def export_state(self) -> dict:
+        """Return the persistent progress as JSON-serializable data."""
+        return {"unlocked": sorted(self.unlocked)}
+
+    def restore_state(self, data: dict) -> None:
+        """Restore progress saved by `export_state` (without notifications)."""
+        self.unlocked = set(data.get("unlocked", [])) & self.achievements.keys()
 
     def _unlock(self, key: str, achievement: Achievement) -> None:
         """Record achievement and show notification."""
@@ -0,0 +1,78 @@
+"""Runs the meta-progression analyzers in time-budgeted slices.
+
+Analyzers (the rule, tutorial and achievement managers) check a generation
+with a `scan` generator that yields between slices of work, e.g. after each
+band of rows searched for a pattern. The scheduler advances the scans of
+one snapshot until a deadline and resumes them on the next call, so a long
+search is spread over several frames instead of stalling one. Analyzers
+that have nothing left to detect (`done`) are skipped.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from core.models.step_snapshot import StepSnapshot
+
+
+class Analyzer(Protocol):
+    """A meta-progression system that checks generations for something."""
+
+    @property
+    def done(self) -> bool:
+        """Whether there is nothing left to detect."""
+        ...
+
+    def scan(self, snapshot: StepSnapshot) -> Iterator[None]:
+        """Check a snapshot, yielding whenever the work may be paused."""
+        ...
+
+
+class AnalysisScheduler:
+    """Advances the analyzers' scans of one snapshot at a time until a deadline."""
+
+    def __init__(self, analyzers: list[Analyzer]) -> None:
+        """Schedule `analyzers` (cheap ones first, their messages arrive sooner)."""
+        self.analyzers = analyzers
+        self._scans: deque[Iterator[None]] = deque()
+        self.spent = 0.0  # seconds spent on the current snapshot so far
+
+    @property
+    def busy(self) -> bool:
+        """Whether a snapshot is partly analyzed."""
+        return bool(self._scans)
+
+    def start(self, snapshot: StepSnapshot) -> None:
+        """Begin analyzing a snapshot (the previous one must be finished)."""
+        self._scans = deque(
+            analyzer.scan(snapshot) for analyzer in self.analyzers if not analyzer.done
+        )
+        self.spent = 0.0
+
+    def run(self, deadline: float) -> bool:
+        """Work on the current snapshot until `deadline` (a `perf_counter` time).
+
+        Returns:
+            bool: True if the snapshot is fully analyzed, False if time ran out.
+        """
+        start = time.perf_counter()
+        try:
+            while self._scans:
+                if time.perf_counter() >= deadline:
+                    return False
+                try:
+                    next(self._scans[0])
+                except StopIteration:
+                    self._scans.popleft()
+            return True
+        finally:
+            self.spent += time.perf_counter() - start
+
+    def cancel(self) -> None:
+        """Abandon the current snapshot."""
+        self._scans.clear()
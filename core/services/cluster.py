@@ -0,0 +1,561 @@
+"""Steps one toroidal board on a cluster of worker processes connected by TCP.
+
+The coordinator splits the board into a grid of rectangular blocks, one per
+worker. Every generation each worker trades its one-cell halo directly with
+its four neighbours: first the columns (computing its interior while they
+are in flight), then the rows including the corners it just received. Births
+and deaths go back to the coordinator, bit-packed and compressed, so only
+the activity crosses the network, never the whole board.
+
+Frames on every connection (little endian):
+
+    kind u8 | generation u64 | payload length u32 | payload
+
+Workers write a checkpoint of their block every CLUSTER_CHECKPOINT_INTERVAL
+generations. If a worker fails, the coordinator restarts all of them from
+the last checkpoint and replays the generations since. Workers on other
+nodes connect to the coordinator themselves:
+
+    python -m core.services.cluster worker COORDINATOR_HOST:PORT
+
+`core.engines.cluster.ClusterEngine` lets `GameState` use a cluster like any
+other engine. A local benchmark (which also checks the result, and can kill
+a worker halfway to exercise the recovery) runs with:
+
+    python -m core.services.cluster bench --size 2048 --workers 4 --kill
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import queue
+import socket
+import struct
+import sys
+import threading
+import time
+import zlib
+from itertools import pairwise
+from pathlib import Path
+
+import numpy as np
+
+from core.life import next_generation, next_generation_interior
+from utils.settings import (
+    CLUSTER_CHECKPOINT_DIR,
+    CLUSTER_CHECKPOINT_INTERVAL,
+    CLUSTER_HOST,
+    CLUSTER_PORT,
+    CLUSTER_SPAWN,
+    CLUSTER_TIMEOUT,
+    CLUSTER_WORKERS,
+)
+
+FRAME = struct.Struct("<BQI")
+COUNTS = struct.Struct("<QQQI")  # population, births, deaths, births payload size
+
+# coordinator -> worker
+SETUP = 1
+LOAD = 2
+STEP = 3
+RESTORE = 4
+STOP = 5
+# worker -> coordinator
+HELLO = 10
+READY = 11
+REPORT = 12
+RESTORED = 13
+# worker -> worker
+PEER = 20
+HALO = 21
+
+# the sides of a block, and the side a neighbour receives our edge on
+SIDES = ("W", "E", "N", "S")
+OPPOSITE = {"W": "E", "E": "W", "N": "S", "S": "N"}
+
+
+class ClusterError(Exception):
+    """A worker failed, or the cluster could not be set up or recovered."""
+
+
+def send_frame(
+    sock: socket.socket, kind: int, generation: int, payload: bytes = b""
+) -> None:
+    """Send one frame; the payload is passed on without being copied."""
+    sock.sendall(FRAME.pack(kind, generation, len(payload)))
+    if payload:
+        sock.sendall(payload)
+
+
+def recv_exact(sock: socket.socket, size: int) -> bytearray:
+    """Receive exactly `size` bytes."""
+    data = bytearray(size)
+    view = memoryview(data)
+    while view:
+        received = sock.recv_into(view)
+        if not received:
+            msg = "Connection closed"
+            raise ConnectionError(msg)
+        view = view[received:]
+    return data
+
+
+def recv_frame(
+    sock: socket.socket, expected: int | None = None
+) -> tuple[int, int, bytearray]:
+    """Receive one frame, optionally checking its kind.
+
+    Returns:
+        tuple[int, int, bytearray]: Kind, generation and payload.
+    """
+    kind, generation, size = FRAME.unpack(recv_exact(sock, FRAME.size))
+    payload = recv_exact(sock, size) if size else bytearray()
+    if expected is not None and kind != expected:
+        msg = f"Expected a frame of kind {expected}, got {kind}"
+        raise ClusterError(msg)
+    return kind, generation, payload
+
+
+def pack_cells(cells: np.ndarray) -> bytes:
+    """Bit-packed, compressed cells (for blocks, births and deaths)."""
+    return zlib.compress(np.packbits(cells != 0).tobytes(), 1)
+
+
+def unpack_cells(data: bytes, shape: tuple[int, int]) -> np.ndarray:
+    """Inverse of `pack_cells`, as uint8."""
+    bits = np.frombuffer(zlib.decompress(data), dtype=np.uint8)
+    return np.unpackbits(bits, count=shape[0] * shape[1]).reshape(shape)
+
+
+def partition(shape: tuple[int, int], workers: int) -> tuple[np.ndarray, np.ndarray]:
+    """Split a board into a grid of about square blocks, one per worker.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The row and column edges of the blocks.
+    """
+    height, width = shape
+    best = None
+    for rows in range(1, workers + 1):
+        if workers % rows:
+            continue
+        cols = workers // rows
+        if rows > height or cols > width:
+            continue
+        squareness = abs(np.log((height / rows) / (width / cols)))
+        if best is None or squareness < best[0]:
+            best = (squareness, rows, cols)
+    if best is None:
+        msg = f"A {width}x{height} board cannot be split into {workers} blocks"
+        raise ClusterError(msg)
+    _, rows, cols = best
+    return (
+        np.linspace(0, height, rows + 1).astype(int),
+        np.linspace(0, width, cols + 1).astype(int),
+    )
+
+
+class Worker:
+    """One block of the board, stepped in lockstep with its neighbours."""
+
+    def __init__(self, coordinator: tuple[str, int]) -> None:
+        """Connect to the coordinator and listen for the neighbours."""
+        self.control = socket.create_connection(coordinator, CLUSTER_TIMEOUT)
+        self.control.settimeout(None)  # the coordinator may be idle for long
+        self.control.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        host = self.control.getsockname()[0]
+        self.listener = socket.create_server((host, 0))
+        self.block = np.zeros((0, 0), dtype=np.uint8)
+        self.generation = 0
+        self.outgoing: dict[str, socket.socket] = {}
+        self.incoming: dict[str, socket.socket] = {}
+        self._sends: queue.SimpleQueue = queue.SimpleQueue()
+        self._send_error: Exception | None = None
+        hello = {"host": host, "port": self.listener.getsockname()[1]}
+        send_frame(self.control, HELLO, 0, json.dumps(hello).encode())
+
+    def run(self) -> None:
+        """Serve the coordinator's commands until told to stop."""
+        threading.Thread(target=self._send_loop, name="halo-send", daemon=True).start()
+        while True:
+            kind, generation, payload = recv_frame(self.control)
+            if kind == SETUP:
+                self._setup(json.loads(payload))
+                send_frame(self.control, READY, 0)
+            elif kind == LOAD:
+                self.block = unpack_cells(payload, self.block.shape)
+                self.generation = generation
+                # checkpoints of the previous board are of no use any more
+                for old in self.checkpoint_dir.glob(f"block-{self.id}-*.npz"):
+                    old.unlink(missing_ok=True)
+                self._checkpoint()
+            elif kind == RESTORE:
+                self._restore(generation)
+                send_frame(self.control, RESTORED, self.generation)
+            elif kind == STEP:
+                report = self._step()
+                send_frame(self.control, REPORT, self.generation, report)
+            elif kind == STOP:
+                return
+
+    def _setup(self, config: dict) -> None:
+        """Take a block of the board and connect to the neighbours."""
+        self.id = config["id"]
+        self.block = np.zeros(config["shape"], dtype=np.uint8)
+        self.checkpoint_dir = Path(config["checkpoint_dir"])
+        self.checkpoint_interval = config["checkpoint_interval"]
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+        def accept() -> None:
+            self.listener.settimeout(CLUSTER_TIMEOUT)
+            for _ in SIDES:
+                conn, _ = self.listener.accept()
+                conn.settimeout(CLUSTER_TIMEOUT)
+                _, _, payload = recv_frame(conn, PEER)
+                # the neighbour sent us its edge of this side, our opposite halo
+                self.incoming[OPPOSITE[payload.decode()]] = conn
+
+        acceptor = threading.Thread(target=accept, daemon=True)
+        acceptor.start()
+        for side in SIDES:
+            conn = socket.create_connection(
+                tuple(config["neighbors"][side]), CLUSTER_TIMEOUT
+            )
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            send_frame(conn, PEER, 0, side.encode())
+            self.outgoing[side] = conn
+        acceptor.join()
+        if len(self.incoming) != len(SIDES):
+            msg = f"Worker {self.id} did not hear from all of its neighbours"
+            raise ClusterError(msg)
+
+    def _step(self) -> bytes:
+        """Compute the next generation of the block and describe the changes."""
+        block = self.block
+        height, width = block.shape
+        # columns first; the interior needs no halo and is computed meanwhile
+        self._send("W", block[:, 0])
+        self._send("E", block[:, -1])
+        interior = next_generation_interior(block) if height > 2 and width > 2 else None
+        wide = np.column_stack([
+            self._receive("W", height),
+            block,
+            self._receive("E", height),
+        ])
+        # then the rows, which now include the corners
+        self._send("N", wide[0])
+        self._send("S", wide[-1])
+        padded = np.vstack([
+            self._receive("N", width + 2),
+            wide,
+            self._receive("S", width + 2),
+        ])
+
+        if interior is None:
+            new = next_generation_interior(padded)
+        else:
+            new = np.empty_like(block)
+            new[1:-1, 1:-1] = interior
+            new[0] = next_generation_interior(padded[:3])[0]
+            new[-1] = next_generation_interior(padded[-3:])[0]
+            new[1:-1, 0] = next_generation_interior(padded[1:-1, :3])[:, 0]
+            new[1:-1, -1] = next_generation_interior(padded[1:-1, -3:])[:, 0]
+
+        births = new > block
+        deaths = new < block
+        self.block = new
+        self.generation += 1
+        if self.generation % self.checkpoint_interval == 0:
+            self._checkpoint()
+        packed_births = pack_cells(births)
+        counts = COUNTS.pack(
+            int(np.count_nonzero(new)),
+            int(np.count_nonzero(births)),
+            int(np.count_nonzero(deaths)),
+            len(packed_births),
+        )
+        return counts + packed_births + pack_cells(deaths)
+
+    def _send(self, side: str, edge: np.ndarray) -> None:
+        """Queue an edge for the neighbour on `side` (sent in the background)."""
+        if self._send_error is not None:
+            raise self._send_error
+        data = np.packbits(edge).tobytes()
+        self._sends.put((self.outgoing[side], self.generation, data))
+
+    def _send_loop(self) -> None:
+        while True:
+            conn, generation, data = self._sends.get()
+            try:
+                send_frame(conn, HALO, generation, data)
+            except OSError as e:
+                self._send_error = e
+
+    def _receive(self, side: str, size: int) -> np.ndarray:
+        """The halo of `side` for the current generation."""
+        _, generation, payload = recv_frame(self.incoming[side], HALO)
+        if generation != self.generation:
+            msg = f"Halo of generation {generation} at generation {self.generation}"
+            raise ClusterError(msg)
+        return np.unpackbits(np.frombuffer(payload, dtype=np.uint8), count=size)
+
+    def _checkpoint_path(self, generation: int) -> Path:
+        return self.checkpoint_dir / f"block-{self.id}-{generation}.npz"
+
+    def _checkpoint(self) -> None:
+        """Save the block, keeping the previous checkpoint until this one is done.
+
+        The coordinator only relies on a checkpoint once every worker wrote
+        it, so the one before must survive a failure in between.
+        """
+        path = self._checkpoint_path(self.generation)
+        tmp_path = path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, cells=np.packbits(self.block), shape=self.block.shape)
+        tmp_path.replace(path)
+        for old in self.checkpoint_dir.glob(f"block-{self.id}-*.npz"):
+            generation = int(old.stem.rsplit("-", 1)[1].split(".")[0])
+            if generation < self.generation - self.checkpoint_interval:
+                old.unlink(missing_ok=True)
+
+    def _restore(self, generation: int) -> None:
+        """Load the checkpoint of a generation."""
+        with np.load(self._checkpoint_path(generation)) as data:
+            size = int(np.prod(data["shape"]))
+            self.block = np.unpackbits(data["cells"], count=size).reshape(data["shape"])
+        self.generation = generation
+
+
+def run_worker(host: str, port: int) -> None:
+    """Process entry point of a worker (local or on another node)."""
+    try:
+        Worker((host, port)).run()
+    except (OSError, ClusterError):
+        sys.exit(1)  # the coordinator notices and recovers
+
+
+class Cluster:
+    """Coordinates the workers stepping one board."""
+
+    def __init__(
+        self,
+        shape: tuple[int, int],
+        workers: int = CLUSTER_WORKERS,
+        spawn: bool = CLUSTER_SPAWN,
+        checkpoint_dir: str | Path = CLUSTER_CHECKPOINT_DIR,
+    ) -> None:
+        """Start (or wait for) the workers and give each one its block.
+
+        Args:
+            shape (tuple[int, int]): Height and width of the board.
+            workers (int): Number of workers, and blocks.
+            spawn (bool): Start the workers as local processes, otherwise wait
+                for `workers` of them to connect to CLUSTER_HOST:CLUSTER_PORT.
+            checkpoint_dir (str | Path): Where the workers keep checkpoints.
+        """
+        self.shape = shape
+        self.workers = workers
+        self.spawn = spawn
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.row_edges, self.col_edges = partition(shape, workers)
+        self.generation = 0
+        self.checkpoint_generation: int | None = None
+        self.restarts = 0
+        self.population = 0
+        self.listener = socket.create_server((CLUSTER_HOST, CLUSTER_PORT))
+        self.address = self.listener.getsockname()[:2]
+        self.processes: list[multiprocessing.Process] = []
+        self.links: list[socket.socket] = []
+        self._start()
+
+    @property
+    def blocks(self) -> list[tuple[slice, slice]]:
+        """The area of the board of every worker, in worker order."""
+        return [
+            (slice(top, bottom), slice(left, right))
+            for top, bottom in pairwise(self.row_edges.tolist())
+            for left, right in pairwise(self.col_edges.tolist())
+        ]
+
+    def load(self, grid: np.ndarray, generation: int = 0) -> None:
+        """Hand the board to the workers (they checkpoint it right away)."""
+        for link, area in zip(self.links, self.blocks, strict=True):
+            send_frame(link, LOAD, generation, pack_cells(grid[area]))
+        self.generation = self.checkpoint_generation = generation
+        self.population = int(np.count_nonzero(grid))
+
+    def step(self) -> tuple[np.ndarray, np.ndarray, int, int]:
+        """Advance the board by one generation, restarting failed workers.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, int, int]: Births and deaths (bool
+            masks of the whole board) and their counts.
+        """
+        try:
+            return self._step()
+        except (OSError, ClusterError) as e:
+            self.recover(e)
+            return self._step()
+
+    def recover(self, error: Exception) -> None:
+        """Restart every worker from the last checkpoint and catch up again."""
+        if not self.spawn or self.checkpoint_generation is None:
+            msg = f"Cluster worker failed: {error}"
+            raise ClusterError(msg) from error
+        print(f"Cluster worker failed ({error}), restarting from checkpoint")
+        self.restarts += 1
+        self._stop_workers()
+        self._start()
+        for link in self.links:
+            send_frame(link, RESTORE, self.checkpoint_generation)
+        for link in self.links:
+            recv_frame(link, RESTORED)
+        target, self.generation = self.generation, self.checkpoint_generation
+        while self.generation < target:
+            self._step()
+
+    def close(self) -> None:
+        """Stop the workers and the coordinator."""
+        self._stop_workers()
+        self.listener.close()
+
+    def _stop_workers(self) -> None:
+        for link in self.links:
+            with contextlib.suppress(OSError):
+                send_frame(link, STOP, self.generation)
+            link.close()
+        for process in self.processes:
+            process.join(timeout=1.0)
+            if process.is_alive():
+                process.kill()
+        self.links = []
+        self.processes = []
+
+    def _start(self) -> None:
+        """Start the workers, hand out the blocks and wait until all are ready."""
+        if self.spawn:
+            context = multiprocessing.get_context("spawn")
+            self.processes = [
+                context.Process(
+                    target=run_worker, args=self.address, name="cluster", daemon=True
+                )
+                for _ in range(self.workers)
+            ]
+            for process in self.processes:
+                process.start()
+
+        peers = []
+        self.listener.settimeout(CLUSTER_TIMEOUT if self.spawn else None)
+        for _ in range(self.workers):
+            try:
+                link, _ = self.listener.accept()
+                link.settimeout(CLUSTER_TIMEOUT)
+                link.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                hello = json.loads(recv_frame(link, HELLO)[2])
+            except (OSError, ValueError) as e:
+                msg = f"Cluster workers did not start: {e}"
+                raise ClusterError(msg) from e
+            self.links.append(link)
+            peers.append((hello["host"], hello["port"]))
+
+        rows, cols = len(self.row_edges) - 1, len(self.col_edges) - 1
+        for i, (link, (ys, xs)) in enumerate(zip(self.links, self.blocks, strict=True)):
+            row, col = divmod(i, cols)
+            neighbors = {
+                "W": peers[row * cols + (col - 1) % cols],
+                "E": peers[row * cols + (col + 1) % cols],
+                "N": peers[(row - 1) % rows * cols + col],
+                "S": peers[(row + 1) % rows * cols + col],
+            }
+            config = {
+                "id": i,
+                "shape": [ys.stop - ys.start, xs.stop - xs.start],
+                "neighbors": neighbors,
+                "checkpoint_dir": str(self.checkpoint_dir),
+                "checkpoint_interval": CLUSTER_CHECKPOINT_INTERVAL,
+            }
+            send_frame(link, SETUP, 0, json.dumps(config).encode())
+        for link in self.links:
+            recv_frame(link, READY)
+
+    def _step(self) -> tuple[np.ndarray, np.ndarray, int, int]:
+        for link in self.links:
+            send_frame(link, STEP, self.generation)
+        births = np.zeros(self.shape, dtype=bool)
+        deaths = np.zeros(self.shape, dtype=bool)
+        population = n_births = n_deaths = 0
+        for link, area in zip(self.links, self.blocks, strict=True):
+            _, generation, report = recv_frame(link, REPORT)
+            if generation != self.generation + 1:
+                msg = f"Worker at generation {generation}, not {self.generation + 1}"
+                raise ClusterError(msg)
+            block_population, block_births, block_deaths, size = COUNTS.unpack_from(
+                report
+            )
+            shape = births[area].shape
+            start = COUNTS.size
+            births[area] = unpack_cells(report[start : start + size], shape)
+            deaths[area] = unpack_cells(report[start + size :], shape)
+            population += block_population
+            n_births += block_births
+            n_deaths += block_deaths
+        self.generation += 1
+        self.population = population
+        if self.generation % CLUSTER_CHECKPOINT_INTERVAL == 0:
+            self.checkpoint_generation = self.generation
+        return births, deaths, n_births, n_deaths
+
+
+def benchmark(size: int, workers: int, generations: int, kill: bool) -> None:
+    """Step a random board on a local cluster and check it against NumPy."""
+    rng = np.random.default_rng(0)
+    grid = (rng.random((size, size)) < 0.3).astype(np.uint8)
+    expected = grid
+    cluster = Cluster(grid.shape, workers)
+    try:
+        cluster.load(grid)
+        start = time.perf_counter()
+        for generation in range(generations):
+            if kill and generation == generations // 2:
+                cluster.processes[-1].kill()
+            births, deaths, _, _ = cluster.step()
+            grid = grid.copy()
+            grid[births] = 1
+            grid[deaths] = 0
+        elapsed = time.perf_counter() - start
+    finally:
+        cluster.close()
+    for _ in range(generations):
+        expected = next_generation(expected)
+
+    rate = generations * grid.size / elapsed / 1e6
+    verdict = "matches" if np.array_equal(grid, expected) else "DIFFERS FROM"
+    print(
+        f"{generations} generations of {size}x{size} on {workers} workers: "
+        f"{rate:.1f} Mcells/s, restarted {cluster.restarts} times, {verdict} NumPy"
+    )
+
+
+def main() -> None:
+    """Command line entry point: run a worker, or benchmark a local cluster."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    worker = commands.add_parser("worker", help="serve a coordinator")
+    worker.add_argument("coordinator", help="HOST:PORT")
+    bench = commands.add_parser("bench", help="benchmark a local cluster")
+    bench.add_argument("--size", type=int, default=2048)
+    bench.add_argument("--workers", type=int, default=CLUSTER_WORKERS)
+    bench.add_argument("--generations", type=int, default=200)
+    bench.add_argument("--kill", action="store_true", help="kill a worker halfway")
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        host, port = args.coordinator.rsplit(":", 1)
+        run_worker(host, int(port))
+    else:
+        benchmark(args.size, args.workers, args.generations, args.kill)
+
+
+if __name__ == "__main__":
+    main()
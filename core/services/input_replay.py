@@ -0,0 +1,344 @@
+"""Record the input of a session and replay it headless as a benchmark.
+
+`InputRecorder` logs, frame by frame, the events handed to
+`GameController.handle_events` and every time `GameState` read its clock,
+together with the starting board, the meta-progression and the seed of the
+sound effects. A replay feeds the same events and clock readings back
+without any frame-rate cap, so it steps exactly the same generations, just
+as fast as the machine allows:
+
+    python main.py --record-input session.replay
+    python -m core.services.input_replay session.replay
+
+Replays run under the SDL dummy video and audio drivers and print the
+frame-time distribution of every phase of the main loop, plus the hash of
+the final board (checked against the one recorded).
+
+The file holds JSON lines: a header, one line per frame and a footer.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pygame
+
+from core.models.session_snapshot import SessionSnapshot
+
+if TYPE_CHECKING:
+    from core.game_model import GameState
+    from core.meta_controller import MetaController
+    from ui.notification_manager import NotificationType
+
+REPLAY_VERSION = 1
+# Events that reach the controller's logic, others are not recorded
+RECORDED_EVENTS = (
+    pygame.QUIT,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEBUTTONUP,
+    pygame.MOUSEMOTION,
+    pygame.MOUSEWHEEL,
+    pygame.KEYDOWN,
+    pygame.KEYUP,
+)
+# Timed phases of a frame, in the order of the main loop
+PHASES = ("input", "update", "notifications", "render", "frame")
+
+
+class ReplayError(Exception):
+    """The recording is unreadable, or the replay stopped following it."""
+
+
+def board_hash(grid: np.ndarray) -> str:
+    """Short fingerprint of a board's shape and live cells."""
+    digest = hashlib.sha256(str(grid.shape).encode())
+    digest.update(np.packbits(grid != 0).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def encode_board(grid: np.ndarray) -> str:
+    """A board as text: base64 of the compressed, bit-packed cells."""
+    return base64.b64encode(zlib.compress(np.packbits(grid != 0).tobytes())).decode()
+
+
+def decode_board(data: str, width: int, height: int) -> np.ndarray:
+    """Inverse of `encode_board`."""
+    bits = np.frombuffer(zlib.decompress(base64.b64decode(data)), np.uint8)
+    return np.unpackbits(bits, count=width * height).reshape(height, width)
+
+
+def encode_event(event: pygame.event.Event, mouse: tuple[int, int]) -> dict:
+    """The JSON form of an event (attributes that are plain values only)."""
+    data: dict = {"type": event.type}
+    for key, value in event.dict.items():
+        if isinstance(value, bool | int | float | str):
+            data[key] = value
+        elif isinstance(value, tuple):
+            data[key] = list(value)
+    if event.type == pygame.MOUSEWHEEL:
+        data.setdefault("pos", list(mouse))  # the controller zooms at the pointer
+    return data
+
+
+def decode_event(data: dict) -> pygame.event.Event:
+    """Inverse of `encode_event`."""
+    attributes = {
+        key: tuple(value) if isinstance(value, list) else value
+        for key, value in data.items()
+        if key != "type"
+    }
+    return pygame.event.Event(data["type"], attributes)
+
+
+class InputRecorder:
+    """Logs the input and clock readings of a running game, frame by frame."""
+
+    def __init__(
+        self, path: str | Path, state: GameState, meta: MetaController, seed: int
+    ) -> None:
+        """Start a recording of the current session.
+
+        Args:
+            path (str | Path): Output file.
+            state (GameState): The model; its clock is routed through the recorder.
+            meta (MetaController): Source of the board and meta-progression the
+                replay starts from.
+            seed (int): Seed the state's sound effects were created with.
+        """
+        self.state = state
+        self.file = Path(path).open("w")  # noqa: SIM115 (open until `close`)
+        snapshot = meta.capture_snapshot()
+        self._write({
+            "version": REPLAY_VERSION,
+            "seed": seed,
+            "width": state.width,
+            "height": state.height,
+            "generation": snapshot.generation,
+            "board": encode_board(snapshot.grid),
+            "meta": snapshot.meta,
+            "last_update_time": state.last_update_time,
+        })
+        self._frame: dict | None = None
+        self._clock, state.clock = state.clock, self._read_clock
+
+    def capture(self, events: list[pygame.event.Event]) -> list[pygame.event.Event]:
+        """Start a new frame with the events about to be handled, and pass them on."""
+        self._flush_frame()
+        mouse = pygame.mouse.get_pos()
+        self._frame = {
+            "events": [
+                encode_event(e, mouse) for e in events if e.type in RECORDED_EVENTS
+            ],
+            "clock": [],
+        }
+        return events
+
+    def close(self) -> None:
+        """Write the last frame and the final board's hash."""
+        self._flush_frame()
+        self._write({
+            "final_generation": self.state.generation,
+            "hash": board_hash(self.state.grid),
+        })
+        self.state.clock = self._clock
+        self.file.close()
+
+    def _read_clock(self) -> float:
+        now = self._clock()
+        if self._frame is not None:
+            self._frame["clock"].append(now)
+        return now
+
+    def _flush_frame(self) -> None:
+        if self._frame is not None:
+            self._write(self._frame)
+            self._frame = None
+
+    def _write(self, record: dict) -> None:
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+def read_recording(path: str | Path) -> tuple[dict, list[dict], dict | None]:
+    """Read a recording.
+
+    Returns:
+        tuple[dict, list[dict], dict | None]: The header, the frames and the
+        footer (None if the recording was not closed properly).
+    """
+    try:
+        with Path(path).open() as file:
+            records = [json.loads(line) for line in file if line.strip()]
+    except (OSError, ValueError) as e:
+        msg = f"Cannot read recording {path}: {e}"
+        raise ReplayError(msg) from e
+    if not records or records[0].get("version") != REPLAY_VERSION:
+        msg = f"{path} is not a version {REPLAY_VERSION} input recording"
+        raise ReplayError(msg)
+    header, frames = records[0], records[1:]
+    footer = frames.pop() if frames and "hash" in frames[-1] else None
+    return header, frames, footer
+
+
+@dataclass
+class ReplayReport:
+    """Outcome and timings of a replay."""
+
+    frames: int
+    generations: int
+    elapsed: float  # seconds
+    board_hash: str
+    expected_hash: str | None
+    timings: dict[str, np.ndarray]  # seconds per frame, for each phase
+
+    @property
+    def matches(self) -> bool:
+        """Whether the final board is the one of the recording."""
+        return self.expected_hash is None or self.board_hash == self.expected_hash
+
+    def summary(self) -> str:
+        """Human readable report: frame-time percentiles per phase."""
+        fps = self.frames / max(self.elapsed, 1e-9)
+        lines = [
+            f"Replayed {self.frames} frames and {self.generations} generations "
+            f"in {self.elapsed:.2f} s ({fps:.0f} fps)",
+            f"{'phase (ms)':<14}{'mean':>8}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}",
+        ]
+        for phase, times in self.timings.items():
+            ms = times * 1000 if len(times) else np.zeros(1)
+            p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+            lines.append(
+                f"{phase:<14}{ms.mean():8.2f}{p50:8.2f}{p95:8.2f}{p99:8.2f}{ms.max():8.2f}"
+            )
+        if self.expected_hash is None:
+            verdict = "no hash recorded"
+        elif self.matches:
+            verdict = "matches the recording"
+        else:
+            verdict = f"differs from the recorded {self.expected_hash}"
+        lines.append(f"Final board {self.board_hash} ({verdict})")
+        return "\n".join(lines)
+
+
+def replay(path: str | Path) -> ReplayReport:
+    """Replay a recording at full speed and time every phase of each frame.
+
+    Uses the SDL dummy drivers unless other ones were chosen, and analyzes
+    the meta-progression inline, so that its cost shows up in the timings.
+    """
+    header, frames, footer = read_recording(path)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+
+    # imported late: these create Pygame resources at import or construction
+    from core.game_controller import GameController
+    from core.game_model import GameState
+    from core.meta_controller import MetaController
+    from core.services.journal import GenerationJournal
+    from core.view import GameView
+
+    width, height = header["width"], header["height"]
+    state = GameState(width, height, seed=header["seed"])
+    view = GameView(state)
+
+    def notifier(
+        ntype: NotificationType,
+        message: str,
+        duration: float = 3.0,
+        item_sprite: pygame.SurfaceType | None = None,
+    ) -> None:
+        view.notification_manager.push(message, ntype, duration, item_sprite)
+
+    meta = MetaController(state, notifier, threaded=False)
+    view.add_meta_system(meta)
+    board = decode_board(header["board"], width, height)
+    meta.restore_snapshot(SessionSnapshot(board, header["generation"], header["meta"]))
+
+    readings: deque[float] = deque()
+
+    def clock() -> float:
+        if not readings:
+            msg = f"Replay of {path} diverged: the game read its clock more often"
+            raise ReplayError(msg)
+        return readings.popleft()
+
+    state.clock = clock
+    state.last_update_time = header["last_update_time"]
+    start_generation = state.generation
+    timings: dict[str, list[float]] = {phase: [] for phase in PHASES}
+
+    with tempfile.TemporaryDirectory() as journal_dir:
+        journal = GenerationJournal(journal_dir, (height, width))
+        journal.attach(state)
+        controller = GameController(state, view, journal)
+        start = time.perf_counter()
+        for frame in frames:
+            readings.extend(frame["clock"])
+            events = [decode_event(event) for event in frame["events"]]
+            t0 = time.perf_counter()
+            running = controller.handle_events(events)
+            t1 = time.perf_counter()
+            state.update()
+            t2 = time.perf_counter()
+            meta.dispatch_notifications()
+            t3 = time.perf_counter()
+            view.draw()
+            t4 = time.perf_counter()
+            for phase, seconds in zip(
+                PHASES, (t1 - t0, t2 - t1, t3 - t2, t4 - t3, t4 - t0), strict=True
+            ):
+                timings[phase].append(seconds)
+            if readings:
+                msg = f"Replay of {path} diverged: the game skipped clock readings"
+                raise ReplayError(msg)
+            if not running:
+                break
+        elapsed = time.perf_counter() - start
+        if controller.recorder is not None:
+            controller.toggle_recording()
+        meta.stop()
+        journal.close()
+
+    report = ReplayReport(
+        frames=len(timings["frame"]),
+        generations=state.generation - start_generation,
+        elapsed=elapsed,
+        board_hash=board_hash(state.grid),
+        expected_hash=footer["hash"] if footer else None,
+        timings={phase: np.array(times) for phase, times in timings.items()},
+    )
+    pygame.quit()
+    return report
+
+
+def main() -> None:
+    """Command line entry point: replay a recording and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording", type=Path)
+    args = parser.parse_args()
+
+    try:
+        report = replay(args.recording)
+    except ReplayError as e:
+        print(e)
+        sys.exit(2)
+    print(report.summary())
+    if not report.matches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
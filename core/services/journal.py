@@ -0,0 +1,264 @@
+"""Append-only journal of a run, for rewinding and scrubbing through generations.
+
+Instead of full boards the journal stores what `GameState.step()` already
+computes: the births and deaths of every generation (and of manual edits)
+as flat cell indices. Every `keyframe_interval` generations a full,
+compressed board is written and a new segment file is started, so seeking to
+any generation costs one keyframe plus at most `keyframe_interval` deltas.
+
+Segment files are a sequence of records (little endian):
+
+    kind u8 | padding | generation u64 | a u32 | b u32 | payload
+
+    keyframe: a = payload length, payload = zlib-compressed bit-packed board
+    delta:    a = births, b = deaths, payload = u32 cell indices, births first
+
+Segments are read through memory maps and deltas are applied straight from
+the map. When the journal outgrows its byte budget, the oldest segments are
+deleted.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import zlib
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
+
+import numpy as np
+
+from core.game_model import UpdateType
+from utils.settings import JOURNAL_BUDGET, JOURNAL_KEYFRAME_INTERVAL
+
+if TYPE_CHECKING:
+    from core.game_model import GameState
+
+KEYFRAME = 0
+DELTA = 1
+RECORD = struct.Struct("<BxxxQII")
+SEGMENT_GLOB = "segment_*.golj"
+
+
+@dataclass
+class _Segment:
+    """A keyframe and the deltas following it, stored in one file."""
+
+    path: Path
+    first_generation: int
+    generations: list[int] = field(default_factory=list)  # per record
+    offsets: list[int] = field(default_factory=list)  # per record
+    size: int = 0
+    mapping: mmap.mmap | None = None
+    mapped_size: int = 0
+
+
+class GenerationJournal:
+    """Records every generation of a `GameState` and restores any of them."""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        shape: tuple[int, int],
+        keyframe_interval: int = JOURNAL_KEYFRAME_INTERVAL,
+        budget: int = JOURNAL_BUDGET,
+    ) -> None:
+        """Start an empty journal; segments of a previous run are removed.
+
+        Args:
+            directory (str | Path): Directory holding the segment files.
+            shape (tuple[int, int]): Board height and width.
+            keyframe_interval (int): Generations between full keyframes.
+            budget (int): Bytes on disk before the oldest segments are evicted.
+        """
+        self.directory = Path(directory)
+        self.height, self.width = shape
+        self.keyframe_interval = keyframe_interval
+        self.budget = budget
+        self.size = 0
+        # generation shown after a rewind; None while at the head of the run
+        self.position: int | None = None
+        self._segments: list[_Segment] = []
+        self._file: BinaryIO | None = None
+        self._next_segment = 0
+        self._state: GameState | None = None
+        self._seeking = False
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for path in self.directory.glob(SEGMENT_GLOB):
+            path.unlink()  # a journal covers a single run
+
+    @property
+    def first_generation(self) -> int | None:
+        """Oldest generation that can still be restored."""
+        return self._segments[0].first_generation if self._segments else None
+
+    @property
+    def last_generation(self) -> int | None:
+        """Newest recorded generation."""
+        return self._segments[-1].generations[-1] if self._segments else None
+
+    def attach(self, state: GameState) -> None:
+        """Journal every change of a `GameState`, starting with its current board."""
+        self._state = state
+        state.subscribe(self.on_state_change)
+        self.append_keyframe(state.grid, state.generation)
+
+    def detach(self) -> None:
+        """Stop following the attached `GameState`."""
+        if self._state is not None:
+            self._state.unsubscribe(self.on_state_change)
+            self._state = None
+
+    def close(self) -> None:
+        """Detach and release all files (the segments stay on disk)."""
+        self.detach()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        for segment in self._segments:
+            self._unmap(segment)
+
+    def on_state_change(self, update_type: UpdateType) -> None:
+        """Append the change of the attached state to the journal."""
+        state = self._state
+        if self._seeking or state is None:
+            return
+        if self.position is not None:
+            # continuing from a rewound generation starts a new future
+            self.branch(self.position)
+
+        keyframe_due = (
+            update_type == UpdateType.STEP
+            and state.generation - self._segments[-1].first_generation
+            >= self.keyframe_interval
+        )
+        if update_type == UpdateType.CLEAR or keyframe_due:
+            self.append_keyframe(state.grid, state.generation)
+        else:
+            self.append_delta(state.generation, state.births, state.deaths)
+
+    def append_keyframe(self, grid: np.ndarray, generation: int) -> None:
+        """Store a full board and start a new segment with it."""
+        payload = zlib.compress(np.packbits(grid != 0).tobytes(), 1)
+        if self._file is not None:
+            self._file.close()
+        path = self.directory / f"segment_{self._next_segment:08d}.golj"
+        self._next_segment += 1
+        self._segments.append(_Segment(path, generation))
+        self._file = path.open("wb")
+        self._append(KEYFRAME, generation, len(payload), 0, payload)
+
+    def append_delta(
+        self, generation: int, births: np.ndarray, deaths: np.ndarray
+    ) -> None:
+        """Store the cells that were born and died to reach `generation`."""
+        born = np.flatnonzero(births).astype(np.uint32)
+        died = np.flatnonzero(deaths).astype(np.uint32)
+        payload = born.tobytes() + died.tobytes()
+        self._append(DELTA, generation, len(born), len(died), payload)
+
+    def seek(self, generation: int) -> np.ndarray:
+        """Reconstruct the board as it was at the end of `generation`."""
+        first, last = self.first_generation, self.last_generation
+        if first is None or not first <= generation <= last:
+            msg = f"Generation {generation} is not in the journal ({first}-{last})."
+            raise ValueError(msg)
+
+        segment = self._segments[self._segment_index(generation)]
+        data = self._map(segment)
+        _kind, _generation, length, _ = RECORD.unpack_from(data, 0)
+        blob = zlib.decompress(memoryview(data)[RECORD.size : RECORD.size + length])
+        bits = np.frombuffer(blob, dtype=np.uint8)
+        cells = np.unpackbits(bits, count=self.width * self.height)
+
+        end = bisect_right(segment.generations, generation)
+        for offset in segment.offsets[1:end]:
+            _kind, _generation, n_births, n_deaths = RECORD.unpack_from(data, offset)
+            changed = np.frombuffer(
+                data, np.uint32, n_births + n_deaths, offset + RECORD.size
+            )
+            cells[changed[:n_births]] = 1
+            cells[changed[n_births:]] = 0
+        return cells.reshape(self.height, self.width)
+
+    def rewind(self, generation: int) -> None:
+        """Show `generation` on the attached board, keeping the later history.
+
+        The history after `generation` is only discarded once the board is
+        changed again from there (see `branch`).
+        """
+        grid = self.seek(generation)
+        self._seeking = True
+        try:
+            self._state.load_grid(grid, generation)
+        finally:
+            self._seeking = False
+        self.position = None if generation == self.last_generation else generation
+
+    def branch(self, generation: int) -> None:
+        """Discard the history after `generation` to record a different future."""
+        if self._file is not None:
+            self._file.close()
+        index = self._segment_index(generation)
+        for segment in self._segments[index + 1 :]:
+            self._drop(segment)
+        del self._segments[index + 1 :]
+
+        segment = self._segments[index]
+        end = bisect_right(segment.generations, generation)
+        if end < len(segment.generations):
+            self.size -= segment.size - segment.offsets[end]
+            segment.size = segment.offsets[end]
+            del segment.generations[end:]
+            del segment.offsets[end:]
+        self._unmap(segment)
+        self._file = segment.path.open("r+b")
+        self._file.truncate(segment.size)
+        self._file.seek(segment.size)
+        self.position = None
+
+    def _append(
+        self, kind: int, generation: int, a: int, b: int, payload: bytes
+    ) -> None:
+        """Write a record to the newest segment and enforce the byte budget."""
+        segment = self._segments[-1]
+        segment.generations.append(generation)
+        segment.offsets.append(segment.size)
+        self._file.write(RECORD.pack(kind, generation, a, b))
+        self._file.write(payload)
+        written = RECORD.size + len(payload)
+        segment.size += written
+        self.size += written
+
+        while self.size > self.budget and len(self._segments) > 1:
+            self._drop(self._segments.pop(0))
+
+    def _segment_index(self, generation: int) -> int:
+        """Index of the newest segment whose keyframe is at or before `generation`."""
+        firsts = [segment.first_generation for segment in self._segments]
+        return max(bisect_right(firsts, generation) - 1, 0)
+
+    def _map(self, segment: _Segment) -> mmap.mmap:
+        """Memory-map a segment, remapping it if it grew since the last read."""
+        if segment is self._segments[-1] and self._file is not None:
+            self._file.flush()
+        if segment.mapping is None or segment.mapped_size != segment.size:
+            self._unmap(segment)
+            with segment.path.open("rb") as f:
+                segment.mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            segment.mapped_size = segment.size
+        return segment.mapping
+
+    def _unmap(self, segment: _Segment) -> None:
+        if segment.mapping is not None:
+            segment.mapping.close()
+            segment.mapping = None
+
+    def _drop(self, segment: _Segment) -> None:
+        """Delete a segment file."""
+        self._unmap(segment)
+        self.size -= segment.size
+        segment.path.unlink(missing_ok=True)
@@ -0,0 +1,289 @@
+"""In-process metrics and an opt-in HTTP endpoint in Prometheus text format.
+
+The game updates a few module-level instruments on its hot paths: plain
+integer and float additions, without locks. Each instrument must only be
+written by one thread (see the instrument definitions), so a scrape that
+races with an update is at most one observation behind. Everything else
+(population, queue depths, memory) is read only when `/metrics` is scraped.
+
+Enable with `METRICS_SERVER = True`, then point Prometheus (or curl) at:
+
+    http://127.0.0.1:9464/metrics
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from utils.settings import METRICS_HOST, METRICS_PORT
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+if TYPE_CHECKING:
+    from core.game_model import GameState
+    from core.meta_controller import MetaController
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+
+class Counter:
+    """A monotonically increasing count, kept here or read from `source`."""
+
+    kind = "counter"
+
+    def __init__(
+        self, name: str, help_text: str, source: Callable[[], float] | None = None
+    ) -> None:
+        """Create a counter (`name` should end in `_total`)."""
+        self.name = name
+        self.help_text = help_text
+        self.source = source
+        self.value = 0
+
+    def inc(self, amount: float = 1) -> None:
+        """Add to the counter (from a single thread, the update is not locked)."""
+        self.value += amount
+
+    def samples(self) -> list[tuple[str, float]]:
+        """The sample lines of this metric as (name with labels, value)."""
+        return [(self.name, self.source() if self.source else self.value)]
+
+
+class Gauge(Counter):
+    """A value that can go up and down, usually read from `source`."""
+
+    kind = "gauge"
+
+    def set(self, value: float) -> None:
+        """Set the current value."""
+        self.value = value
+
+
+class Rate(Gauge):
+    """Per-second rate of a counter, measured between two scrapes."""
+
+    def __init__(self, name: str, help_text: str, counter: Counter) -> None:
+        """Create a gauge following the rate of `counter`."""
+        super().__init__(name, help_text)
+        self.counter = counter
+        self._last = (time.monotonic(), counter.value)
+
+    def samples(self) -> list[tuple[str, float]]:
+        """The rate since the previous scrape."""
+        now, count = time.monotonic(), self.counter.value
+        last_time, last_count = self._last
+        if now > last_time:
+            self.value = (count - last_count) / (now - last_time)
+        self._last = (now, count)
+        return [(self.name, self.value)]
+
+
+class Histogram:
+    """Distribution of observed values (e.g. latencies) over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help_text: str, buckets: tuple[float, ...] = LATENCY_BUCKETS
+    ) -> None:
+        """Create a histogram with the given bucket upper bounds."""
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last bucket is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one value (from a single thread, the update is not locked)."""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    def samples(self) -> list[tuple[str, float]]:
+        """Cumulative bucket counts, sum and count."""
+        counts = list(self.counts)
+        cumulative = 0
+        lines = []
+        for bound, count in zip((*self.buckets, "+Inf"), counts, strict=True):
+            cumulative += count
+            lines.append((f'{self.name}_bucket{{le="{bound}"}}', cumulative))
+        lines.append((f"{self.name}_sum", self.sum))
+        lines.append((f"{self.name}_count", cumulative))
+        return lines
+
+
+Metric = Counter | Histogram
+
+# Instruments updated by the game itself. Updates are unlocked read-modify-
+# writes, so each instrument must keep a single writer: the main loop for
+# GENERATIONS, STEP_SECONDS, FRAMES and RENDER_SECONDS, the meta-analysis
+# worker (or the main loop, when the MetaController is not threaded) for
+# ANALYSIS_SECONDS. An engine or worker thread that wants to count its own
+# work needs an instrument of its own, or a lock around the update.
+GENERATIONS = Counter("gol_generations_total", "Generations simulated")
+FRAMES = Counter("gol_frames_total", "Frames presented on the display")
+STEP_SECONDS = Histogram(
+    "gol_step_seconds", "Time to compute a generation and notify subscribers"
+)
+ANALYSIS_SECONDS = Histogram(
+    "gol_analysis_seconds", "Time to analyze a generation for the meta-progression"
+)
+RENDER_SECONDS = Histogram("gol_render_seconds", "Time to draw and present a frame")
+INSTRUMENTS: list[Metric] = [
+    GENERATIONS,
+    FRAMES,
+    STEP_SECONDS,
+    ANALYSIS_SECONDS,
+    RENDER_SECONDS,
+]
+
+
+def resident_memory() -> int:
+    """Resident set size of this process in bytes (peak RSS if unavailable)."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # macOS uses bytes
+
+
+def render(metrics: list[Metric]) -> str:
+    """Format metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.help_text}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(f"{name} {value}" for name, value in metric.samples())
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serves the metrics of a running game over HTTP on a background thread."""
+
+    def __init__(
+        self,
+        state: GameState,
+        meta: MetaController,
+        host: str = METRICS_HOST,
+        port: int = METRICS_PORT,
+    ) -> None:
+        """Start serving `/metrics` (port 0 picks a free port, see `address`).
+
+        Args:
+            state (GameState): Source of the population and audio statistics.
+            meta (MetaController): Source of the analysis and notification queues.
+            host (str): Interface to listen on, loopback by default.
+            port (int): TCP port.
+        """
+        synth = state.sound.synth
+        self.metrics: list[Metric] = [
+            *INSTRUMENTS,
+            Rate("gol_generations_per_second", "Generations per second", GENERATIONS),
+            Rate("gol_fps", "Frames presented per second", FRAMES),
+            Gauge("gol_population", "Live cells", lambda: state.population),
+            Gauge("gol_generation", "Current generation", lambda: state.generation),
+            Gauge(
+                "gol_engine_cells_per_second",
+                "Measured throughput of the stepping engine",
+                lambda: state.engine_throughput,
+            ),
+            Gauge(
+                "gol_notification_queue_depth",
+                "Notifications waiting for the UI thread",
+                lambda: meta.pending_notifications,
+            ),
+            Gauge(
+                "gol_analysis_queue_depth",
+                "Generations waiting for the analysis worker",
+                lambda: meta.pending_snapshots,
+            ),
+            Gauge(
+                "gol_analysis_stride",
+                "Analyzed every n-th generation (above 1 when falling behind)",
+                lambda: meta.stride,
+            ),
+            Counter(
+                "gol_analysis_dropped_total",
+                "Generations skipped by the overloaded analysis worker",
+                lambda: meta.dropped_snapshots,
+            ),
+            Counter(
+                "gol_audio_dropped_total",
+                "Generation sounds dropped because the audio channel was busy",
+                lambda: synth.dropped,
+            ),
+            Gauge(
+                "process_resident_memory_bytes",
+                "Resident memory size",
+                resident_memory,
+            ),
+        ]
+        memo = state.engines.engines.get("memo")
+        if memo is not None:
+            self.metrics += [
+                Counter(
+                    "gol_tile_cache_hits_total",
+                    "Tile transitions found in the memo engine's cache",
+                    lambda: memo.hits,
+                ),
+                Counter(
+                    "gol_tile_cache_misses_total",
+                    "Tile transitions the memo engine had to compute",
+                    lambda: memo.misses,
+                ),
+                Counter(
+                    "gol_tile_cache_evictions_total",
+                    "Tile transitions evicted from the memo engine's cache",
+                    lambda: memo.evictions,
+                ),
+                Gauge(
+                    "gol_tile_cache_entries",
+                    "Tile transitions in the memo engine's cache",
+                    lambda: len(memo.cache),
+                ),
+            ]
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = render(metrics).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: object) -> None:
+                pass  # no access log on the console
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self.address = self.server.server_address
+        self._thread = threading.Thread(
+            target=self.server.serve_forever, name="metrics", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self.server.shutdown()
+        self.server.server_close()
+        self._thread.join(timeout=1.0)
@@ -0,0 +1,386 @@
+"""Non-blocking recording of runs as frame sequences, animations or raw boards.
+
+Frames are captured on the simulation thread as cheap array copies and put
+into a bounded queue. Encoding and writing happen on a background worker,
+which streams animations to disk frame by frame and also finalizes the
+file, so neither memory nor `stop()` grow with the length of a recording.
+If the worker falls behind, frames are dropped and the recorder switches to
+recording only every n-th generation instead of stalling `GameState.step()`.
+
+Can also be used headless to record a run of any board size offscreen:
+
+    python -m core.services.recorder --width 500 --height 500 --format gif run.gif
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import queue
+import struct
+import threading
+import zipfile
+import zlib
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pygame
+
+from core.game_model import UpdateType
+from core.life import next_generation
+from ui.colors import BLACK, WHITE
+from utils.settings import RECORDER_MAX_STRIDE, RECORDER_QUEUE_SIZE, STEP_INTERVAL
+
+try:
+    from PIL import GifImagePlugin, Image
+except ImportError:  # Pillow is only needed for GIF/APNG export
+    GifImagePlugin = Image = None
+
+if TYPE_CHECKING:
+    from core.game_model import GameState
+
+
+class RecordingFormat(Enum):
+    """Available output formats."""
+
+    FRAMES = "frames"  # directory of PNG images
+    GIF = "gif"  # animated GIF (needs Pillow)
+    APNG = "apng"  # animated PNG (needs Pillow)
+    BOARD = "board"  # raw boards, one array per generation in a .npz archive
+
+
+# File suffix of the recording output per format (FRAMES is a directory)
+RECORDING_SUFFIXES = {
+    RecordingFormat.FRAMES: "",
+    RecordingFormat.GIF: ".gif",
+    RecordingFormat.APNG: ".png",
+    RecordingFormat.BOARD: ".npz",
+}
+
+
+def render_board(grid: np.ndarray, cell_size: int) -> pygame.Surface:
+    """Render a board offscreen (no display needed), `cell_size` pixels per cell."""
+    height, width = grid.shape
+    small = pygame.Surface((width, height), depth=24)
+    shade = np.where(grid.T == 1, BLACK[0], WHITE[0]).astype(np.uint8)
+    pygame.surfarray.blit_array(small, np.dstack((shade, shade, shade)))
+    if cell_size == 1:
+        return small
+    return pygame.transform.scale(small, (width * cell_size, height * cell_size))
+
+
+class Recorder:
+    """Records boards or rendered frames on a background worker."""
+
+    def __init__(
+        self,
+        output: str | Path,
+        fmt: RecordingFormat = RecordingFormat.FRAMES,
+        cell_size: int = 4,
+        frame_duration: float = STEP_INTERVAL,
+        queue_size: int = RECORDER_QUEUE_SIZE,
+    ) -> None:
+        """Prepare a recording; nothing is written before `start()`.
+
+        Args:
+            output (str | Path): Target directory (FRAMES) or file (others).
+            fmt (RecordingFormat): Output format.
+            cell_size (int): Pixels per cell when rendering boards to images.
+            frame_duration (float): Seconds per frame in animations.
+            queue_size (int): Frames that may wait for the worker before dropping.
+        """
+        if fmt in (RecordingFormat.GIF, RecordingFormat.APNG) and Image is None:
+            msg = (
+                f"Recording as {fmt.value} requires Pillow "
+                "(pip install pillow, or install the 'recording' extra)."
+            )
+            raise RuntimeError(msg)
+        self.output = Path(output)
+        self.fmt = fmt
+        self.cell_size = cell_size
+        self.frame_duration = frame_duration
+        self.recording = False
+        self.stride = 1  # record every n-th offered frame
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self._offered = 0
+        self.queue_size = queue_size
+        # one slot more than frames may take, for the stop signal
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size + 1)
+        self._worker: threading.Thread | None = None
+        self._archive: zipfile.ZipFile | None = None
+        self._animation: GifWriter | ApngWriter | None = None
+        self._state: GameState | None = None
+
+    def attach(self, state: GameState) -> None:
+        """Record every generation of a `GameState` while recording."""
+        self._state = state
+        state.subscribe(self.on_state_change)
+
+    def detach(self) -> None:
+        """Stop following the attached `GameState`."""
+        if self._state is not None:
+            self._state.unsubscribe(self.on_state_change)
+            self._state = None
+
+    def on_state_change(self, update_type: UpdateType) -> None:
+        """Capture the board of the attached state after every step."""
+        if update_type == UpdateType.STEP and self._state is not None:
+            self.capture_board(self._state.grid, self._state.generation)
+
+    def start(self) -> None:
+        """Start the worker and accept frames."""
+        if self.fmt == RecordingFormat.FRAMES:
+            self.output.mkdir(parents=True, exist_ok=True)
+        else:
+            self.output.parent.mkdir(parents=True, exist_ok=True)
+        if self.fmt == RecordingFormat.BOARD:
+            self._archive = zipfile.ZipFile(self.output, "w", zipfile.ZIP_DEFLATED)
+        self._worker = threading.Thread(target=self._run, name="recorder", daemon=True)
+        self._worker.start()
+        self.recording = True
+
+    def stop(self, *, wait: bool = False) -> Path:
+        """Stop accepting frames; the worker writes the rest and finalizes.
+
+        Args:
+            wait (bool): Return only once the recording is complete (e.g.
+                before the program exits), instead of right away.
+        """
+        self.recording = False
+        worker, self._worker = self._worker, None
+        if worker is not None:
+            self._queue.put(None)  # never blocks, a slot is kept free for it
+            if wait:
+                worker.join()
+        return self.output
+
+    def capture_board(
+        self, grid: np.ndarray, generation: int, block: bool = False
+    ) -> bool:
+        """Offer a board to the recording; only waits for the worker if `block`.
+
+        Returns:
+            bool: True if the frame was queued, False if skipped or dropped.
+        """
+        if not self._admit(block):
+            return False
+        return self._enqueue((generation, grid.astype(np.uint8)), block)
+
+    def capture_surface(
+        self, surface: pygame.Surface, generation: int, block: bool = False
+    ) -> bool:
+        """Offer a rendered frame (e.g. the screen) to the recording."""
+        if not self._admit(block):
+            return False
+        return self._enqueue((generation, pygame.surfarray.array3d(surface)), block)
+
+    def _admit(self, block: bool) -> bool:
+        """Decide (before copying anything) whether the offered frame is recorded."""
+        if not self.recording:
+            return False
+        if block:
+            return True
+        self._offered += 1
+        if self._offered % self.stride:
+            return False
+        if self.stride > 1 and self._queue.empty():
+            self.stride //= 2  # worker caught up, record more densely again
+        return True
+
+    def _enqueue(self, item: tuple[int, np.ndarray], block: bool) -> bool:
+        """Hand a frame to the worker, sub-sampling further when it is full."""
+        if block:
+            self._queue.put(item)
+            return True
+        # only this thread adds frames, so the size can't grow meanwhile
+        if self._queue.qsize() >= self.queue_size:
+            self.frames_dropped += 1
+            self.stride = min(self.stride * 2, RECORDER_MAX_STRIDE)
+            return False
+        self._queue.put_nowait(item)
+        return True
+
+    def _run(self) -> None:
+        """Worker loop: encode and write frames until stopped, then finalize."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            generation, frame = item
+            self._write(generation, frame)
+            self.frames_written += 1
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+        if self._animation is not None:
+            self._animation.close()
+            self._animation = None
+        print(
+            f"Recording saved to {self.output} "
+            f"({self.frames_written} frames, {self.frames_dropped} dropped)"
+        )
+
+    def _write(self, generation: int, frame: np.ndarray) -> None:
+        """Encode a single frame in the configured format."""
+        if self.fmt == RecordingFormat.BOARD:
+            with self._archive.open(f"gen_{generation:08d}.npy", "w") as f:
+                np.save(f, frame)
+            return
+
+        if frame.ndim == 2:
+            surface = render_board(frame, self.cell_size)
+        else:
+            surface = pygame.surfarray.make_surface(frame)
+        if self.fmt == RecordingFormat.FRAMES:
+            pygame.image.save(surface, self.output / f"frame_{generation:08d}.png")
+        else:
+            pixels = pygame.surfarray.array3d(surface).transpose(1, 0, 2)
+            image = Image.fromarray(np.ascontiguousarray(pixels))
+            if self._animation is None:
+                writer = GifWriter if self.fmt == RecordingFormat.GIF else ApngWriter
+                self._animation = writer(self.output, self.frame_duration)
+            self._animation.add(image)
+
+
+class GifWriter:
+    """Appends frames to an animated GIF file as they come (needs Pillow)."""
+
+    def __init__(self, path: Path, frame_duration: float) -> None:
+        """Create the file; the header follows with the first frame."""
+        self.file = path.open("wb")
+        self.duration = int(frame_duration * 1000)
+        self.frames = 0
+
+    def add(self, image: Image.Image) -> None:
+        """Write a frame, with a palette of its own."""
+        frame = image.convert("P", palette=Image.Palette.ADAPTIVE)
+        if not self.frames:
+            header, _ = GifImagePlugin.getheader(frame, info={"loop": 0})
+            self.file.write(b"".join(header))
+        for chunk in GifImagePlugin.getdata(
+            frame, duration=self.duration, include_color_table=True
+        ):
+            self.file.write(chunk)
+        self.frames += 1
+
+    def close(self) -> None:
+        """Write the trailer."""
+        self.file.write(b";")
+        self.file.close()
+
+
+class ApngWriter:
+    """Appends frames to an animated PNG file as they come (needs Pillow).
+
+    Every frame is compressed by Pillow as a PNG of its own, whose image data
+    is then copied into the animation. The frame count in the header is only
+    known at the end and patched in by `close`.
+    """
+
+    SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+    def __init__(self, path: Path, frame_duration: float) -> None:
+        """Create the file; the header follows with the first frame."""
+        self.file = path.open("wb")
+        self.delay = (round(frame_duration * 1000), 1000)  # numerator, denominator
+        self.frames = 0
+        self.sequence = 0  # of the fcTL and fdAT chunks
+        self.actl_offset = 0
+
+    def add(self, image: Image.Image) -> None:
+        """Write a frame."""
+        png = io.BytesIO()
+        image.convert("RGB").save(png, format="PNG", compress_level=6)
+        chunks = self._chunks(png.getvalue())
+        if not self.frames:
+            self.file.write(self.SIGNATURE)
+            self._write_chunk(b"IHDR", chunks[0][1])
+            self.actl_offset = self.file.tell()
+            self._write_chunk(b"acTL", struct.pack(">II", 0, 0))
+        width, height = image.size
+        self._write_chunk(
+            b"fcTL",
+            struct.pack(
+                ">IIIIIHHBB", self.sequence, width, height, 0, 0, *self.delay, 0, 0
+            ),
+        )
+        self.sequence += 1
+        for kind, data in chunks:
+            if kind != b"IDAT":
+                continue
+            if not self.frames:
+                self._write_chunk(b"IDAT", data)
+            else:
+                self._write_chunk(b"fdAT", struct.pack(">I", self.sequence) + data)
+                self.sequence += 1
+        self.frames += 1
+
+    def close(self) -> None:
+        """Write the end and the frame count."""
+        self._write_chunk(b"IEND", b"")
+        self.file.seek(self.actl_offset)
+        self._write_chunk(b"acTL", struct.pack(">II", self.frames, 0))
+        self.file.close()
+
+    def _write_chunk(self, kind: bytes, data: bytes) -> None:
+        self.file.write(struct.pack(">I", len(data)) + kind + data)
+        self.file.write(struct.pack(">I", zlib.crc32(kind + data)))
+
+    @staticmethod
+    def _chunks(png: bytes) -> list[tuple[bytes, bytes]]:
+        """The (type, data) chunks of a PNG file."""
+        chunks = []
+        offset = len(ApngWriter.SIGNATURE)
+        while offset < len(png):
+            (length,) = struct.unpack_from(">I", png, offset)
+            kind = png[offset + 4 : offset + 8]
+            chunks.append((kind, png[offset + 8 : offset + 8 + length]))
+            offset += 12 + length
+        return chunks
+
+
+def record_headless(
+    grid: np.ndarray,
+    generations: int,
+    output: str | Path,
+    fmt: RecordingFormat = RecordingFormat.GIF,
+    cell_size: int = 4,
+) -> Path:
+    """Simulate and record `generations` steps of a board entirely offscreen."""
+    recorder = Recorder(output, fmt, cell_size)
+    recorder.start()
+    for generation in range(generations + 1):
+        # offline there is no frame budget, so wait for the worker instead of dropping
+        recorder.capture_board(grid, generation, block=True)
+        grid = next_generation(grid)
+    return recorder.stop(wait=True)
+
+
+def main() -> None:
+    """Command line entry point for headless recordings of random soups."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--width", type=int, default=200)
+    parser.add_argument("--height", type=int, default=200)
+    parser.add_argument("--density", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--generations", type=int, default=100)
+    parser.add_argument("--cell-size", type=int, default=4)
+    parser.add_argument(
+        "--format",
+        type=RecordingFormat,
+        choices=list(RecordingFormat),
+        default=RecordingFormat.GIF,
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    grid = (rng.random((args.height, args.width)) < args.density).astype(np.uint8)
+    record_headless(grid, args.generations, args.output, args.format, args.cell_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,22 @@
 """Handles unlocking and tracking of Conway's Game of Life rules."""
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import numpy as np
-import pygame
 
+from core.game_model import UpdateType
 from core.models.rule import Rule
 from core.services.notification_service import NotificationService
 from ui.icons import RULE_ICON_PATH
 from ui.notification_manager import NotificationType
+from ui.utils import load_icon
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from core.models.step_snapshot import StepSnapshot
 
 
 class RuleManager:
@@ -15,8 +25,7 @@ class RuleManager:
     def __init__(self, notifier: NotificationService) -> None:
         self.unlocked: set[str] = set()
         self.rules: dict[str, Rule] = {}
-        self.icon_sprite = pygame.image.load(RULE_ICON_PATH).convert_alpha()
-        self.icon_sprite = pygame.transform.smoothscale(self.icon_sprite, (32, 32))
+        self.icon_sprite = load_icon(RULE_ICON_PATH)
         self.notify = notifier
         self._register_rules()
 
@@ -42,8 +51,25 @@ class RuleManager:
             notification="New life has emerged from perfect balance.",
         )
 
-    def update(self, new_grid: np.ndarray, old_grid: np.ndarray) -> None:
-        """Evaluate which Life rules are expressed between two consecutive grids."""
+    @property
+    def done(self) -> bool:
+        """Whether all four rules are known, so there is nothing left to detect."""
+        return self.unlocked >= self.rules.keys()
+
+    def scan(self, snapshot: StepSnapshot) -> Iterator[None]:
+        """Check a generation (a slice per region, the check is cheap)."""
+        if snapshot.update_type == UpdateType.STEP:
+            for region in snapshot.regions():
+                self.update(region.grid, region.old_grid, region.margin)
+                yield
+
+    def update(
+        self, new_grid: np.ndarray, old_grid: np.ndarray, margin: int = 0
+    ) -> None:
+        """Evaluate which Life rules are expressed between two consecutive grids.
+
+        Cells within `margin` of the edges only count as neighbours.
+        """
         # Compute neighbor counts for the old generation
         neighbors = sum(
             np.roll(np.roll(old_grid, i, 0), j, 1)
@@ -54,6 +80,13 @@ class RuleManager:
 
         was_alive = old_grid == 1
         is_alive = new_grid == 1
+        if margin:
+            inner = (slice(margin, -margin), slice(margin, -margin))
+            neighbors, was_alive, is_alive = (
+                neighbors[inner],
+                was_alive[inner],
+                is_alive[inner],
+            )
 
         # Identify cell transitions
         births = (~was_alive) & is_alive
@@ -78,6 +111,14 @@ class RuleManager:
         if np.any(births & (neighbors == 3)) and "reproduction" not in self.unlocked:
             self._unlock("reproduction")
 
+    def export_state(self) -> dict:
+        """Return the persistent progress as JSON-serializable data."""
+        return {"unlocked": sorted(self.unlocked)}
+
+    def restore_state(self, data: dict) -> None:
+        """Restore progress saved by `export_state` (without notifications)."""
+        self.unlocked = set(data.get("unlocked", [])) & self.rules.keys()
+
     def _unlock(self, key: str) -> None:
         """Mark rule as unlocked and notify."""
         self.unlocked.add(key)
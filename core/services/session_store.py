@@ -0,0 +1,174 @@
+"""Compact binary session snapshots and background autosave.
+
+File layout (little endian):
+
+    magic "GOLS" | version u16 | flags u16 | width u32 | height u32 |
+    generation u64 | grid length u32 | meta length u32 | crc32 u32 |
+    grid (zlib-compressed bit-packed cells) | meta (zlib-compressed JSON)
+
+The CRC covers everything before it plus both payloads. Files are written to
+a temporary file first and moved into place, so a crash never leaves a
+half-written save behind.
+"""
+
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+
+from core.models.session_snapshot import SessionSnapshot
+
+MAGIC = b"GOLS"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIQII")
+CRC = struct.Struct("<I")
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot file is not a valid (or supported) session."""
+
+
+def encode_snapshot(snapshot: SessionSnapshot) -> bytes:
+    """Serialize a snapshot into the binary file format."""
+    height, width = snapshot.grid.shape
+    grid_blob = zlib.compress(np.packbits(snapshot.grid != 0).tobytes(), 1)
+    meta_blob = zlib.compress(json.dumps(snapshot.meta).encode())
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        0,
+        width,
+        height,
+        snapshot.generation,
+        len(grid_blob),
+        len(meta_blob),
+    )
+    crc = zlib.crc32(meta_blob, zlib.crc32(grid_blob, zlib.crc32(header)))
+    return header + CRC.pack(crc) + grid_blob + meta_blob
+
+
+def decode_snapshot(data: bytes) -> SessionSnapshot:
+    """Parse and verify the binary file format."""
+    if len(data) < HEADER.size + CRC.size:
+        msg = "Snapshot is truncated."
+        raise SnapshotError(msg)
+    header = data[: HEADER.size]
+    magic, version, _flags, width, height, generation, grid_len, meta_len = (
+        HEADER.unpack(header)
+    )
+    if magic != MAGIC:
+        msg = "Not a Game of Life session snapshot."
+        raise SnapshotError(msg)
+    if version != VERSION:
+        msg = f"Unsupported snapshot version {version}."
+        raise SnapshotError(msg)
+
+    (crc,) = CRC.unpack_from(data, HEADER.size)
+    offset = HEADER.size + CRC.size
+    grid_blob = data[offset : offset + grid_len]
+    meta_blob = data[offset + grid_len : offset + grid_len + meta_len]
+    if len(grid_blob) != grid_len or len(meta_blob) != meta_len:
+        msg = "Snapshot is truncated."
+        raise SnapshotError(msg)
+    if zlib.crc32(meta_blob, zlib.crc32(grid_blob, zlib.crc32(header))) != crc:
+        msg = "Snapshot checksum mismatch."
+        raise SnapshotError(msg)
+
+    bits = np.frombuffer(zlib.decompress(grid_blob), dtype=np.uint8)
+    grid = np.unpackbits(bits, count=width * height).reshape(height, width)
+    meta = json.loads(zlib.decompress(meta_blob))
+    return SessionSnapshot(grid=grid, generation=generation, meta=meta)
+
+
+class SessionStore:
+    """Reads and atomically writes session snapshots at a fixed path."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    def save(self, snapshot: SessionSnapshot) -> None:
+        """Write a snapshot atomically (temporary file + rename)."""
+        data = encode_snapshot(snapshot)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_path.replace(self.path)
+
+    def load(self) -> SessionSnapshot | None:
+        """Load the saved snapshot, or None if there is no save yet."""
+        if not self.path.exists():
+            return None
+        return decode_snapshot(self.path.read_bytes())
+
+
+class Autosaver:
+    """Periodically saves snapshots without blocking the UI thread.
+
+    `tick()` is called from the main loop; when a save is due it takes a
+    snapshot through `capture` (cheap, the grid is shared copy-on-write) and
+    hands it to a background thread that encodes, compresses and writes it.
+    If a save is still in progress, only the newest pending snapshot is kept.
+    """
+
+    def __init__(
+        self,
+        store: SessionStore,
+        capture: Callable[[], SessionSnapshot],
+        interval: float,
+    ) -> None:
+        self.store = store
+        self.capture = capture
+        self.interval = interval
+        self.last_save = time.time()
+        self._pending: SessionSnapshot | None = None
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._worker = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._worker.start()
+
+    def tick(self) -> None:
+        """Schedule a background save if the interval elapsed."""
+        now = time.time()
+        if now - self.last_save >= self.interval:
+            self.last_save = now
+            self.save_async()
+
+    def save_async(self) -> None:
+        """Capture a snapshot now and write it in the background."""
+        snapshot = self.capture()
+        with self._condition:
+            self._pending = snapshot
+            self._condition.notify()
+
+    def stop(self, final_save: bool = True) -> None:
+        """Stop the writer; optionally write a last snapshot synchronously."""
+        with self._condition:
+            self._stopped = True
+            self._pending = None
+            self._condition.notify()
+        self._worker.join()
+        if final_save:
+            self.store.save(self.capture())
+
+    def _run(self) -> None:
+        """Writer loop: save the newest pending snapshot until stopped."""
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                snapshot, self._pending = self._pending, None
+            try:
+                self.store.save(snapshot)
+            except Exception as e:  # noqa: BLE001 - keep autosaving next time
+                print(f"Autosave failed: {e}")
@@ -0,0 +1,165 @@
+"""Live board export through shared memory, for dashboards and analysis tools.
+
+`BoardPublisher` mirrors a `GameState` into a named
+`multiprocessing.shared_memory` segment after every change. Other processes
+attach with `BoardReader` and map the board read-only without copying it.
+
+Segment layout (native byte order):
+
+    sequence u64 | generation u64 | population u64 | width u32 | height u32 |
+    board (height x width u8, 1 = alive)
+
+The sequence counter is a seqlock: the publisher makes it odd before and
+even again after writing, so a reader knows its read was consistent if it
+saw the same even value before and after.
+
+Watch a running game from another terminal with:
+
+    python -m core.services.shared_board
+"""
+
+from __future__ import annotations
+
+import argparse
+import struct
+import time
+from collections.abc import Callable
+from multiprocessing import resource_tracker, shared_memory
+from typing import TYPE_CHECKING, TypeVar
+
+import numpy as np
+
+from utils.settings import SHARED_BOARD_NAME
+
+if TYPE_CHECKING:
+    from core.game_model import GameState, UpdateType
+
+HEADER = struct.Struct("QQQII")
+SEQUENCE = struct.Struct("Q")
+
+T = TypeVar("T")
+
+
+class BoardPublisher:
+    """Writes the board of a `GameState` into a named shared memory segment."""
+
+    def __init__(self, width: int, height: int, name: str = SHARED_BOARD_NAME) -> None:
+        """Create the segment (replacing a stale one left by a crashed run)."""
+        size = HEADER.size + width * height
+        try:
+            self.shm = shared_memory.SharedMemory(name, create=True, size=size)
+        except FileExistsError:
+            stale = shared_memory.SharedMemory(name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name, create=True, size=size)
+        self.width = width
+        self.height = height
+        self.sequence = 0
+        self.board = np.ndarray(
+            (height, width), dtype=np.uint8, buffer=self.shm.buf, offset=HEADER.size
+        )
+        HEADER.pack_into(self.shm.buf, 0, 0, 0, 0, width, height)
+        self._state: GameState | None = None
+
+    def attach(self, state: GameState) -> None:
+        """Publish every change of a `GameState`, starting with its current board."""
+        self._state = state
+        state.subscribe(self.on_state_change)
+        self.publish(state.grid, state.generation, state.population)
+
+    def detach(self) -> None:
+        """Stop following the attached `GameState`."""
+        if self._state is not None:
+            self._state.unsubscribe(self.on_state_change)
+            self._state = None
+
+    def on_state_change(self, update_type: UpdateType) -> None:
+        """Publish the board of the attached state."""
+        state = self._state
+        if state is not None:
+            self.publish(state.grid, state.generation, state.population)
+
+    def publish(self, grid: np.ndarray, generation: int, population: int) -> None:
+        """Write a board and its live cell count, bracketed by the seqlock."""
+        buf = self.shm.buf
+        self.sequence += 1  # odd: write in progress
+        SEQUENCE.pack_into(buf, 0, self.sequence)
+        np.copyto(self.board, grid, casting="unsafe")
+        HEADER.pack_into(
+            buf, 0, self.sequence, generation, population, self.width, self.height
+        )
+        self.sequence += 1  # even: consistent again
+        SEQUENCE.pack_into(buf, 0, self.sequence)
+
+    def close(self) -> None:
+        """Detach and remove the segment."""
+        self.detach()
+        del self.board  # release the exported buffer before closing
+        self.shm.close()
+        self.shm.unlink()
+
+
+class BoardReader:
+    """Read-only, zero-copy view of a board published by `BoardPublisher`."""
+
+    def __init__(self, name: str = SHARED_BOARD_NAME) -> None:
+        """Attach to the segment of a running publisher."""
+        self.shm = shared_memory.SharedMemory(name)
+        # Only the publisher owns the segment. Without this, the resource
+        # tracker of this process would remove it when we exit.
+        resource_tracker.unregister(self.shm._name, "shared_memory")  # noqa: SLF001
+        _, _, _, width, height = HEADER.unpack_from(self.shm.buf, 0)
+        self.board = np.ndarray(
+            (height, width), dtype=np.uint8, buffer=self.shm.buf, offset=HEADER.size
+        )
+        self.board.flags.writeable = False
+
+    def read(self, consume: Callable[[np.ndarray], T] = np.copy) -> tuple[int, int, T]:
+        """Run `consume` on the live board until it saw a consistent generation.
+
+        `consume` gets the zero-copy view and should not keep it; by default
+        the board is copied.
+
+        Returns:
+            tuple[int, int, T]: Generation, population and the result of `consume`.
+        """
+        buf = self.shm.buf
+        while True:
+            (before,) = SEQUENCE.unpack_from(buf, 0)
+            if before % 2:
+                time.sleep(0)  # the publisher is writing, let it finish
+                continue
+            _, generation, population, _, _ = HEADER.unpack_from(buf, 0)
+            result = consume(self.board)
+            (after,) = SEQUENCE.unpack_from(buf, 0)
+            if after == before:
+                return generation, population, result
+
+    def close(self) -> None:
+        """Unmap the segment (it stays available to other readers)."""
+        del self.board
+        self.shm.close()
+
+
+def main() -> None:
+    """Command line entry point: print the live generation and population."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--name", default=SHARED_BOARD_NAME)
+    parser.add_argument("--interval", type=float, default=1.0)
+    args = parser.parse_args()
+
+    reader = BoardReader(args.name)
+    try:
+        while True:
+            generation, population, _ = reader.read(lambda _board: None)
+            print(f"Generation {generation}: {population} live cells")
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,46 @@
 """Centralized sound management for the Game of Life."""
 
-import random
 from pathlib import Path
 
+import numpy as np
 import pygame
 
+from core.services.sound_synth import GenerationSound, GenerationSynth
+
+
+def horizontal_pan(column_counts: np.ndarray) -> float:
+    """Stereo position (0 = left, 1 = right) of cells, given their count per column."""
+    total = column_counts.sum()
+    if total == 0 or len(column_counts) < 2:
+        return 0.5
+    columns = np.arange(len(column_counts))
+    return float(column_counts @ columns) / total / (len(column_counts) - 1)
+
 
 class SoundManager:
     """Handles background music and sound effects for the Game of Life."""
 
-    def __init__(self, base_path: str = "assets") -> None:
-        """Initialize SoundManager with existing Sound-Files."""
+    def __init__(self, base_path: str = "assets", seed: int | None = None) -> None:
+        """Initialize SoundManager with the music and the effect synthesizer.
+
+        Args:
+            base_path (str): Directory of the sound assets.
+            seed (int | None): Seed for the randomness of the sound effects,
+                for reproducible runs (e.g. input replays).
+        """
         pygame.mixer.init()
 
         # Paths
         self.music_path = (
             Path(base_path) / "music" / "lofi-loop-hopeful-city-321581.mp3"
         )
-        self.sfx_birth_path = Path(base_path) / "sfx" / "cell_birth.wav"
-        self.sfx_death_path = Path(base_path) / "sfx" / "cell_death.wav"
 
-        # Load sound effects
-        self.sfx_birth = pygame.mixer.Sound(self.sfx_birth_path)
-        self.sfx_death = pygame.mixer.Sound(self.sfx_death_path)
+        # Birth/death effects are synthesized per generation
+        self.synth = GenerationSynth(seed)
 
         # Adjust default volumes
         self.muted = False
         pygame.mixer.music.set_volume(0.25)  # background music
-        self.sfx_birth.set_volume(0.5)
-        self.sfx_death.set_volume(0.4)
 
     def toggle_mute(self) -> None:
         """Toggle global mute on/off."""
@@ -49,34 +61,32 @@ class SoundManager:
         """Fade out and stop the background music."""
         pygame.mixer.music.fadeout(1000)
 
-    def _play_randomized(self, sound: pygame.mixer.SoundType) -> None:
-        """Play a sound effect with slight randomization in volume."""
-        if not self.muted:
-            channel = sound.play()
-            if channel:
-                channel.set_volume(random.uniform(0.3, 0.6))
-            else:
-                print("No channels available")
-
     def play_generation_batch(
-        self, births: int, deaths: int, live_cells: int, total_cells: int
+        self,
+        births: int,
+        deaths: int,
+        live_cells: int,
+        total_cells: int,
+        birth_pan: float = 0.5,
+        death_pan: float = 0.5,
     ) -> None:
-        """Play a few birth/death sounds, scaled by population density."""
+        """Play the birth/death sound of a generation, scaled by population density.
+
+        The pans place the sound where the births and deaths happened,
+        0 being the left and 1 the right edge of the board.
+        """
         total_changes = births + deaths
-        if total_changes == 0 or live_cells == 0:
+        if self.muted or total_changes == 0 or live_cells == 0:
             return
 
         # Scale playback density depending on population density
         density = live_cells / total_cells
 
-        # Compute how many sounds to play this frame
-        # Sparse grid → up to 5 sounds, dense grid → 1 sound
+        # Compute how many grains to mix into this generation's sound
+        # Sparse grid → up to 6 grains, dense grid → 1 grain
         max_sounds = int(5 * (1 - density)) + 1  # range: 1-6
         num_sounds = min(max_sounds, total_changes // 100 + 1)
 
-        # Randomly mix births and deaths
-        for _ in range(num_sounds):
-            if random.random() < births / total_changes:
-                self._play_randomized(self.sfx_birth)
-            else:
-                self._play_randomized(self.sfx_death)
+        self.synth.submit(
+            GenerationSound(births, deaths, num_sounds, birth_pan, death_pan)
+        )
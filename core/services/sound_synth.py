@@ -0,0 +1,127 @@
+"""Per-generation sound synthesis on a single reserved mixer channel.
+
+Instead of playing a handful of separate `Sound` objects per generation
+(which exhausts the mixer's channels at high generation rates), one short
+stereo buffer is synthesized per generation with NumPy: birth and death
+grains built with the sweeps of `assets/generate_sfx.py`, pitched by how
+many cells changed and panned to where they changed. Buffers are queued on
+one reserved channel from a background thread, so audio stays continuous
+and the simulation never waits for it.
+"""
+
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pygame
+
+from assets.generate_sfx import SAMPLE_RATE, make_lofi_sweep
+from utils.settings import SYNTH_BUFFER_MS, SYNTH_VOLUME
+
+
+@dataclass(frozen=True)
+class GenerationSound:
+    """What happened in one generation, as far as the synthesizer cares."""
+
+    births: int
+    deaths: int
+    grains: int  # number of birth/death grains to mix into the buffer
+    birth_pan: float = 0.5  # 0 = left edge of the board, 1 = right edge
+    death_pan: float = 0.5
+
+
+class GenerationSynth:
+    """Synthesizes and queues one audio buffer per generation."""
+
+    def __init__(self, seed: int | None = None) -> None:
+        """Reserve a mixer channel and start the audio thread.
+
+        Args:
+            seed (int | None): Seed for the grain timing and noise, for
+                reproducible runs.
+        """
+        frequency, _size, channels = pygame.mixer.get_init()
+        self.frequency = frequency
+        self.channels = channels
+        pygame.mixer.set_reserved(1)
+        self.channel = pygame.mixer.Channel(0)
+        self.rng = np.random.default_rng(seed)
+        self.length = int(frequency * SYNTH_BUFFER_MS / 1000)
+        self.dropped = 0
+        self._pending: GenerationSound | None = None
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._worker = threading.Thread(target=self._run, name="synth", daemon=True)
+        self._worker.start()
+
+    def submit(self, sound: GenerationSound) -> None:
+        """Hand a generation to the audio thread; only the newest one is kept."""
+        with self._condition:
+            if self._pending is not None:
+                self.dropped += 1
+            self._pending = sound
+            self._condition.notify()
+
+    def stop(self) -> None:
+        """Stop the audio thread."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._worker.join(timeout=1.0)
+
+    def render(self, sound: GenerationSound) -> np.ndarray:
+        """Mix the grains of a generation into one int16 buffer (samples, channels)."""
+        mix = np.zeros((self.length, 2))
+        total = sound.births + sound.deaths
+        for _ in range(sound.grains):
+            if self.rng.random() < sound.births / total:
+                # births: ascending sweep, higher the more cells were born
+                pitch = 1 + 0.15 * np.log10(1 + sound.births)
+                grain = self._grain(400 * pitch, 520 * pitch, 120, 0.5)
+                pan = sound.birth_pan
+            else:
+                # deaths: descending sweep, lower the more cells died
+                pitch = 1 / (1 + 0.15 * np.log10(1 + sound.deaths))
+                grain = self._grain(300 * pitch, 150 * pitch, 100, 0.4)
+                pan = sound.death_pan
+            grain = grain[: self.length]
+            start = self.rng.integers(0, self.length - len(grain) + 1)
+            # equal-power stereo panning
+            gains = np.cos(np.array([pan, 1 - pan]) * np.pi / 2)
+            mix[start : start + len(grain)] += grain[:, None] * gains
+
+        mix *= SYNTH_VOLUME / max(1.0, np.abs(mix).max())
+        samples = np.int16(mix * 32767)
+        if self.channels == 1:
+            return samples.mean(axis=1).astype(np.int16)
+        return np.ascontiguousarray(samples)
+
+    def _grain(
+        self, start_freq: float, end_freq: float, duration_ms: int, volume: float
+    ) -> np.ndarray:
+        """A sweep from `generate_sfx`, as floats at the mixer's sample rate."""
+        sweep = make_lofi_sweep(start_freq, end_freq, duration_ms, rng=self.rng)
+        sweep = sweep / 32767 * volume
+        sweep *= self.rng.uniform(0.6, 1.0)  # slight variation like the old sfx
+        if self.frequency != SAMPLE_RATE:
+            n = int(len(sweep) * self.frequency / SAMPLE_RATE)
+            positions = np.linspace(0, len(sweep) - 1, n)
+            sweep = np.interp(positions, np.arange(len(sweep)), sweep)
+        return sweep
+
+    def _run(self) -> None:
+        """Audio loop: render the newest generation and queue it on the channel."""
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                sound, self._pending = self._pending, None
+            buffer = pygame.sndarray.make_sound(self.render(sound))
+            if not self.channel.get_busy():
+                self.channel.play(buffer)
+            elif self.channel.get_queue() is None:
+                self.channel.queue(buffer)
+            else:
+                self.dropped += 1  # one buffer is already waiting, don't pile up
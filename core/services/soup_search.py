@@ -0,0 +1,273 @@
+"""Headless random-soup search and object census, free of any Pygame dependency.
+
+Seeded random soups are run until they stabilize, many at once per worker
+process. The remaining ash is split into objects, which are classified by
+their period and movement, and named from the pattern catalogue where
+possible. Object frequencies, soup lifespans and rare finds are collected
+in a JSON results file; running again with the same file resumes the
+search:
+
+    python -m core.services.soup_search census.json --soups 100000 --workers 8
+
+Soup `n` of seed `s` can be reproduced with `make_soup(s, n)`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+from scipy import ndimage
+
+from core.catalogue import CONNECTIVITY, object_code, pattern_catalogue
+from core.life import next_generation
+from utils.settings import (
+    SEARCH_BATCH,
+    SEARCH_BOARD_SIZE,
+    SEARCH_DENSITY,
+    SEARCH_MAX_GENERATIONS,
+    SEARCH_MAX_PERIOD,
+    SEARCH_SAMPLES,
+    SEARCH_SOUP_SIZE,
+)
+
+# Generations of population history that must repeat to call a soup stable
+HISTORY = 4 * SEARCH_MAX_PERIOD
+
+
+@dataclass
+class SoupResult:
+    """Outcome of a single soup."""
+
+    soup_id: int
+    lifespan: int  # generations until the population became periodic
+    stabilized: bool  # False if it was still active at SEARCH_MAX_GENERATIONS
+    objects: Counter[str]
+
+
+def make_soup(
+    seed: int,
+    soup_id: int,
+    size: int = SEARCH_SOUP_SIZE,
+    density: float = SEARCH_DENSITY,
+) -> np.ndarray:
+    """The random square soup number `soup_id` of a search."""
+    rng = np.random.default_rng([seed, soup_id])
+    return (rng.random((size, size)) < density).astype(np.uint8)
+
+
+def run_soups(
+    seed: int,
+    soup_ids: range,
+    size: int = SEARCH_SOUP_SIZE,
+    density: float = SEARCH_DENSITY,
+) -> list[SoupResult]:
+    """Run a batch of soups to stabilization and take a census of each ash.
+
+    All soups of the batch are stepped together as one stack of boards;
+    soups leave the stack as soon as their population turns periodic.
+    """
+    board = SEARCH_BOARD_SIZE
+    offset = (board - size) // 2
+    boards = np.zeros((len(soup_ids), board, board), dtype=np.uint8)
+    for boards_i, soup_id in zip(boards, soup_ids, strict=True):
+        boards_i[offset : offset + size, offset : offset + size] = make_soup(
+            seed, soup_id, size, density
+        )
+    ids = np.array(soup_ids)
+    history = np.zeros((len(ids), HISTORY), dtype=np.int64)
+
+    results: list[SoupResult] = []
+    generation = 0
+    while len(ids) and generation < SEARCH_MAX_GENERATIONS:
+        boards = next_generation(boards)
+        generation += 1
+        history[:, generation % HISTORY] = boards.sum(axis=(1, 2))
+        if generation < HISTORY or generation % SEARCH_MAX_PERIOD:
+            continue
+        settled = _periodic(np.roll(history, -(generation % HISTORY) - 1, axis=1))
+        for i in np.flatnonzero(settled):
+            lifespan = generation - HISTORY
+            results.append(
+                SoupResult(
+                    int(ids[i]), lifespan, stabilized=True, objects=census(boards[i])
+                )
+            )
+        ids, boards, history = ids[~settled], boards[~settled], history[~settled]
+
+    for soup_id, ash in zip(ids, boards, strict=True):
+        results.append(
+            SoupResult(int(soup_id), generation, stabilized=False, objects=census(ash))
+        )
+    return sorted(results, key=lambda result: result.soup_id)
+
+
+def _periodic(history: np.ndarray) -> np.ndarray:
+    """Which population histories (oldest first) repeat with a short period."""
+    settled = np.zeros(len(history), dtype=bool)
+    for period in range(1, SEARCH_MAX_PERIOD + 1):
+        settled |= (history[:, period:] == history[:, :-period]).all(axis=1)
+    return settled
+
+
+def census(ash: np.ndarray) -> Counter[str]:
+    """Count the objects of a stabilized board by name.
+
+    Objects are classified one connected group of cells at a time. Groups
+    that do not survive on their own (parts of an oscillator, or still lifes
+    holding each other up) are classified together with the groups close
+    enough to interact with them.
+    """
+    ash = _unwrap(ash)
+    labels, _ = ndimage.label(ash, structure=CONNECTIVITY)
+    # groups whose neighborhoods touch are close enough to interact
+    near = ndimage.binary_dilation(ash, structure=CONNECTIVITY)
+    clusters, _ = ndimage.label(near, structure=CONNECTIVITY)
+    clusters[ash == 0] = 0
+    objects: Counter[str] = Counter()
+    for index, area in enumerate(ndimage.find_objects(clusters), start=1):
+        cluster = clusters[area] == index
+        names = [
+            classify(labels[area] == label)
+            for label in np.unique(labels[area][cluster])
+        ]
+        if all(not name.startswith("ov") for name in names):
+            objects.update(names)
+        else:
+            objects[classify(cluster)] += 1
+    return objects
+
+
+def classify(cells: np.ndarray) -> str:
+    """Name of an object: its catalogue key or code if known, otherwise its code."""
+    pattern = pattern_catalogue().lookup(cells)
+    if pattern is not None:
+        return pattern.name or pattern.code
+    return object_code(cells.shape, cells.astype(np.uint8).tobytes())
+
+
+def _unwrap(board: np.ndarray) -> np.ndarray:
+    """Roll a torus so that no object crosses the board edges (if possible)."""
+    for axis in (0, 1):
+        empty = np.flatnonzero(~board.any(axis=1 - axis))
+        if len(empty):
+            board = np.roll(board, -empty[0], axis=axis)
+    return board
+
+
+@dataclass
+class Census:
+    """Aggregated results of a search, saved as (and resumed from) JSON."""
+
+    seed: int
+    soup_size: int = SEARCH_SOUP_SIZE
+    density: float = SEARCH_DENSITY
+    soups: int = 0  # soups 0..soups-1 are done
+    unstable: int = 0
+    lifespan_total: int = 0
+    objects: dict[str, dict] = field(default_factory=dict)
+    longest: list[list[int]] = field(default_factory=list)  # [lifespan, soup]
+
+    def add(self, result: SoupResult) -> None:
+        """Add the outcome of the next soup."""
+        self.soups = max(self.soups, result.soup_id + 1)
+        self.lifespan_total += result.lifespan
+        if not result.stabilized:
+            self.unstable += 1
+        for name, count in result.objects.items():
+            entry = self.objects.setdefault(name, {"count": 0, "soups": []})
+            entry["count"] += count
+            if len(entry["soups"]) < SEARCH_SAMPLES:
+                entry["soups"].append(result.soup_id)  # to reproduce rare finds
+        self.longest.append([result.lifespan, result.soup_id])
+        self.longest = sorted(self.longest, reverse=True)[:10]
+
+    def rare(self, limit: int = SEARCH_SAMPLES) -> dict[str, dict]:
+        """Objects seen at most `limit` times."""
+        return {
+            name: entry
+            for name, entry in self.objects.items()
+            if entry["count"] <= limit
+        }
+
+    def save(self, path: Path) -> None:
+        """Write the results atomically (temporary file + rename)."""
+        tmp_path = path.with_name(path.name + ".tmp")
+        data = asdict(self)
+        data["objects"] = dict(
+            sorted(self.objects.items(), key=lambda item: -item[1]["count"])
+        )
+        tmp_path.write_text(json.dumps(data, indent=1))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> Census:
+        """Read results written by `save`."""
+        return cls(**json.loads(path.read_text()))
+
+
+def search(
+    census_: Census, soups: int, workers: int, path: Path | None = None
+) -> float:
+    """Run `soups` more soups on a process pool, saving after every batch.
+
+    Returns:
+        float: Soups per second per worker.
+    """
+    first = census_.soups
+    batches = [
+        range(start, min(start + SEARCH_BATCH, first + soups))
+        for start in range(first, first + soups, SEARCH_BATCH)
+    ]
+    job = partial(
+        run_soups, census_.seed, size=census_.soup_size, density=census_.density
+    )
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(workers) as pool:
+        # results arrive in order, so a saved census never has gaps
+        for results in pool.map(job, batches):
+            for result in results:
+                census_.add(result)
+            if path is not None:
+                census_.save(path)
+    elapsed = time.perf_counter() - start_time
+    return soups / max(elapsed, 1e-9) / workers
+
+
+def main() -> None:
+    """Command line entry point for (resumable) overnight searches."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("results", type=Path)
+    parser.add_argument("--soups", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--size", type=int, default=SEARCH_SOUP_SIZE)
+    parser.add_argument("--density", type=float, default=SEARCH_DENSITY)
+    args = parser.parse_args()
+
+    if args.results.exists():
+        census_ = Census.load(args.results)
+        print(f"Resuming seed {census_.seed} after {census_.soups} soups")
+    else:
+        seed = args.seed if args.seed is not None else time.time_ns() % 2**32
+        census_ = Census(seed, args.size, args.density)
+
+    rate = search(census_, args.soups, args.workers, args.results)
+    print(f"{args.soups} soups, {rate:.1f} soups/s per core ({args.workers} cores)")
+    common = sorted(census_.objects.items(), key=lambda item: -item[1]["count"])
+    for name, entry in common[:10]:
+        print(f"  {entry['count']:>8}  {name}")
+    for name, entry in census_.rare().items():
+        print(f"  rare: {name} in soups {entry['soups']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""Streams the live board to spectators over a local TCP socket.
+
+Every client first gets a compressed keyframe, then one delta per generation
+(or manual edit) with the run-length encoded births and deaths that
+`GameState` already computed. Messages (little endian):
+
+    kind u8 | generation u64 | payload length u32 | payload
+
+    keyframe: width u32 | height u32 | zlib(bit-packed board)
+    delta:    zlib(births run count u32 | birth runs u32[] | death runs u32[])
+
+Runs are the lengths of the alternating stretches of unchanged and changed
+cells in the flattened board, starting with an unchanged one.
+
+The simulation only hands references to the current arrays (the grid is
+shared copy-on-write, see `GameState.share_grid`) to a broadcaster thread,
+which encodes each message once. Every client has its own bounded queue and
+sender thread; a client that cannot keep up has its queue dropped and
+continues with a fresh keyframe.
+
+Follow a running game (with `SPECTATOR_SERVER = True`) from a terminal:
+
+    python -m core.services.spectator_server
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import queue
+import socket
+import struct
+import threading
+import zlib
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from core.game_model import UpdateType
+from utils.settings import (
+    SPECTATOR_CLIENT_QUEUE,
+    SPECTATOR_HOST,
+    SPECTATOR_PORT,
+)
+
+if TYPE_CHECKING:
+    from core.game_model import GameState
+
+KEYFRAME = 0
+DELTA = 1
+MESSAGE = struct.Struct("<BQI")
+SIZE = struct.Struct("<II")
+COUNT = struct.Struct("<I")
+
+
+def encode_runs(mask: np.ndarray) -> np.ndarray:
+    """Run lengths of the alternating false/true stretches of a flat mask."""
+    edges = np.flatnonzero(np.diff(mask.astype(np.int8), prepend=0, append=0))
+    return np.diff(edges, prepend=0).astype(np.uint32)
+
+
+def decode_runs(runs: np.ndarray, size: int) -> np.ndarray:
+    """Inverse of `encode_runs` for a mask of `size` cells."""
+    edges = np.cumsum(runs, dtype=np.int64)
+    steps = np.zeros(size + 1, dtype=np.int8)
+    steps[edges[0::2]] += 1
+    steps[edges[1::2]] -= 1
+    return np.cumsum(steps[:-1]).astype(bool)
+
+
+def encode_keyframe(generation: int, grid: np.ndarray) -> bytes:
+    """Build the keyframe message of a full board."""
+    height, width = grid.shape
+    payload = SIZE.pack(width, height) + zlib.compress(
+        np.packbits(grid != 0).tobytes(), 1
+    )
+    return MESSAGE.pack(KEYFRAME, generation, len(payload)) + payload
+
+
+def encode_delta(generation: int, births: np.ndarray, deaths: np.ndarray) -> bytes:
+    """Build the delta message of a generation from its births and deaths."""
+    birth_runs = encode_runs(births.ravel())
+    death_runs = encode_runs(deaths.ravel())
+    payload = zlib.compress(
+        COUNT.pack(len(birth_runs)) + birth_runs.tobytes() + death_runs.tobytes(), 1
+    )
+    return MESSAGE.pack(DELTA, generation, len(payload)) + payload
+
+
+class _Client:
+    """A connected spectator with its own bounded queue and sender thread."""
+
+    def __init__(self, conn: socket.socket, queue_size: int) -> None:
+        self.conn = conn
+        self.queue: queue.Queue[bytes | None] = queue.Queue(maxsize=queue_size)
+        self.needs_keyframe = True
+        self.synced = -1  # number of the frame its first keyframe showed
+        self.connected = True
+        self.sender = threading.Thread(target=self._send, name="spectator", daemon=True)
+        self.sender.start()
+
+    def offer(self, message: bytes) -> bool:
+        """Queue a message; if the client fell behind, drop its backlog instead."""
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            with contextlib.suppress(queue.Empty):
+                while True:
+                    self.queue.get_nowait()
+            self.needs_keyframe = True
+            return False
+        return True
+
+    def close(self) -> None:
+        """Stop the sender and disconnect."""
+        self.connected = False
+        with contextlib.suppress(queue.Full):
+            self.queue.put_nowait(None)
+        with contextlib.suppress(OSError):
+            self.conn.shutdown(socket.SHUT_RDWR)
+        self.conn.close()
+
+    def _send(self) -> None:
+        while self.connected:
+            message = self.queue.get()
+            if message is None:
+                return
+            try:
+                self.conn.sendall(message)
+            except OSError:
+                self.connected = False
+
+
+class SpectatorServer:
+    """Broadcasts the board of a `GameState` to any number of TCP clients."""
+
+    def __init__(
+        self,
+        host: str = SPECTATOR_HOST,
+        port: int = SPECTATOR_PORT,
+        client_queue: int = SPECTATOR_CLIENT_QUEUE,
+    ) -> None:
+        """Open the listening socket (port 0 picks a free port, see `address`).
+
+        Args:
+            host (str): Interface to listen on, loopback by default.
+            port (int): TCP port.
+            client_queue (int): Messages a client may lag behind before it is
+                skipped ahead to a new keyframe.
+        """
+        self.client_queue = client_queue
+        self.listener = socket.create_server((host, port))
+        self.address = self.listener.getsockname()
+        self._clients: list[_Client] = []
+        self._lock = threading.Lock()
+        # (number, generation, grid, births, deaths, keyframe) handed to the
+        # broadcaster, and (number, generation, grid) of the latest one, which
+        # new clients start from
+        self._frames: queue.Queue = queue.Queue(maxsize=client_queue)
+        self._latest: tuple[int, int, np.ndarray] | None = None
+        self._frame_number = 0
+        self._resync = False
+        self._state: GameState | None = None
+        self._acceptor = threading.Thread(
+            target=self._accept, name="spectator-accept", daemon=True
+        )
+        self._broadcaster = threading.Thread(
+            target=self._broadcast, name="spectator-broadcast", daemon=True
+        )
+        self._acceptor.start()
+        self._broadcaster.start()
+
+    @property
+    def client_count(self) -> int:
+        """Number of connected spectators."""
+        with self._lock:
+            return len(self._clients)
+
+    def attach(self, state: GameState) -> None:
+        """Stream every change of a `GameState`, starting with its current board."""
+        self._state = state
+        state.subscribe(self.on_state_change)
+        self.on_state_change(UpdateType.CLEAR)
+
+    def detach(self) -> None:
+        """Stop following the attached `GameState`."""
+        if self._state is not None:
+            self._state.unsubscribe(self.on_state_change)
+            self._state = None
+
+    def on_state_change(self, update_type: UpdateType) -> None:
+        """Hand the new generation to the broadcaster without waiting for it."""
+        state = self._state
+        if state is None:
+            return
+        keyframe = update_type == UpdateType.CLEAR or self._resync
+        grid = state.share_grid()  # edits copy it instead of writing in place
+        self._frame_number += 1
+        number = self._frame_number
+        self._latest = (number, state.generation, grid)
+        frame = (number, state.generation, grid, state.births, state.deaths, keyframe)
+        try:
+            self._frames.put_nowait(frame)
+        except queue.Full:
+            self._resync = True  # deltas were lost, everyone needs a keyframe
+        else:
+            self._resync = False
+
+    def stop(self) -> None:
+        """Disconnect all clients and close the server."""
+        self.detach()
+        with contextlib.suppress(OSError):
+            self.listener.shutdown(socket.SHUT_RDWR)  # wakes up the acceptor
+        self.listener.close()
+        self._frames.put(None)
+        self._broadcaster.join(timeout=1.0)
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for client in clients:
+            client.close()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                conn, _ = self.listener.accept()
+            except OSError:
+                return  # listener closed
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            client = _Client(conn, self.client_queue)
+            latest = self._latest
+            if latest is not None:
+                # start from the current board right away, even when the game
+                # is paused; the broadcaster skips the frames it already shows
+                client.synced, generation, grid = latest
+                client.needs_keyframe = not client.offer(
+                    encode_keyframe(generation, grid)
+                )
+            with self._lock:
+                self._clients.append(client)
+
+    def _broadcast(self) -> None:
+        """Encode every frame once and queue it for all clients."""
+        while True:
+            frame = self._frames.get()
+            if frame is None:
+                return
+            number, generation, grid, births, deaths, force_keyframe = frame
+            keyframe = delta = None
+            with self._lock:
+                self._clients = [c for c in self._clients if c.connected]
+                clients = list(self._clients)
+            for client in clients:
+                if number <= client.synced:
+                    continue  # already part of its first keyframe
+                if client.needs_keyframe or force_keyframe:
+                    if keyframe is None:
+                        keyframe = encode_keyframe(generation, grid)
+                    client.needs_keyframe = not client.offer(keyframe)
+                else:
+                    if delta is None:
+                        delta = encode_delta(generation, births, deaths)
+                    client.offer(delta)
+
+
+class SpectatorClient:
+    """Minimal spectator that rebuilds the board from the stream."""
+
+    def __init__(self, host: str = SPECTATOR_HOST, port: int = SPECTATOR_PORT) -> None:
+        """Connect to a running server."""
+        self.conn = socket.create_connection((host, port))
+        self.stream = self.conn.makefile("rb")
+        self.generation = 0
+        self.board: np.ndarray | None = None
+
+    def frames(self) -> Iterator[tuple[int, np.ndarray]]:
+        """Yield the generation and board after every received message."""
+        while True:
+            header = self.stream.read(MESSAGE.size)
+            if len(header) < MESSAGE.size:
+                return  # server closed the stream
+            kind, generation, length = MESSAGE.unpack(header)
+            payload = self.stream.read(length)
+            if len(payload) < length:
+                return
+            if kind == KEYFRAME:
+                width, height = SIZE.unpack_from(payload)
+                bits = np.frombuffer(zlib.decompress(payload[SIZE.size :]), np.uint8)
+                cells = np.unpackbits(bits, count=width * height)
+                self.board = cells.reshape(height, width)
+            elif self.board is not None:
+                data = zlib.decompress(payload)
+                (n_birth_runs,) = COUNT.unpack_from(data)
+                runs = np.frombuffer(data, np.uint32, offset=COUNT.size)
+                cells = self.board.reshape(-1)
+                cells[decode_runs(runs[:n_birth_runs], cells.size)] = 1
+                cells[decode_runs(runs[n_birth_runs:], cells.size)] = 0
+            self.generation = generation
+            yield generation, self.board
+
+    def close(self) -> None:
+        """Disconnect from the server."""
+        self.stream.close()
+        self.conn.close()
+
+
+def main() -> None:
+    """Command line entry point: follow a running game."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=SPECTATOR_HOST)
+    parser.add_argument("--port", type=int, default=SPECTATOR_PORT)
+    args = parser.parse_args()
+
+    client = SpectatorClient(args.host, args.port)
+    try:
+        for generation, board in client.frames():
+            print(f"Generation {generation}: {int(board.sum())} live cells")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,24 @@
 """Guides the player through the first steps of Conway's Game of Life."""
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 import numpy as np
-import pygame
 
+from core.game_model import UpdateType
 from core.services.notification_service import NotificationService
 from ui.icons import TUTORIAL_ICON_PATH
 from ui.notification_manager import NotificationType
+from ui.utils import load_icon
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    from core.models.step_snapshot import StepSnapshot
+
+# Rank of the last message of the tutorial's second stage
+LAST_RANK = 4
 
 
 class TutorialManager:
@@ -18,8 +31,24 @@ class TutorialManager:
         self.active = True
         self.shown_messages: set[str] = set()
         self.highest_triggered_rank = -1
-        self.icon_sprite = pygame.image.load(TUTORIAL_ICON_PATH).convert_alpha()
-        self.icon_sprite = pygame.transform.smoothscale(self.icon_sprite, (32, 32))
+        self.icon_sprite = load_icon(TUTORIAL_ICON_PATH)
+
+    @property
+    def done(self) -> bool:
+        """Whether the tutorial is over, so there is nothing left to react to."""
+        return not self.active or self.highest_triggered_rank >= LAST_RANK
+
+    def scan(self, snapshot: StepSnapshot) -> Iterator[None]:
+        """React to a model update (in a single slice, the check is cheap)."""
+        self.update(
+            snapshot.inner(snapshot.grid),
+            snapshot.inner(snapshot.births),
+            snapshot.inner(snapshot.deaths),
+            from_step=snapshot.update_type == UpdateType.STEP,
+            old_grid=snapshot.inner(snapshot.old_grid),
+            origins=snapshot.origins,
+        )
+        yield
 
     def update(
         self,
@@ -28,8 +57,13 @@ class TutorialManager:
         deaths: np.ndarray,
         from_step: bool,
         old_grid: np.ndarray | None = None,
+        origins: Sequence[tuple[int, int]] = ((0, 0),),
     ) -> None:
-        """React to player actions and simulation steps."""
+        """React to player actions and simulation steps.
+
+        The arrays are either the whole board, or a stack of the changed
+        parts of a chunked world, starting at `origins` on the board.
+        """
         if not self.active:
             return
 
@@ -39,7 +73,7 @@ class TutorialManager:
 
         # --- FIRST INTERACTION ---
         if self.stage == 0 and not from_step and n_births > 0:
-            self._on_first_cell_created(births)
+            self._on_first_cell_created(births, origins)
             self.stage = 1
             return
 
@@ -95,10 +129,13 @@ class TutorialManager:
                     self._say(message, key, rank)
                     break  # only one message per frame
 
-    def _on_first_cell_created(self, births: np.ndarray) -> None:
+    def _on_first_cell_created(
+        self, births: np.ndarray, origins: Sequence[tuple[int, int]]
+    ) -> None:
         """Triggered when the first cell is manually placed."""
-        y, x = np.argwhere(births)[0]
-        self.marker_pos = (int(x), int(y))
+        *block, y, x = np.argwhere(births)[0].tolist()
+        origin_x, origin_y = origins[block[0] if block else 0]
+        self.marker_pos = (origin_x + x, origin_y + y)
         self.initial_live_count = 1
 
         # # Create exclamation marker
@@ -121,6 +158,25 @@ class TutorialManager:
         self.highest_triggered_rank = max(self.highest_triggered_rank, rank)
         print(f"Tutorial triggered ({key}) → rank {rank}")
 
+    def export_state(self) -> dict:
+        """Return the tutorial progress as JSON-serializable data."""
+        return {
+            "stage": self.stage,
+            "active": self.active,
+            "marker_pos": self.marker_pos,
+            "shown_messages": sorted(self.shown_messages),
+            "highest_triggered_rank": self.highest_triggered_rank,
+        }
+
+    def restore_state(self, data: dict) -> None:
+        """Restore progress saved by `export_state` (without notifications)."""
+        self.stage = data.get("stage", 0)
+        self.active = data.get("active", True)
+        marker_pos = data.get("marker_pos")
+        self.marker_pos = tuple(marker_pos) if marker_pos else None
+        self.shown_messages = set(data.get("shown_messages", []))
+        self.highest_triggered_rank = data.get("highest_triggered_rank", -1)
+
     def reset(self) -> None:
         """Reset tutorial state."""
         self.stage = 0
@@ -0,0 +1,304 @@
+"""Host many independent worlds in one process and time-slice their generations.
+
+Every world is a board with its own `GameState` and `MetaController` (and
+with them its own achievements, rules and tutorial progress), while all
+worlds share one engine calibration (and the stateless engines), the icon
+and pattern caches and the audio device. Only the focused world is shown
+by the view and heard; the others are stepped without rendering or sound.
+
+Each frame, `WorldScheduler.run_slice` spends a time budget on generations.
+Every running world earns credit at its own speed target; the focused
+world is stepped first, the others by how far they are behind (in seconds),
+so an overloaded process slows all background worlds down evenly. Worlds
+that fall more than WORLD_MAX_LAG behind skip the generations they missed
+instead of catching up in a burst. Analysis runs inline, within the budget.
+
+A headless benchmark reports the rates and the memory per world:
+
+    python -m core.services.world_scheduler --worlds 200 --size 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pygame
+
+from core.engines.selector import EngineSelector
+from core.game_model import GameState
+from core.meta_controller import MetaController
+from core.services.metrics import resident_memory
+from core.services.sound_manager import SoundManager
+from utils.settings import (
+    GRID_HEIGHT,
+    GRID_WIDTH,
+    STEP_INTERVAL,
+    WORLD_FRAME_BUDGET,
+    WORLD_MAX_LAG,
+    WORLD_MISSED_NOTIFICATIONS,
+)
+
+if TYPE_CHECKING:
+    from core.view import GameView
+    from ui.notification_manager import NotificationType
+
+
+@dataclass(slots=True, eq=False)
+class World:
+    """One hosted board and its meta-progression."""
+
+    name: str
+    state: GameState
+    meta: MetaController
+    speed: float  # target generations per second
+    credit: float = 0.0  # generations the world is owed
+    generations: int = 0  # stepped by the scheduler
+    last_turn: int = 0  # when the world was last stepped, breaks ties in lag
+    # latest notifications raised while off screen, shown when focused
+    missed: deque[tuple] = field(
+        default_factory=lambda: deque(maxlen=WORLD_MISSED_NOTIFICATIONS)
+    )
+
+    @property
+    def lag(self) -> float:
+        """Seconds the world is behind its speed target."""
+        return self.credit / self.speed
+
+
+class WorldScheduler:
+    """Steps many worlds within a per-frame time budget."""
+
+    def __init__(
+        self,
+        sound: SoundManager | None = None,
+        engines: EngineSelector | None = None,
+    ) -> None:
+        """Create the resources all worlds share.
+
+        Args:
+            sound (SoundManager | None): Audio device of the focused world, a
+                new (silent until a world is focused) one by default.
+            engines (EngineSelector | None): Calibrated engines, forked for
+                every world.
+        """
+        self.sound = sound if sound is not None else SoundManager()
+        self.engines = engines if engines is not None else EngineSelector()
+        self.worlds: dict[str, World] = {}
+        self.focused: World | None = None
+        self.view: GameView | None = None
+        self.last_time = time.perf_counter()
+        self.turns = 0  # steps taken, over all worlds
+
+    def add_world(
+        self,
+        name: str,
+        width: int = GRID_WIDTH,
+        height: int = GRID_HEIGHT,
+        speed: float = 1 / STEP_INTERVAL,
+    ) -> World:
+        """Create a new, empty and paused world.
+
+        Args:
+            name (str): Unique name of the world.
+            width (int): Number of cells horizontally.
+            height (int): Number of cells vertically.
+            speed (float): Target generations per second while running.
+        """
+        if name in self.worlds:
+            msg = f"A world named {name!r} already exists"
+            raise ValueError(msg)
+        state = GameState(width, height, sound=self.sound, engines=self.engines.fork())
+        state.audible = False
+
+        def notifier(
+            ntype: NotificationType,
+            message: str,
+            duration: float = 3.0,
+            item_sprite: pygame.Surface | None = None,
+        ) -> None:
+            self._notify(world, (message, ntype, duration, item_sprite))
+
+        # analyzed inline: hundreds of worker threads would cost more than
+        # they save, and the analysis then counts against the frame budget
+        meta = MetaController(state, notifier, threaded=False)
+        world = World(name, state, meta, speed)
+        self.worlds[name] = world
+        return world
+
+    def remove_world(self, name: str) -> None:
+        """Drop a world; if it was focused, the first remaining one is focused."""
+        world = self.worlds.pop(name)
+        world.meta.stop()
+        if world is self.focused:
+            self.focused = None
+            if self.worlds:
+                self.focus(next(iter(self.worlds)))
+
+    def attach_view(self, view: GameView) -> None:
+        """Show the focused world in `view` from now on."""
+        self.view = view
+        if self.focused is not None:
+            view.show(self.focused.state, self.focused.meta)
+
+    def focus(self, name: str) -> World:
+        """Bring a world on screen: the view shows it and its sound plays."""
+        world = self.worlds[name]
+        if self.focused is not None:
+            self.focused.state.audible = False
+        self.focused = world
+        world.state.audible = True
+        if self.view is not None:
+            self.view.show(world.state, world.meta)
+            while world.missed:
+                self._notify(world, world.missed.popleft())
+        return world
+
+    def run_slice(self, budget: float = WORLD_FRAME_BUDGET) -> int:
+        """Step the running worlds that are due, for at most `budget` seconds.
+
+        Returns:
+            int: Generations stepped, over all worlds.
+        """
+        now = time.perf_counter()
+        elapsed, self.last_time = now - self.last_time, now
+        deadline = now + budget
+        for world in self.worlds.values():
+            if world.state.running:
+                world.credit = min(
+                    world.credit + elapsed * world.speed,
+                    max(WORLD_MAX_LAG * world.speed, 1.0),
+                )
+            else:
+                world.credit = 0.0
+
+        steps = 0
+        focused = self.focused
+        if focused is not None:
+            while focused.credit >= 1 and time.perf_counter() < deadline:
+                self._step(focused)
+                steps += 1
+
+        # the others by how far behind they are, most behind first (and
+        # round-robin among equally late ones, e.g. all held at WORLD_MAX_LAG)
+        due = [
+            (-world.lag, world.last_turn, i, world)
+            for i, world in enumerate(self.worlds.values())
+            if world is not focused and world.credit >= 1
+        ]
+        heapq.heapify(due)
+        while due and time.perf_counter() < deadline:
+            *_, i, world = heapq.heappop(due)
+            self._step(world)
+            steps += 1
+            if world.credit >= 1:
+                heapq.heappush(due, (-world.lag, world.last_turn, i, world))
+        return steps
+
+    def dispatch_notifications(self) -> None:
+        """Deliver the notifications raised by the analysis of every world."""
+        for world in self.worlds.values():
+            if world.meta.pending_notifications:
+                world.meta.dispatch_notifications()
+
+    def stop(self) -> None:
+        """Stop all worlds and the shared audio."""
+        for world in self.worlds.values():
+            world.meta.stop()
+        self.sound.synth.stop()
+
+    def _step(self, world: World) -> None:
+        """Step a world by one generation, pausing it once it is stable."""
+        world.credit -= 1
+        world.generations += 1
+        self.turns += 1
+        world.last_turn = self.turns
+        if not world.state.step():
+            world.state.running = False
+            world.credit = 0.0
+
+    def _notify(self, world: World, notification: tuple) -> None:
+        """Show a world's notification, or keep it for when it is focused."""
+        if world is self.focused and self.view is not None:
+            self.view.notification_manager.push(*notification)
+        else:
+            world.missed.append(notification)
+
+
+def benchmark(worlds: int, size: int, seconds: float, speed: float) -> dict[str, float]:
+    """Run random soups in many worlds headless, the first one focused.
+
+    Returns:
+        dict[str, float]: Throughput, the rates reached relative to the speed
+        target, Jain's fairness index of the background worlds and the
+        memory per world.
+    """
+    scheduler = WorldScheduler()
+    memory = resident_memory()
+    rng = np.random.default_rng(0)
+    for i in range(worlds):
+        world = scheduler.add_world(f"world-{i}", size, size, speed)
+        world.state.load_grid((rng.random((size, size)) < 0.3).astype(int))
+        world.state.running = True
+    memory = (resident_memory() - memory) / worlds
+    scheduler.focus("world-0")
+
+    start = scheduler.last_time = time.perf_counter()
+    frames = 0
+    while time.perf_counter() - start < seconds:
+        scheduler.run_slice()
+        scheduler.dispatch_notifications()
+        frames += 1
+    elapsed = time.perf_counter() - start
+    scheduler.stop()
+
+    rates = np.array([w.generations for w in scheduler.worlds.values()]) / elapsed
+    background = rates[1:] / speed
+    fairness = background.sum() ** 2 / (len(background) * (background**2).sum())
+    return {
+        "generations_per_second": rates.sum(),
+        "frames_per_second": frames / elapsed,
+        "focused_rate": rates[0] / speed,
+        "background_rate": background.mean() if len(background) else 0.0,
+        "fairness": fairness if len(background) and background.any() else 1.0,
+        "memory_per_world": memory,
+    }
+
+
+def main() -> None:
+    """Command line entry point: benchmark the scheduler with many worlds."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--worlds", type=int, default=100)
+    parser.add_argument("--size", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--speed", type=float, default=1 / STEP_INTERVAL)
+    args = parser.parse_args()
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((1, 1))  # icons are converted for the display
+    result = benchmark(args.worlds, args.size, args.seconds, args.speed)
+    pygame.quit()
+
+    print(
+        f"{args.worlds} worlds of {args.size}x{args.size} at {args.speed:g} gen/s: "
+        f"{result['generations_per_second']:.0f} gen/s in total, "
+        f"{result['frames_per_second']:.0f} frames/s"
+    )
+    print(
+        f"focused world at {result['focused_rate']:.0%} of its target, "
+        f"background worlds at {result['background_rate']:.0%} "
+        f"(fairness {result['fairness']:.2f})"
+    )
+    print(f"{result['memory_per_world'] / 1024:.0f} KiB per world")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,580 @@
+"""Chunked world store for boards larger than memory.
+
+The world is split into square chunks of `chunk_size` cells. Chunks are kept
+bit-packed on disk in region files of `region_size` x `region_size` chunk
+slots, which are accessed through memory maps (`np.memmap`). Region files
+are created sparse, so a chunk that never had a live cell takes no space.
+
+Only recently used chunks are unpacked in memory, in an LRU cache of
+`cache_chunks` entries; modified chunks are written back on eviction.
+Stepping only visits chunks that changed in the previous generation and
+their neighbours: a chunk whose whole neighbourhood stayed the same cannot
+change either, so dead and settled areas are neither loaded nor simulated.
+Like the in-memory board, the world wraps around at its edges.
+
+A `GameState` created with a world (`WORLD_DIRECTORY` in the settings) plays
+on it instead of an in-memory board: the renderer reads the visible cells
+with `read_window`, and the analyzers get the chunks changed by the last
+step or edit (`last_changed`, `read_block`) instead of a copy of the board.
+
+Worlds can be created and advanced headless, e.g. a random soup in the
+middle of a board of four billion cells:
+
+    python -m core.services.world_store world --width 65536 --height 65536 \\
+        --soup 512 --generations 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import tempfile
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+
+from core.life import next_generation_interior
+from utils.settings import (
+    WORLD_CACHE_CHUNKS,
+    WORLD_CHUNK_SIZE,
+    WORLD_OPEN_REGIONS,
+    WORLD_REGION_SIZE,
+)
+
+META_FILE = "world.json"
+REGION_GLOB = "region_*.bin"
+
+ChunkKey = tuple[int, int]
+
+
+class ChunkedWorld:
+    """A toroidal board stored in region files, with a hot-chunk LRU cache."""
+
+    def __init__(
+        self,
+        directory: str | Path,
+        width: int,
+        height: int,
+        chunk_size: int = WORLD_CHUNK_SIZE,
+        region_size: int = WORLD_REGION_SIZE,
+        cache_chunks: int = WORLD_CACHE_CHUNKS,
+    ) -> None:
+        """Create an empty world, or resume the world flushed to `directory`.
+
+        Args:
+            directory (str | Path): Directory holding the region files.
+            width (int): Board width in cells, a multiple of `chunk_size`.
+            height (int): Board height in cells, a multiple of `chunk_size`.
+            chunk_size (int): Cells per chunk edge, a multiple of 8.
+            region_size (int): Chunks per region file edge.
+            cache_chunks (int): Unpacked chunks kept in memory.
+        """
+        if width % chunk_size or height % chunk_size or chunk_size % 8:
+            msg = (
+                f"World size {width}x{height} must be a multiple of the chunk "
+                f"size {chunk_size}, which must be a multiple of 8."
+            )
+            raise ValueError(msg)
+        self.directory = Path(directory)
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.region_size = region_size
+        self.cache_chunks = cache_chunks
+        self.cols = width // chunk_size
+        self.rows = height // chunk_size
+        self.generation = 0
+        self.population = 0
+        # births and deaths of the last step, in total and per column of chunks
+        self.births = 0
+        self.deaths = 0
+        self.birth_columns = np.zeros(self.cols, dtype=np.int64)
+        self.death_columns = np.zeros(self.cols, dtype=np.int64)
+
+        self._chunks: OrderedDict[ChunkKey, np.ndarray] = OrderedDict()
+        self._dirty: set[ChunkKey] = set()  # cached chunks not yet written back
+        self._live: set[ChunkKey] = set()  # chunks with at least one live cell
+        self._changed: set[ChunkKey] = set()  # chunks changed since the last step
+        self._regions: OrderedDict[ChunkKey, np.memmap] = OrderedDict()
+        # contents of the chunks changed by the last step or edit, before it
+        self._previous: _StagedChunks | None = None
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        meta_path = self.directory / META_FILE
+        if meta_path.exists():
+            self._resume(json.loads(meta_path.read_text()))
+        else:
+            for path in self.directory.glob(REGION_GLOB):
+                path.unlink()  # left over from a world that was never flushed
+
+    def _resume(self, meta: dict) -> None:
+        """Continue a world that was written with `flush()`."""
+        layout = (self.width, self.height, self.chunk_size, self.region_size)
+        stored = (
+            meta["width"],
+            meta["height"],
+            meta["chunk_size"],
+            meta["region_size"],
+        )
+        if layout != stored:
+            msg = f"{self.directory} holds a different world ({stored}, not {layout})."
+            raise ValueError(msg)
+        self.generation = meta["generation"]
+        self.population = meta["population"]
+        self._live = {tuple(key) for key in meta["live"]}
+        self._changed = {tuple(key) for key in meta["changed"]}
+
+    @property
+    def status(self) -> str:
+        """Chunks with live cells and chunks in the cache, for diagnostics."""
+        return f"{len(self._live)} live chunks, {len(self._chunks)} cached"
+
+    @property
+    def last_changed(self) -> list[ChunkKey]:
+        """The chunks changed by the last step or edit."""
+        return [] if self._previous is None else list(self._previous.keys)
+
+    # Cell access
+
+    def get_cell(self, x: int, y: int) -> int:
+        """Return the state of a single cell."""
+        key = (x // self.chunk_size, y // self.chunk_size)
+        if key not in self._live:
+            return 0
+        return int(self.chunk(*key)[y % self.chunk_size, x % self.chunk_size])
+
+    def toggle_cell(self, x: int, y: int) -> None:
+        """Toggle a single cell's alive/dead state."""
+        cell = np.array([[1 - self.get_cell(x, y)]], dtype=np.uint8)
+        self.write_window(x, y, cell)
+
+    def get_cells(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """Return the states of scattered cells (e.g. the cells of a stroke)."""
+        size = self.chunk_size
+        values = np.zeros(len(xs), dtype=np.uint8)
+        for key, index in self._by_chunk(xs, ys):
+            if key in self._live:
+                values[index] = self.chunk(*key)[ys[index] % size, xs[index] % size]
+        return values
+
+    def set_cells(self, xs: np.ndarray, ys: np.ndarray, values: np.ndarray) -> None:
+        """Set scattered cells to the given states, as a single edit."""
+        previous = self._begin_change()
+        size = self.chunk_size
+        for key, index in self._by_chunk(xs, ys):
+            chunk = self.chunk(*key)
+            previous.add(key, chunk)
+            chunk = chunk.copy()
+            chunk[ys[index] % size, xs[index] % size] = values[index] != 0
+            self._put(key, chunk)
+            self._changed.add(key)
+
+    def read_window(self, x: int, y: int, width: int, height: int) -> np.ndarray:
+        """Copy a rectangle of cells (e.g. the visible viewport) out of the world.
+
+        Dead chunks are not loaded, the rectangle is clipped to the world.
+        """
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, self.width), min(y + height, self.height)
+        window = np.zeros((max(y1 - y0, 0), max(x1 - x0, 0)), dtype=np.uint8)
+        for key, (sx, sy, dx, dy) in self._overlapping(x0, y0, x1, y1):
+            if key in self._live:
+                window[dy, dx] = self.chunk(*key)[sy, sx]
+        return window
+
+    def write_window(self, x: int, y: int, cells: np.ndarray) -> None:
+        """Overwrite a rectangle of cells, e.g. to load a pattern."""
+        previous = self._begin_change()
+        height, width = cells.shape
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, self.width), min(y + height, self.height)
+        for key, (sx, sy, dx, dy) in self._overlapping(x0, y0, x1, y1):
+            source = cells[y0 - y :, x0 - x :][dy, dx]
+            chunk = self.chunk(*key)
+            previous.add(key, chunk)
+            chunk = chunk.copy()
+            chunk[sy, sx] = source != 0
+            self._put(key, chunk)
+            self._changed.add(key)
+
+    def live_chunks(self) -> Iterator[tuple[ChunkKey, np.ndarray]]:
+        """Iterate the chunks holding live cells (for analyzers), read-only."""
+        for key in sorted(self._live):
+            chunk = self.chunk(*key)
+            view = chunk.view()
+            view.flags.writeable = False
+            yield key, view
+
+    def read_block(
+        self, key: ChunkKey, margin: int, previous: bool = False
+    ) -> np.ndarray:
+        """Copy a chunk with `margin` cells of its (wrapped) neighbours around it.
+
+        With `previous`, the chunks changed by the last step or edit are read
+        as they were before it, e.g. to compare two generations.
+        """
+        if not 0 < margin <= self.chunk_size:
+            msg = f"The margin must be between 1 and the chunk size {self.chunk_size}."
+            raise ValueError(msg)
+        edge = self.chunk_size + 2 * margin
+        block = np.zeros((edge, edge), dtype=np.uint8)
+        self._pad_into(block, key, margin, previous)
+        return block
+
+    # Simulation
+
+    def step(self) -> bool:
+        """Advance the world by one generation.
+
+        Chunks are stepped in batches small enough for their neighbours to
+        stay in the cache, and the new chunks are staged (spilled to disk
+        beyond `cache_chunks`) until all of them were computed from the old
+        generation, so memory does not grow with the number of active chunks.
+
+        Returns:
+            bool: False if the step hasn't changed anything, True otherwise.
+        """
+        candidates = {
+            neighbor for key in self._changed for neighbor in self._neighborhood(key)
+        }
+        # a dead neighbourhood stays dead; row by row, so that a batch and its
+        # neighbours are a few rows of chunks
+        keys = sorted(
+            (
+                key
+                for key in candidates
+                if any(n in self._live for n in self._neighborhood(key))
+            ),
+            key=lambda key: (key[1], key[0]),
+        )
+        size = self.chunk_size
+        batch = max(self.cache_chunks // 4, 1)  # plus the rows above and below
+        staged = _StagedChunks(self.directory, size, self.cache_chunks)
+        previous = _StagedChunks(self.directory, size, self.cache_chunks)
+        self.birth_columns = np.zeros(self.cols, dtype=np.int64)
+        self.death_columns = np.zeros(self.cols, dtype=np.int64)
+        for start in range(0, len(keys), batch):
+            part = keys[start : start + batch]
+            padded = np.zeros((len(part), size + 2, size + 2), dtype=np.uint8)
+            for block, key in zip(padded, part, strict=True):
+                self._pad_into(block, key)
+            old = padded[:, 1:-1, 1:-1]
+            new = next_generation_interior(padded)  # the batch in one go
+            births = np.count_nonzero(new > old, axis=(1, 2))
+            deaths = np.count_nonzero(new < old, axis=(1, 2))
+            columns = [cx for cx, _ in part]
+            np.add.at(self.birth_columns, columns, births)
+            np.add.at(self.death_columns, columns, deaths)
+            for i in np.flatnonzero(births + deaths):
+                staged.add(part[i], new[i])
+                previous.add(part[i], old[i])
+
+        # apply only after all chunks were computed from the old generation
+        for key, cells in staged.items():
+            self._put(key, cells)
+        staged.close()
+        self._begin_change(previous)
+        self._changed = set(staged.keys)
+        self.births = int(self.birth_columns.sum())
+        self.deaths = int(self.death_columns.sum())
+        self.generation += 1
+        return bool(staged.keys)
+
+    def clear(self) -> None:
+        """Kill all cells, deleting the region files."""
+        self._begin_change()
+        self._chunks.clear()
+        self._dirty.clear()
+        self._live.clear()
+        self._changed.clear()
+        self._regions.clear()
+        for path in self.directory.glob(REGION_GLOB):
+            path.unlink()
+        (self.directory / META_FILE).unlink(missing_ok=True)
+        self.population = 0
+
+    # Persistence
+
+    def flush(self) -> None:
+        """Write all modified chunks and the world metadata to disk."""
+        for key in list(self._dirty):
+            self._store(key, self._chunks[key])
+        self._dirty.clear()
+        for region in self._regions.values():
+            region.flush()
+        meta = {
+            "width": self.width,
+            "height": self.height,
+            "chunk_size": self.chunk_size,
+            "region_size": self.region_size,
+            "generation": self.generation,
+            "population": self.population,
+            "live": sorted(self._live),
+            "changed": sorted(self._changed),
+        }
+        (self.directory / META_FILE).write_text(json.dumps(meta))
+
+    def close(self) -> None:
+        """Flush and release all memory maps."""
+        self.flush()
+        self._chunks.clear()
+        self._regions.clear()
+        if self._previous is not None:
+            self._previous.close()
+            self._previous = None
+
+    # Chunk cache
+
+    def chunk(self, cx: int, cy: int) -> np.ndarray:
+        """Return the cells of a chunk, loading it into the LRU cache if needed.
+
+        The returned array must not be modified, write through `write_window`.
+        """
+        key = (cx, cy)
+        cells = self._chunks.get(key)
+        if cells is not None:
+            self._chunks.move_to_end(key)
+            return cells
+        if key in self._live:
+            cells = self._load(key)
+        else:
+            cells = np.zeros((self.chunk_size, self.chunk_size), dtype=np.uint8)
+        self._chunks[key] = cells
+        self._evict()
+        return cells
+
+    def _put(self, key: ChunkKey, cells: np.ndarray) -> None:
+        """Replace a chunk's cells, keeping population and live set in sync."""
+        old = self._chunks.get(key)
+        if old is None:
+            old = self.chunk(*key)
+        self.population += int(np.count_nonzero(cells)) - int(np.count_nonzero(old))
+        if cells.any():
+            self._live.add(key)
+            self._chunks[key] = cells
+            self._chunks.move_to_end(key)
+            self._dirty.add(key)
+            self._evict()
+        else:
+            # dead chunks are written back right away and not kept in memory
+            was_live = key in self._live
+            self._live.discard(key)
+            self._chunks.pop(key, None)
+            self._dirty.discard(key)
+            if was_live:
+                self._store(key, cells)
+
+    def _begin_change(self, previous: _StagedChunks | None = None) -> _StagedChunks:
+        """Start remembering the chunks of a new change (as they were before it)."""
+        if self._previous is not None:
+            self._previous.close()
+        if previous is None:
+            previous = _StagedChunks(self.directory, self.chunk_size, self.cache_chunks)
+        self._previous = previous
+        return previous
+
+    def _evict(self) -> None:
+        """Drop least recently used chunks, writing modified ones back."""
+        while len(self._chunks) > self.cache_chunks:
+            key, cells = self._chunks.popitem(last=False)
+            if key in self._dirty:
+                self._store(key, cells)
+                self._dirty.discard(key)
+
+    def _load(self, key: ChunkKey) -> np.ndarray:
+        region, slot = self._slot(key)
+        bits = np.unpackbits(region[slot])
+        return bits.reshape(self.chunk_size, self.chunk_size)
+
+    def _store(self, key: ChunkKey, cells: np.ndarray) -> None:
+        region, slot = self._slot(key)
+        region[slot] = np.packbits(cells)
+
+    def _slot(self, key: ChunkKey) -> tuple[np.memmap, int]:
+        """Return the memory-mapped region file of a chunk and its slot in it."""
+        cx, cy = key
+        size = self.region_size
+        region_key = (cx // size, cy // size)
+        region = self._regions.get(region_key)
+        if region is None:
+            path = self.directory / f"region_{region_key[0]}_{region_key[1]}.bin"
+            shape = (size * size, self.chunk_size * self.chunk_size // 8)
+            if not path.exists():
+                with path.open("wb") as f:
+                    f.truncate(shape[0] * shape[1])  # sparse until written
+            region = np.memmap(path, dtype=np.uint8, mode="r+", shape=shape)
+            self._regions[region_key] = region
+            while len(self._regions) > WORLD_OPEN_REGIONS:
+                self._regions.popitem(last=False)[1].flush()
+        else:
+            self._regions.move_to_end(region_key)
+        return region, (cy % size) * size + cx % size
+
+    # Geometry
+
+    def _neighborhood(self, key: ChunkKey) -> list[ChunkKey]:
+        """The chunk and its eight (wrapped) neighbours."""
+        cx, cy = key
+        return [
+            ((cx + dx) % self.cols, (cy + dy) % self.rows)
+            for dy in (-1, 0, 1)
+            for dx in (-1, 0, 1)
+        ]
+
+    def _pad_into(
+        self,
+        block: np.ndarray,
+        key: ChunkKey,
+        margin: int = 1,
+        previous: bool = False,
+    ) -> None:
+        """Fill a zeroed block with the chunk and a `margin` wide halo around it.
+
+        With `previous`, changed chunks are taken from before the last change.
+        """
+        size, m = self.chunk_size, margin
+        # (source rows/cols in the neighbour, target rows/cols in the block)
+        parts = {
+            -1: (slice(size - m, size), slice(0, m)),
+            0: (slice(0, size), slice(m, m + size)),
+            1: (slice(0, m), slice(m + size, 2 * m + size)),
+        }
+        neighbors = iter(self._neighborhood(key))
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                neighbor = next(neighbors)
+                cells = None
+                if previous and self._previous is not None:
+                    cells = self._previous.get(neighbor)
+                if cells is None:
+                    if neighbor not in self._live:
+                        continue
+                    cells = self.chunk(*neighbor)
+                (sy, ty), (sx, tx) = parts[dy], parts[dx]
+                block[ty, tx] = cells[sy, sx]
+
+    def _by_chunk(
+        self, xs: np.ndarray, ys: np.ndarray
+    ) -> Iterator[tuple[ChunkKey, np.ndarray]]:
+        """Group scattered cells by chunk: the chunk key and the cells' indices."""
+        if len(xs) == 0:
+            return
+        size = self.chunk_size
+        keys = (ys // size) * self.cols + xs // size
+        order = np.argsort(keys, kind="stable")
+        for index in np.split(order, np.flatnonzero(np.diff(keys[order])) + 1):
+            cy, cx = divmod(int(keys[index[0]]), self.cols)
+            yield (cx, cy), index
+
+    def _overlapping(
+        self, x0: int, y0: int, x1: int, y1: int
+    ) -> Iterator[tuple[ChunkKey, tuple[slice, slice, slice, slice]]]:
+        """Chunks overlapping a cell rectangle, with their part of it.
+
+        Yields the chunk key and (chunk cols, chunk rows, window cols, window
+        rows) slices, the window being relative to (x0, y0).
+        """
+        size = self.chunk_size
+        for cy in range(y0 // size, (y1 - 1) // size + 1 if y1 > y0 else 0):
+            top, bottom = max(y0, cy * size), min(y1, (cy + 1) * size)
+            for cx in range(x0 // size, (x1 - 1) // size + 1 if x1 > x0 else 0):
+                left, right = max(x0, cx * size), min(x1, (cx + 1) * size)
+                yield (
+                    (cx, cy),
+                    (
+                        slice(left - cx * size, right - cx * size),
+                        slice(top - cy * size, bottom - cy * size),
+                        slice(left - x0, right - x0),
+                        slice(top - y0, bottom - y0),
+                    ),
+                )
+
+
+class _StagedChunks:
+    """Chunks of a generation, bit-packed and spilled to disk if many.
+
+    Holds the next generation while a step computes it, and the chunks a
+    step or edit changed as they were before it (see `ChunkedWorld.read_block`).
+    """
+
+    def __init__(self, directory: Path, chunk_size: int, in_memory: int) -> None:
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.in_memory = in_memory
+        self.keys: list[ChunkKey] = []
+        self._packed: dict[ChunkKey, np.ndarray] = {}
+        self._spill: BinaryIO | None = None
+        self._offsets: dict[ChunkKey, int] = {}
+
+    def add(self, key: ChunkKey, cells: np.ndarray) -> None:
+        """Stage the cells of a chunk."""
+        self.keys.append(key)
+        packed = np.packbits(cells)
+        if len(self._packed) < self.in_memory:
+            self._packed[key] = packed
+            return
+        if self._spill is None:
+            self._spill = tempfile.TemporaryFile(dir=self.directory)
+        self._offsets[key] = self._spill.seek(0, io.SEEK_END)
+        self._spill.write(packed.tobytes())
+
+    def get(self, key: ChunkKey) -> np.ndarray | None:
+        """The staged cells of a chunk, None if it was not staged."""
+        size = self.chunk_size
+        packed = self._packed.get(key)
+        if packed is None:
+            offset = self._offsets.get(key)
+            if offset is None:
+                return None
+            self._spill.seek(offset)
+            packed = np.frombuffer(self._spill.read(size * size // 8), dtype=np.uint8)
+        return np.unpackbits(packed).reshape(size, size)
+
+    def items(self) -> Iterator[tuple[ChunkKey, np.ndarray]]:
+        """The staged chunks (unpacked one at a time)."""
+        for key in self.keys:
+            yield key, self.get(key)
+
+    def close(self) -> None:
+        """Delete the spill file."""
+        if self._spill is not None:
+            self._spill.close()
+
+
+def main() -> None:
+    """Command line entry point: seed and advance a world headless."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--width", type=int, default=16384)
+    parser.add_argument("--height", type=int, default=16384)
+    parser.add_argument("--soup", type=int, default=0, help="edge of a random soup")
+    parser.add_argument("--density", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--generations", type=int, default=100)
+    args = parser.parse_args()
+
+    world = ChunkedWorld(args.directory, args.width, args.height)
+    if args.soup:
+        rng = np.random.default_rng(args.seed)
+        soup = (rng.random((args.soup, args.soup)) < args.density).astype(np.uint8)
+        world.write_window(
+            (world.width - args.soup) // 2, (world.height - args.soup) // 2, soup
+        )
+    start = time.perf_counter()
+    for _ in range(args.generations):
+        world.step()
+    elapsed = time.perf_counter() - start
+    world.close()
+    print(
+        f"Generation {world.generation}: {world.population} live cells, "
+        f"{args.generations / max(elapsed, 1e-9):.1f} generations/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,26 @@
 Handles rendering orchestration by delegating to specialized UI components.
 """
 
+import time
+
+import numpy as np
 import pygame
 
 from core.game_model import GameState, UpdateType
 from core.meta_controller import MetaController
+from core.services.metrics import FRAMES, RENDER_SECONDS
+from ui.camera import Camera
+from ui.dirty_rects import changed_cell_regions
 from ui.grid import GridRenderer
 from ui.marker_manager import MarkerManager
 from ui.notification_manager import NotificationManager
-from ui.overlay import AchievementsOverlay, RulesOverlay
+from ui.overlay import AchievementsOverlay, Overlay, RulesOverlay
 from ui.sidebar import Sidebar
 from utils.settings import (
+    DIRTY_BLOCK_SIZE,
+    DIRTY_MAX_FRACTION,
+    DIRTY_RECTS,
+    ENGINE_REEVALUATE_INTERVAL,
     GRID_PIXEL_HEIGHT,
     GRID_PIXEL_WIDTH,
     SIDEBAR_WIDTH,
@@ -33,15 +43,55 @@ class GameView:
         pygame.display.set_caption("Conway's Game of Life")
 
         # Core UI components
-        self.grid_renderer = GridRenderer(self.state, self.screen)
+        self.camera = Camera(
+            (state.width, state.height),
+            pygame.Rect(0, 0, GRID_PIXEL_WIDTH, GRID_PIXEL_HEIGHT),
+        )
+        self.grid_renderer = GridRenderer(self.state, self.screen, self.camera)
         self.sidebar = Sidebar(
             self.state, self.screen, GRID_PIXEL_WIDTH, 0, SIDEBAR_WIDTH, TOTAL_HEIGHT
         )
         self.marker_manager = MarkerManager(self.screen)
         self.notification_manager = NotificationManager(self.screen)
 
+        # Dirty-rect presentation: cells changed since the last present and
+        # the UI state that was presented last time. Not kept for a chunked
+        # world, whose frames are presented whole (only the viewport is drawn).
+        self.dirty_rects_enabled = DIRTY_RECTS and state.world is None
+        shape = (state.height, state.width) if state.world is None else (0, 0)
+        self.changed_cells = np.zeros(shape, dtype=bool)
+        self.full_redraw = True
+        self.last_ui_rects: list[pygame.Rect] = []
+        self.last_sidebar_version = -1
+        self.last_overlay_state: tuple = ()
+        self.last_camera_version = -1
+
         self.state.subscribe(self.on_state_change)
 
+    def show(self, state: GameState, meta: MetaController) -> None:
+        """Switch the view to another board and its meta-progression.
+
+        Used to move the window between the worlds of a `WorldScheduler`;
+        only the board on screen is subscribed to (and redrawn by) the view.
+        """
+        self.state.unsubscribe(self.on_state_change)
+        self.state.unsubscribe(self.grid_renderer.on_state_change)
+        self.state = state
+        self.grid_renderer.state = state
+        self.sidebar.state = state
+        if (state.width, state.height) != self.changed_cells.shape[::-1]:
+            self.camera = Camera((state.width, state.height), self.camera.viewport)
+            self.grid_renderer.camera = self.camera
+            self.grid_renderer.grid_layer.invalidate()
+            self.changed_cells = np.zeros((state.height, state.width), dtype=bool)
+        self.grid_renderer.board_version += 1
+        self.grid_renderer.cell_key = None
+        self.last_camera_version = -1
+        self.full_redraw = True
+        state.subscribe(self.on_state_change)
+        state.subscribe(self.grid_renderer.on_state_change)
+        self.add_meta_system(meta)
+
     def add_meta_system(self, meta: MetaController) -> None:
         self.meta = meta
         self.achievements_overlay = AchievementsOverlay(
@@ -52,7 +102,8 @@ class GameView:
         )
 
     def draw(self) -> None:
-        """Draw all currently active visual components."""
+        """Draw all currently active visual components and present them."""
+        start = time.perf_counter()
         self.grid_renderer.draw_background()
         self.grid_renderer.draw_grid()
         self.grid_renderer.draw_cells()
@@ -61,13 +112,88 @@ class GameView:
         self.sidebar.draw()
         self.notification_manager.draw()
 
+        overlay = None
         if self.state.achievements_visible:
-            self.achievements_overlay.draw()
+            overlay = self.achievements_overlay
         elif self.state.rules_visible:
-            self.rules_overlay.draw()
+            overlay = self.rules_overlay
+        if overlay is not None:
+            overlay.draw()
+
+        self.present(overlay)
+        RENDER_SECONDS.observe(time.perf_counter() - start)
+
+    def next_frame_in(self) -> float | None:
+        """Seconds until an animation needs the next frame (None if fully idle)."""
+        if self.state.running:
+            return 0.0
+        timers = [
+            self.notification_manager.next_change_in(time.time()),
+            self.marker_manager.next_change_in(),
+        ]
+        timers = [t for t in timers if t is not None]
+        return min(timers) if timers else None
 
+    def present(self, overlay: Overlay | None) -> None:
+        """Push the frame to the display, limited to dirty areas when possible."""
+        FRAMES.inc()
+        overlay_state = (id(overlay), overlay.layer.version if overlay else 0)
+        if overlay_state != self.last_overlay_state:
+            self.full_redraw = True
+            self.last_overlay_state = overlay_state
+        if self.camera.version != self.last_camera_version:
+            self.full_redraw = True
+            self.last_camera_version = self.camera.version
+
+        if not self.dirty_rects_enabled or self.full_redraw:
+            self._flip()
+            return
+
+        rects = [
+            self.camera.cells_to_screen_rect(region)
+            for region in changed_cell_regions(self.changed_cells, DIRTY_BLOCK_SIZE)
+        ]
+        if self.sidebar.layer.version != self.last_sidebar_version:
+            rects.append(self.sidebar.rect)
+        # UI drawn now, plus what was drawn last time (so it gets erased)
+        ui_rects = (
+            self.notification_manager.drawn_rects + self.marker_manager.drawn_rects
+        )
+        rects += ui_rects + self.last_ui_rects
+
+        dirty_area = sum(r.w * r.h for r in rects)
+        if dirty_area > DIRTY_MAX_FRACTION * TOTAL_WIDTH * TOTAL_HEIGHT:
+            self._flip()
+            return
+        if rects:
+            pygame.display.update(rects)
+        self._mark_presented(ui_rects)
+
+    def _flip(self) -> None:
+        """Present the whole window."""
         pygame.display.flip()
+        self.full_redraw = False
+        self._mark_presented(
+            self.notification_manager.drawn_rects + self.marker_manager.drawn_rects
+        )
+
+    def _mark_presented(self, ui_rects: list[pygame.Rect]) -> None:
+        """Reset the dirty tracking after a present."""
+        self.changed_cells[:] = False
+        self.last_ui_rects = ui_rects
+        self.last_sidebar_version = self.sidebar.layer.version
 
     def on_state_change(self, update_type: UpdateType) -> None:
         """React to model updates by redrawing the view."""
+        if update_type == UpdateType.CLEAR or self.state.world is not None:
+            self.full_redraw = True
+        else:
+            self.changed_cells |= np.logical_or(self.state.births, self.state.deaths)
+        if (
+            update_type == UpdateType.STEP
+            and self.state.generation % ENGINE_REEVALUATE_INTERVAL == 0
+        ):
+            # diagnostics: which engine runs the board, and how fast
+            status = self.state.engine_status
+            pygame.display.set_caption(f"Conway's Game of Life ({status})")
         self.draw()
@@ -3,17 +3,40 @@
 Initializes Pygame, creates the MVC components, and starts the main event loop.
 """
 
+import argparse
+import time
+from pathlib import Path
+
 import pygame
 
 from core.game_controller import GameController
 from core.game_model import GameState
 from core.meta_controller import MetaController
+from core.services.input_replay import InputRecorder
+from core.services.journal import GenerationJournal
+from core.services.metrics import MetricsServer
+from core.services.session_store import Autosaver, SessionStore, SnapshotError
+from core.services.shared_board import BoardPublisher
+from core.services.spectator_server import SpectatorServer
+from core.services.world_store import ChunkedWorld
 from core.view import GameView
 from ui.notification_manager import NotificationType
-from utils.settings import FPS
-
-
-def main() -> None:
+from utils.settings import (
+    AUTOSAVE_INTERVAL,
+    FPS,
+    IDLE_MAX_WAIT,
+    JOURNAL_DIR,
+    METRICS_SERVER,
+    SAVE_PATH,
+    SHARED_BOARD,
+    SPECTATOR_SERVER,
+    WORLD_DIRECTORY,
+    WORLD_HEIGHT,
+    WORLD_WIDTH,
+)
+
+
+def main(record_input: Path | None = None) -> None:
     """Run the main loop of Conway's Game of Life.
 
     This function initializes the game environment, sets up the model-view-
@@ -25,12 +48,42 @@ def main() -> None:
         2. Process user input via the controller.
         3. Update the simulation state.
         4. Redraw the current frame via the view.
-        5. Limit the frame rate to `FPS` from settings.
+        5. Limit the frame rate to `FPS` from settings while running or
+           animating, otherwise block until input or the next animation.
 
     Exits cleanly when the Pygame window is closed.
+
+    Args:
+        record_input (Path | None): File to record the input of the session
+            into, for `python -m core.services.input_replay`.
     """
     pygame.init()
-    state = GameState()
+
+    # A chunked world on disk is its own save; the services that need the
+    # whole board in memory (saves, history, exports, recordings) are off.
+    world = None
+    if WORLD_DIRECTORY is not None:
+        world = ChunkedWorld(WORLD_DIRECTORY, WORLD_WIDTH, WORLD_HEIGHT)
+        if SHARED_BOARD or SPECTATOR_SERVER or record_input is not None:
+            print("Board exports and input recording are off for a chunked world")
+
+    # Resume the last session, if there is one
+    store = SessionStore(SAVE_PATH)
+    snapshot = None
+    if world is None:
+        try:
+            snapshot = store.load()
+        except SnapshotError as e:
+            print(f"Ignoring saved session: {e}")
+    # recordings fix the seed of the sound effects, so replays are reproducible
+    seed = time.time_ns() % 2**32 if record_input is not None else None
+    if world is not None:
+        state = GameState(seed=seed, world=world)
+    elif snapshot is not None:
+        height, width = snapshot.grid.shape
+        state = GameState(width, height, seed=seed)
+    else:
+        state = GameState(seed=seed)
     view = GameView(state)
 
     # Implementation of NotificationService interface
@@ -42,33 +95,105 @@ def main() -> None:
     ) -> None:
         view.notification_manager.push(message, ntype, duration, item_sprite)
 
-    meta = MetaController(state, notifier)
+    # Lets the analysis worker wake up the idle main loop for its notifications
+    wakeup_event = pygame.event.custom_type()
+
+    def wakeup() -> None:
+        pygame.event.post(pygame.event.Event(wakeup_event))
+
+    meta = MetaController(state, notifier, wakeup=wakeup)
     # create access to the meta-data for the view
     view.add_meta_system(meta)
-
-    controller = GameController(state, view)
+    if snapshot is not None:
+        meta.restore_snapshot(snapshot)
+    autosaver = None
+    journal = None
+    if world is None:
+        autosaver = Autosaver(store, meta.capture_snapshot, AUTOSAVE_INTERVAL)
+        # History of this run for scrubbing back and forth
+        journal = GenerationJournal(JOURNAL_DIR, (state.height, state.width))
+        journal.attach(state)
+
+    # Optionally let other processes follow the live board
+    publisher = None
+    if SHARED_BOARD and world is None:
+        publisher = BoardPublisher(state.width, state.height)
+        publisher.attach(state)
+    spectators = None
+    if SPECTATOR_SERVER and world is None:
+        spectators = SpectatorServer()
+        spectators.attach(state)
+        print(f"Streaming to spectators on {spectators.address}")
+    metrics = None
+    if METRICS_SERVER:
+        metrics = MetricsServer(state, meta)
+        host, port = metrics.address[:2]
+        print(f"Serving metrics on http://{host}:{port}/metrics")
+
+    controller = GameController(state, view, journal)
+    input_recorder = None
+    if record_input is not None and world is None:
+        input_recorder = InputRecorder(record_input, state, meta, seed)
 
     clock = pygame.time.Clock()
     running = True
+    events = None
 
     while running:
         # 1. Handle input
-        running = controller.handle_events()
+        if input_recorder is not None:
+            events = input_recorder.capture(
+                pygame.event.get() if events is None else events
+            )
+        running = controller.handle_events(events)
 
         # 2. Update game state (if simulation is running)
         state.update()
 
         # 3. Check Meta-Progression (Achievements, Tutorial, etc.)
-        # meta.update() -> moved as subscriber of state
+        # meta.update() -> moved as subscriber of state, analysis runs on a worker
+        meta.dispatch_notifications()
+        if autosaver is not None:
+            autosaver.tick()
 
         # 4. Render
         view.draw()
 
-        # 5. Cap frame rate
+        # 5. Cap frame rate, or sleep until input/animations need a frame
         clock.tick(FPS)
-
+        events = None
+        next_frame = view.next_frame_in()
+        if running and next_frame != 0:
+            timeout = min(next_frame or IDLE_MAX_WAIT, IDLE_MAX_WAIT)
+            events = controller.wait_for_events(timeout)
+
+    if controller.recorder is not None:  # finish an unfinished recording
+        controller.recorder.detach()
+        controller.recorder.stop(wait=True)
+    if input_recorder is not None:
+        input_recorder.close()
+    if autosaver is not None:
+        autosaver.stop()  # writes a final save
+    meta.stop()
+    if journal is not None:
+        journal.close()
+    if world is not None:
+        world.close()  # flushes the world for the next session
+    if publisher is not None:
+        publisher.close()
+    if spectators is not None:
+        spectators.stop()
+    if metrics is not None:
+        metrics.stop()
     pygame.quit()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--record-input",
+        type=Path,
+        metavar="FILE",
+        help="record the input for `python -m core.services.input_replay`",
+    )
+    main(parser.parse_args().record_input)
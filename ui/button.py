@@ -3,6 +3,10 @@
 import pygame
 
 from ui.colors import BLACK, GRAY, WHITE
+from ui.fonts import get_font
+from ui.layer import CachedLayer
+
+SHADOW_OFFSET = 4
 
 
 class Button:
@@ -21,7 +25,7 @@ class Button:
         self.label = label
         self.icon = None
         self.icon_surface = None
-        self.font = pygame.font.SysFont("Arial", font_size, bold=True)
+        self.font = get_font(font_size, bold=True)
 
         if icon_path:
             self.icon_surface = pygame.image.load(icon_path).convert_alpha()
@@ -35,9 +39,30 @@ class Button:
         self.toggleable = toggleable
         self.toggled = False
         self.accent_color = accent_color
+        # the button (and its shadow) is pre-rendered per visual state
+        self.layer = CachedLayer(
+            (rect.width + SHADOW_OFFSET, rect.height + SHADOW_OFFSET),
+            self._render,
+            pygame.SRCALPHA,
+        )
+
+    @property
+    def render_key(self) -> tuple[bool, bool, bool]:
+        """Visual state of the button; the cached image changes only with it."""
+        return (self.enabled, self.hovered, self.toggleable and self.toggled)
+
+    @property
+    def image(self) -> pygame.Surface:
+        """Pre-rendered button including its shadow, anchored at `rect.topleft`."""
+        return self.layer.get(self.render_key)
 
     def draw(self, surface: pygame.Surface) -> None:
+        """Blit the cached button image."""
+        surface.blit(self.image, self.rect.topleft)
+
+    def _render(self, surface: pygame.Surface) -> None:
         """Render the button with brutalist styling."""
+        rect = pygame.Rect(0, 0, self.rect.width, self.rect.height)
         if not self.enabled:
             bg = (220, 220, 220)  # dimmed background
             border_color = (150, 150, 150)  # softer border
@@ -54,12 +79,11 @@ class Button:
             shadow_color = self.accent_color
 
         # Draw shadow (offset rectangle)
-        shadow_offset = 4
-        shadow_rect = self.rect.move(shadow_offset, shadow_offset)
+        shadow_rect = rect.move(SHADOW_OFFSET, SHADOW_OFFSET)
         pygame.draw.rect(surface, shadow_color, shadow_rect)
 
-        pygame.draw.rect(surface, bg, self.rect)
-        pygame.draw.rect(surface, border_color, self.rect, width=3)
+        pygame.draw.rect(surface, bg, rect)
+        pygame.draw.rect(surface, border_color, rect, width=3)
 
         # Render label or icon
         if self.icon_surface:
@@ -67,11 +91,11 @@ class Button:
             if not self.enabled:
                 # desaturate icon
                 icon.fill((180, 180, 180, 100), special_flags=pygame.BLEND_RGBA_MULT)
-            icon_rect = icon.get_rect(center=self.rect.center)
+            icon_rect = icon.get_rect(center=rect.center)
             surface.blit(icon, icon_rect)
         elif self.label:
             text = self.font.render(self.label, True, text_color)
-            text_rect = text.get_rect(center=self.rect.center)
+            text_rect = text.get_rect(center=rect.center)
             surface.blit(text, text_rect)
 
     def handle_event(self, event: pygame.event.Event) -> bool:
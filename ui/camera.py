@@ -0,0 +1,117 @@
+"""Camera mapping between board cells and screen pixels (zoom and pan)."""
+
+import math
+
+import pygame
+
+from utils.settings import TILE_SIZE, ZOOM_LEVELS
+
+
+class Camera:
+    """Viewport onto the board.
+
+    The zoom is expressed in screen pixels per cell and always taken from
+    `ZOOM_LEVELS`, so that it is either a whole number of pixels per cell or
+    a whole number of cells per pixel (level-of-detail rendering).
+    """
+
+    def __init__(
+        self,
+        board_size: tuple[int, int],
+        viewport: pygame.Rect,
+        zoom: float = TILE_SIZE,
+    ) -> None:
+        """Initialize the camera.
+
+        Args:
+            board_size (tuple[int, int]): Board width and height in cells.
+            viewport (pygame.Rect): Screen area the board is drawn into.
+            zoom (float): Initial pixels per cell (snapped to `ZOOM_LEVELS`).
+        """
+        self.board_width, self.board_height = board_size
+        self.viewport = viewport
+        self.level = min(
+            range(len(ZOOM_LEVELS)), key=lambda i: abs(ZOOM_LEVELS[i] - zoom)
+        )
+        # board coordinate (in cells) shown at the viewport's top-left corner
+        self.x = 0.0
+        self.y = 0.0
+        self.version = 0  # bumped on every zoom/pan
+        self._clamp()
+
+    @property
+    def zoom(self) -> float:
+        """Screen pixels per cell."""
+        return ZOOM_LEVELS[self.level]
+
+    @property
+    def cells_per_pixel(self) -> int:
+        """Block size for level-of-detail rendering (1 when zoomed in)."""
+        return max(1, round(1 / self.zoom))
+
+    def screen_to_cell(self, pos: tuple[int, int]) -> tuple[int, int] | None:
+        """Map a screen position to the board cell under it (None if outside)."""
+        if not self.viewport.collidepoint(pos):
+            return None
+        cx = math.floor(self.x + (pos[0] - self.viewport.x) / self.zoom)
+        cy = math.floor(self.y + (pos[1] - self.viewport.y) / self.zoom)
+        if 0 <= cx < self.board_width and 0 <= cy < self.board_height:
+            return cx, cy
+        return None
+
+    def cell_to_screen(self, cx: float, cy: float) -> tuple[int, int]:
+        """Map a board coordinate to its screen position."""
+        return (
+            round(self.viewport.x + (cx - self.x) * self.zoom),
+            round(self.viewport.y + (cy - self.y) * self.zoom),
+        )
+
+    def cells_to_screen_rect(self, cells: pygame.Rect) -> pygame.Rect:
+        """Map a rectangle of cells to the screen rectangle it covers."""
+        left, top = self.cell_to_screen(cells.left, cells.top)
+        right, bottom = self.cell_to_screen(cells.right, cells.bottom)
+        rect = pygame.Rect(left, top, max(right - left, 1), max(bottom - top, 1))
+        return rect.clip(self.viewport)
+
+    def visible_cells(self) -> pygame.Rect:
+        """Return the (clipped) rectangle of cells that is at least partly visible."""
+        x0 = max(0, math.floor(self.x))
+        y0 = max(0, math.floor(self.y))
+        x1 = min(self.board_width, math.ceil(self.x + self.viewport.w / self.zoom))
+        y1 = min(self.board_height, math.ceil(self.y + self.viewport.h / self.zoom))
+        return pygame.Rect(x0, y0, max(x1 - x0, 0), max(y1 - y0, 0))
+
+    def zoom_at(self, pos: tuple[int, int], steps: int) -> None:
+        """Zoom in (positive) or out (negative) keeping the cell under `pos` fixed."""
+        level = max(0, min(len(ZOOM_LEVELS) - 1, self.level + steps))
+        if level == self.level:
+            return
+        anchor_x = self.x + (pos[0] - self.viewport.x) / self.zoom
+        anchor_y = self.y + (pos[1] - self.viewport.y) / self.zoom
+        self.level = level
+        self.x = anchor_x - (pos[0] - self.viewport.x) / self.zoom
+        self.y = anchor_y - (pos[1] - self.viewport.y) / self.zoom
+        self._clamp()
+
+    def pan(self, dx: float, dy: float) -> None:
+        """Move the view by a screen-pixel offset (drag direction)."""
+        self.x -= dx / self.zoom
+        self.y -= dy / self.zoom
+        self._clamp()
+
+    def _clamp(self) -> None:
+        """Keep the board in view; center it if it is smaller than the viewport."""
+        view_w = self.viewport.w / self.zoom
+        view_h = self.viewport.h / self.zoom
+        if view_w >= self.board_width:
+            self.x = (self.board_width - view_w) / 2
+        else:
+            self.x = min(max(self.x, 0.0), self.board_width - view_w)
+        if view_h >= self.board_height:
+            self.y = (self.board_height - view_h) / 2
+        else:
+            self.y = min(max(self.y, 0.0), self.board_height - view_h)
+        # snap to whole screen pixels so cells stay aligned
+        self.x = round(self.x * self.zoom) / self.zoom
+        self.y = round(self.y * self.zoom) / self.zoom
+        self.version += 1
@@ -0,0 +1,48 @@
+"""Helpers to turn changed cells into a small set of screen regions."""
+
+import numpy as np
+import pygame
+
+
+def changed_cell_regions(changed: np.ndarray, block: int) -> list[pygame.Rect]:
+    """Merge changed cells into rectangles (in cell coordinates).
+
+    The board is divided into `block` x `block` cell blocks. Touched blocks
+    are merged into horizontal runs, and runs spanning the same columns in
+    consecutive block rows are merged vertically, which keeps the number of
+    rectangles small for typical clustered activity.
+
+    Args:
+        changed (np.ndarray): Boolean mask of cells that changed.
+        block (int): Edge length of a block in cells.
+
+    Returns:
+        list[pygame.Rect]: Regions covering all changed cells, clipped to the board.
+    """
+    height, width = changed.shape
+    rows, cols = -(-height // block), -(-width // block)
+    padded = np.zeros((rows * block, cols * block), dtype=bool)
+    padded[:height, :width] = changed
+    blocks = padded.reshape(rows, block, cols, block).any(axis=(1, 3))
+
+    regions: list[pygame.Rect] = []
+    open_runs: dict[tuple[int, int], pygame.Rect] = {}
+    for by in range(rows):
+        next_runs: dict[tuple[int, int], pygame.Rect] = {}
+        # run boundaries of the touched blocks in this block row
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], blocks[by], [0]))))
+        for start, stop in zip(edges[::2], edges[1::2], strict=True):
+            span = (int(start), int(stop))
+            rect = open_runs.pop(span, None)
+            if rect is None:
+                rect = pygame.Rect(span[0], by, span[1] - span[0], 0)
+                regions.append(rect)
+            rect.height += 1
+            next_runs[span] = rect
+        open_runs = next_runs
+
+    board = pygame.Rect(0, 0, width, height)
+    return [
+        pygame.Rect(r.x * block, r.y * block, r.w * block, r.h * block).clip(board)
+        for r in regions
+    ]
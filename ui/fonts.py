@@ -0,0 +1,37 @@
+"""Shared font registry and cache of rendered text surfaces.
+
+`pygame.font.SysFont` scans the installed system fonts and is far too slow
+to call per frame, and rendering the same label over and over wastes time and
+memory. All UI components get their fonts and static text from here.
+"""
+
+from functools import cache, lru_cache
+
+import pygame
+
+from utils.settings import TEXT_CACHE_SIZE
+
+DEFAULT_FONT = "arial"
+
+
+@cache
+def get_font(
+    size: int, bold: bool = False, name: str = DEFAULT_FONT
+) -> pygame.font.Font:
+    """Return the shared font object for a name, size and weight."""
+    return pygame.font.SysFont(name, size, bold=bold)
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def render_text(
+    text: str,
+    size: int,
+    color: tuple[int, int, int],
+    bold: bool = False,
+    name: str = DEFAULT_FONT,
+) -> pygame.Surface:
+    """Render (or fetch from the LRU cache) an anti-aliased text surface.
+
+    The returned surface is shared between callers and must not be drawn on.
+    """
+    return get_font(size, bold, name).render(text, True, color)
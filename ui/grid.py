@@ -1,49 +1,157 @@
 """Handles drawing the grid and live cells for the Game of Life."""
 
+import numpy as np
 import pygame
 
-from core.game_model import GameState
+from core.game_model import GameState, UpdateType
+from ui.camera import Camera
 from ui.colors import BLACK, LIGHTGRAY, WHITE
-from utils.settings import GRID_PIXEL_HEIGHT, GRID_PIXEL_WIDTH, TILE_SIZE
+from ui.layer import CachedLayer
+from utils.settings import GRID_LINE_MIN_ZOOM, LOD_POOLING
+
+# Colour of the 1px cell outline; one step below WHITE so that adding it onto
+# the (colour-keyed) white dead cells still yields the key colour.
+CELL_OUTLINE = (254, 254, 254)
 
 
 class GridRenderer:
     """Responsible for rendering the main simulation grid and cells."""
 
-    def __init__(self, state: GameState, screen: pygame.Surface) -> None:
+    def __init__(
+        self, state: GameState, screen: pygame.Surface, camera: Camera
+    ) -> None:
         self.state = state
         self.screen = screen
+        self.camera = camera
+
+        self.grid_layer = CachedLayer(camera.viewport.size, self._render_grid)
+        # Rendered cells of the visible region, reused until board or camera change
+        self.board_version = 0
+        self.cell_image: pygame.Surface | None = None
+        self.cell_key: tuple[int, int] | None = None
+        self.outline_key: tuple[int, int, int] | None = None
+        self.outline_mask: pygame.Surface | None = None
+
+        self.state.subscribe(self.on_state_change)
+
+    def on_state_change(self, update_type: UpdateType) -> None:
+        """Invalidate the rendered cells whenever the board changed."""
+        self.board_version += 1
+
+    def _build_cell_outline(self, cols: int, rows: int, zoom: int) -> pygame.Surface:
+        """Pre-render the per-cell outline mask that is added onto live cells."""
+        key = (cols, rows, zoom)
+        if key == self.outline_key and self.outline_mask is not None:
+            return self.outline_mask
+        width, height = cols * zoom, rows * zoom
+        mask = pygame.Surface((width, height))
+        mask.fill(BLACK)
+        for x in range(0, width, zoom):
+            for edge in (x, x + zoom - 1):
+                pygame.draw.line(mask, CELL_OUTLINE, (edge, 0), (edge, height - 1))
+        for y in range(0, height, zoom):
+            for edge in (y, y + zoom - 1):
+                pygame.draw.line(mask, CELL_OUTLINE, (0, edge), (width - 1, edge))
+        self.outline_key, self.outline_mask = key, mask
+        return mask
 
     def draw_background(self) -> None:
         """Fill the grid area background."""
         self.screen.fill(WHITE)
 
-    def draw_grid(self) -> None:
-        """Draw black brutalist-style grid lines and a border."""
+    def _render_grid(self, surface: pygame.Surface) -> None:
+        """Render the grid layer for the current camera: background, lines and border."""
+        surface.fill(WHITE)
+        camera = self.camera
+        origin_x, origin_y = camera.viewport.topleft
+        visible = camera.visible_cells()
         line_color = LIGHTGRAY
         line_width = 2
-        for x in range(0, GRID_PIXEL_WIDTH + 1, TILE_SIZE):
-            pygame.draw.line(
-                self.screen, line_color, (x, 0), (x, GRID_PIXEL_HEIGHT), line_width
-            )
-        for y in range(0, GRID_PIXEL_HEIGHT + 1, TILE_SIZE):
-            pygame.draw.line(
-                self.screen, line_color, (0, y), (GRID_PIXEL_WIDTH, y), line_width
-            )
-        pygame.draw.rect(
-            self.screen,
-            BLACK,
-            pygame.Rect(0, 0, GRID_PIXEL_WIDTH, GRID_PIXEL_HEIGHT),
-            2,
+        if camera.zoom >= GRID_LINE_MIN_ZOOM:
+            top = camera.cell_to_screen(0, visible.top)[1] - origin_y
+            bottom = camera.cell_to_screen(0, visible.bottom)[1] - origin_y
+            left = camera.cell_to_screen(visible.left, 0)[0] - origin_x
+            right = camera.cell_to_screen(visible.right, 0)[0] - origin_x
+            for cx in range(visible.left, visible.right + 1):
+                x = camera.cell_to_screen(cx, 0)[0] - origin_x
+                pygame.draw.line(surface, line_color, (x, top), (x, bottom), line_width)
+            for cy in range(visible.top, visible.bottom + 1):
+                y = camera.cell_to_screen(0, cy)[1] - origin_y
+                pygame.draw.line(surface, line_color, (left, y), (right, y), line_width)
+        board = camera.cells_to_screen_rect(
+            pygame.Rect(0, 0, camera.board_width, camera.board_height)
+        )
+        pygame.draw.rect(surface, BLACK, board.move(-origin_x, -origin_y), 2)
+
+    def draw_grid(self) -> None:
+        """Draw black brutalist-style grid lines and a border."""
+        self.screen.blit(
+            self.grid_layer.get(self.camera.version), self.camera.viewport.topleft
         )
 
     def draw_cells(self) -> None:
-        """Render all active cells."""
-        for y in range(self.state.height):
-            for x in range(self.state.width):
-                if self.state.grid[y, x] == 1:
-                    rect = pygame.Rect(
-                        x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE
-                    )
-                    pygame.draw.rect(self.screen, BLACK, rect)
-                    pygame.draw.rect(self.screen, WHITE, rect, 1)
+        """Render all active cells inside the camera's viewport.
+
+        Only the visible part of the board is rendered and it is re-rendered
+        only if the board or the camera changed, so the cost does not depend
+        on the board size or the number of live cells.
+        """
+        key = (self.board_version, self.camera.version)
+        if key != self.cell_key:
+            self.cell_image = self._render_cells()
+            self.cell_key = key
+        if self.cell_image is None:
+            return
+        visible = self.camera.visible_cells()
+        self.screen.set_clip(self.camera.viewport)
+        self.screen.blit(
+            self.cell_image, self.camera.cell_to_screen(visible.left, visible.top)
+        )
+        self.screen.set_clip(None)
+
+    def _render_cells(self) -> pygame.Surface | None:
+        """Render the visible cells into a surface (dead cells are colour-keyed)."""
+        visible = self.camera.visible_cells()
+        if visible.w == 0 or visible.h == 0:
+            return None
+        # only the visible cells are read, e.g. from the chunks of a world
+        cells = self.state.read_window(visible.left, visible.top, visible.w, visible.h)
+
+        if self.camera.zoom >= 1:
+            # one pixel per cell, scaled up to the zoom in a single call
+            zoom = int(self.camera.zoom)
+            small = pygame.Surface((visible.w, visible.h))
+            pixels = np.where(cells.T == 1, small.map_rgb(BLACK), small.map_rgb(WHITE))
+            pygame.surfarray.blit_array(small, pixels)
+            image = pygame.transform.scale(small, (visible.w * zoom, visible.h * zoom))
+            if zoom >= GRID_LINE_MIN_ZOOM:
+                outline = self._build_cell_outline(visible.w, visible.h, zoom)
+                image.blit(outline, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+        else:
+            image = self._render_density(cells, self.camera.cells_per_pixel)
+        image.set_colorkey(WHITE)
+        return image
+
+    def _render_density(self, cells: np.ndarray, block: int) -> pygame.Surface:
+        """Downsample the cells into one pixel per `block` x `block` cells."""
+        rows, cols = -(-cells.shape[0] // block), -(-cells.shape[1] // block)
+        if cells.shape != (rows * block, cols * block):
+            padded = np.zeros((rows * block, cols * block), dtype=cells.dtype)
+            padded[: cells.shape[0], : cells.shape[1]] = cells
+            cells = padded
+        # Fold the rows of each block with strided slices first, which is much
+        # faster than reducing a 4D reshape, then pool the columns.
+        mean = LOD_POOLING == "mean"
+        fold = np.add if mean else np.maximum
+        pooled = cells[0::block].astype(np.uint16 if mean else cells.dtype)
+        for i in range(1, block):
+            fold(pooled, cells[i::block], out=pooled)
+        pooled = pooled.reshape(rows, cols, block)
+        if mean:
+            density = pooled.sum(axis=2) / block**2
+        else:
+            density = pooled.max(axis=2)
+        shade = (255 * (1 - density)).astype(np.uint8).T
+        image = pygame.Surface((cols, rows))
+        pygame.surfarray.blit_array(image, np.dstack((shade, shade, shade)))
+        return image
@@ -0,0 +1,47 @@
+"""Cached, pre-rendered surfaces for static or rarely changing UI layers."""
+
+from collections.abc import Callable, Hashable
+
+import pygame
+
+_UNRENDERED = object()
+
+
+class CachedLayer:
+    """A surface that is only re-rendered when its state key changes.
+
+    Widgets describe their visual state as a hashable key (hover, toggle,
+    unlocked entries, ...). As long as the key stays the same, `get` simply
+    returns the surface rendered last time, so drawing the layer costs a blit.
+    """
+
+    def __init__(
+        self,
+        size: tuple[int, int],
+        render: Callable[[pygame.Surface], None],
+        flags: int = 0,
+    ) -> None:
+        """Create the layer.
+
+        Args:
+            size (tuple[int, int]): Size of the cached surface in pixels.
+            render (Callable): Draws the layer content onto the given surface.
+            flags (int): Surface flags, e.g. `pygame.SRCALPHA` for translucent layers.
+        """
+        self.surface = pygame.Surface(size, flags)
+        self.render = render
+        self.key: Hashable = _UNRENDERED
+        self.version = 0  # bumped on every re-render
+
+    def get(self, key: Hashable = None) -> pygame.Surface:
+        """Return the layer surface, re-rendering it if `key` changed."""
+        if self.key is _UNRENDERED or key != self.key:
+            self.surface.fill((0, 0, 0, 0))
+            self.render(self.surface)
+            self.key = key
+            self.version += 1
+        return self.surface
+
+    def invalidate(self) -> None:
+        """Force a re-render on the next `get`."""
+        self.key = _UNRENDERED
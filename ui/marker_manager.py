@@ -3,6 +3,7 @@
 import pygame
 
 from ui.colors import RED
+from ui.fonts import render_text
 from utils.settings import TILE_SIZE
 
 
@@ -12,6 +13,8 @@ class MarkerManager:
     def __init__(self, screen: pygame.Surface) -> None:
         self.screen = screen
         self.markers: list[dict] = []
+        # screen areas covered in the last draw (for dirty-rect presentation)
+        self.drawn_rects: list[pygame.Rect] = []
 
     def create_marker(self, pos: tuple[int, int], symbol: str = "!") -> None:
         """Create a new marker at a grid position."""
@@ -28,6 +31,7 @@ class MarkerManager:
         """Draw all active markers."""
         now = pygame.time.get_ticks() / 1000.0
         remaining = []
+        self.drawn_rects = []
 
         for m in self.markers:
             elapsed = now - m["created"]
@@ -37,16 +41,21 @@ class MarkerManager:
 
         self.markers = remaining
 
+    def next_change_in(self) -> float | None:
+        """Seconds until the next marker expires (None without markers)."""
+        now = pygame.time.get_ticks() / 1000.0
+        expiries = [m["created"] + m["lifetime"] - now for m in self.markers]
+        return max(0.0, min(expiries)) if expiries else None
+
     def _draw_marker(self, pos: tuple[int, int], symbol: str) -> None:
         """Draw a single marker centered above a cell."""
         x, y = pos
-        font = pygame.font.SysFont("arial", int(TILE_SIZE * 2), bold=True)
-        text = font.render(symbol, True, RED)
+        text = render_text(symbol, int(TILE_SIZE * 2), RED, bold=True)
         rect = text.get_rect()
         # The follwoing code wants a grid-position instead of a real-position
         # rect.center = (x * TILE_SIZE + TILE_SIZE // 2, y * TILE_SIZE - TILE_SIZE // 2)
         rect.center = (x + TILE_SIZE, y - TILE_SIZE)
-        self.screen.blit(text, rect)
+        self.drawn_rects.append(self.screen.blit(text, rect))
 
     def clear(self) -> None:
         """Remove all markers."""
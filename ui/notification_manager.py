@@ -1,10 +1,17 @@
 import time
+from collections import OrderedDict
 from enum import Enum
 
 import pygame
 
 from ui.colors import ACHIEVEMENT_COLOUR, BLACK, RULE_COLOUR, TUTORIAL_COLOUR, WHITE
+from ui.fonts import render_text
 from ui.utils import tint_surface
+from utils.settings import NOTIFICATION_CACHE_SIZE
+
+FONT_SIZE = 18
+FADE_DURATION = 0.5  # seconds a notification fades out before expiring
+SHADOW_OFFSET = 5
 
 
 class NotificationType(Enum):
@@ -38,6 +45,9 @@ class Notification:
         self.position = "bottom-right"
         self.icon_surface: pygame.Surface | None = None
         self.icon_tint = (0, 0, 0)
+        # identifies the rendered card: same content and style, same card
+        # (Surfaces hash by identity, and the key keeps the sprite alive)
+        self.card_key = (text, ntype, icon_sprite)
 
         self._init_visuals(icon_sprite)
 
@@ -73,8 +83,12 @@ class NotificationManager:
 
     def __init__(self, screen: pygame.Surface) -> None:
         self.screen = screen
-        self.font = pygame.font.SysFont("arial", 18)
         self.active_notifications: list[Notification] = []
+        # screen areas covered in the last draw (for dirty-rect presentation)
+        self.drawn_rects: list[pygame.Rect] = []
+        # pre-rendered cards (LRU) and shadows, faded via surface alpha on blit
+        self.card_cache: OrderedDict[tuple, pygame.Surface] = OrderedDict()
+        self.shadow_cache: dict[tuple[int, int], pygame.Surface] = {}
 
     def push(
         self,
@@ -91,6 +105,7 @@ class NotificationManager:
     def draw(self) -> None:
         """Render and manage fading notifications on screen."""
         now = time.time()
+        self.drawn_rects = []
         self.active_notifications = [
             n for n in self.active_notifications if not n.expired
         ]
@@ -113,6 +128,60 @@ class NotificationManager:
                 continue
             self._draw_group(group, pos, now)
 
+    def next_change_in(self, now: float) -> float | None:
+        """Seconds until the notifications need a redraw (0 while fading)."""
+        fades = [
+            n.start_time + n.duration - FADE_DURATION - now
+            for n in self.active_notifications
+        ]
+        return max(0.0, min(fades)) if fades else None
+
+    def _card(self, notification: Notification) -> pygame.Surface:
+        """Return the rendered card for a notification, using the LRU cache."""
+        card = self.card_cache.get(notification.card_key)
+        if card is not None:
+            self.card_cache.move_to_end(notification.card_key)
+            return card
+
+        card = self._render_card(notification)
+        self.card_cache[notification.card_key] = card
+        if len(self.card_cache) > NOTIFICATION_CACHE_SIZE:
+            self.card_cache.popitem(last=False)
+        return card
+
+    def _render_card(self, notification: Notification) -> pygame.Surface:
+        """Render background, border, icon and text of a notification."""
+        text_surface = render_text(
+            notification.text, FONT_SIZE, notification.text_color
+        )
+
+        # compute background size with icon spacing
+        icon_w = 0
+        if notification.icon_surface:
+            icon_w = notification.icon_surface.get_width() + 16
+        bg_w = text_surface.get_width() + icon_w + 40
+        bg_h = text_surface.get_height() + 20
+
+        card = pygame.Surface((bg_w, bg_h))
+        card.fill(notification.bg_color)
+        pygame.draw.rect(card, notification.border_color, card.get_rect(), 3)
+        if notification.icon_surface:
+            icon = notification.icon_surface
+            card.blit(icon, (12, (bg_h - icon.get_height()) // 2))
+            card.blit(text_surface, (12 + icon_w, 8))
+        else:
+            card.blit(text_surface, (20, 8))
+        return card
+
+    def _shadow(self, size: tuple[int, int]) -> pygame.Surface:
+        """Return the (cached) drop shadow for a card size."""
+        shadow = self.shadow_cache.get(size)
+        if shadow is None:
+            shadow = pygame.Surface(size)
+            shadow.fill((0, 0, 0))
+            self.shadow_cache[size] = shadow
+        return shadow
+
     def _draw_group(self, group: list[Notification], pos: str, now: float) -> None:
         """Render a stacked group of notifications for a given corner."""
         # determine stacking origin
@@ -121,66 +190,41 @@ class NotificationManager:
 
         if "top" in pos:
             y_offset = padding
-            y_dir = 1
         else:
             y_offset = screen_h - padding
-            y_dir = -1
 
         for notification in reversed(group):
             age = now - notification.start_time
             alpha = 255
-            if notification.duration - age < 0.5:
-                alpha = int(255 * ((notification.duration - age) / 0.5))
+            if notification.duration - age < FADE_DURATION:
+                alpha = int(255 * ((notification.duration - age) / FADE_DURATION))
             alpha = max(alpha, 0)
 
-            # text surface
-            text_surface = self.font.render(
-                notification.text, True, notification.text_color
-            )
-            text_surface.set_alpha(alpha)
-
-            # compute background size with icon spacing
-            icon_w = 0
-            if notification.icon_surface:
-                icon_w = notification.icon_surface.get_width() + 16
-            bg_w = text_surface.get_width() + icon_w + 40
-            bg_h = text_surface.get_height() + 20
-
-            # base + shadow
-            bg_surface = pygame.Surface((bg_w, bg_h))
-            bg_surface.fill(notification.bg_color)
-            pygame.draw.rect(
-                bg_surface, notification.border_color, bg_surface.get_rect(), 3
-            )
-
-            shadow_offset = 5
-            shadow = pygame.Surface((bg_w, bg_h))
-            shadow.fill(notification.shadow_color)
-            shadow.set_alpha(int(alpha * 0.3))
+            card = self._card(notification)
+            bg_w, bg_h = card.get_size()
+            shadow = self._shadow((bg_w, bg_h))
 
             # compute x position
             if "left" in pos:
                 x = 20
             elif "center" in pos:
-                x = (screen_w - bg_surface.get_width()) // 2
+                x = (screen_w - bg_w) // 2
             else:
-                x = screen_w - bg_surface.get_width() - 20
+                x = screen_w - bg_w - 20
 
             # compute y position (stack vertically)
             if "top" in pos:
                 y = y_offset
-                y_offset += bg_surface.get_height() + 10
+                y_offset += bg_h + 10
             else:
-                y_offset -= bg_surface.get_height() + 10
+                y_offset -= bg_h + 10
                 y = y_offset
 
-                # blit
-            self.screen.blit(shadow, (x + shadow_offset, y + shadow_offset))
-            self.screen.blit(bg_surface, (x, y))
-            if notification.icon_surface:
-                icon = notification.icon_surface.copy()
-                icon.set_alpha(alpha)
-                self.screen.blit(icon, (x + 12, y + (bg_h - icon.get_height()) // 2))
-                self.screen.blit(text_surface, (x + 12 + icon_w, y + 8))
-            else:
-                self.screen.blit(text_surface, (x + 20, y + 8))
+            # blit, fading is applied through the surface alpha
+            self.drawn_rects.append(
+                pygame.Rect(x, y, bg_w + SHADOW_OFFSET, bg_h + SHADOW_OFFSET)
+            )
+            shadow.set_alpha(int(alpha * 0.3))
+            self.screen.blit(shadow, (x + SHADOW_OFFSET, y + SHADOW_OFFSET))
+            card.set_alpha(alpha)
+            self.screen.blit(card, (x, y))
@@ -11,8 +11,10 @@ from ui.colors import (
     RULE_COLOUR,
     WHITE,
 )
+from ui.fonts import get_font
 from ui.icons import ACHIEVEMENT_ICON_PATH, RULE_ICON_PATH
-from ui.utils import tint_surface
+from ui.layer import CachedLayer
+from ui.utils import load_icon, tint_surface
 
 
 class Overlay:
@@ -23,16 +25,22 @@ class Overlay:
         self.width = width
         self.height = height
         self.visible = False
-        self.font = pygame.font.SysFont("Arial", 22, bold=True)
-        self.desc_font = pygame.font.SysFont("Arial", 18, bold=True)
+        self.font = get_font(22, bold=True)
+        self.desc_font = get_font(18, bold=True)
+        self.layer = CachedLayer((width, height), self.render, pygame.SRCALPHA)
 
     def draw(self) -> None:
+        """Blit the overlay, re-rendering it only when its content changed."""
+        self.surface.blit(self.layer.get(self.content_key()), (0, 0))
+
+    def content_key(self) -> tuple:
+        """Hashable description of the overlay content (e.g. unlocked entries)."""
+        return ()
+
+    def render(self, surface: pygame.Surface) -> None:
         """Draw a semi-transparent layer (base)."""
-        overlay_surface = pygame.Surface((self.width, self.height))
-        overlay_surface.set_alpha(230)
-        overlay_surface.fill(WHITE)
-        self.surface.blit(overlay_surface, (0, 0))
-        pygame.draw.rect(self.surface, BLACK, (0, 0, self.width, self.height), 3)
+        surface.fill((*WHITE, 230))
+        pygame.draw.rect(surface, BLACK, (0, 0, self.width, self.height), 3)
 
     def set_visible(self, visible: bool) -> None:
         self.visible = visible
@@ -50,27 +58,29 @@ class AchievementsOverlay(Overlay):
     ) -> None:
         super().__init__(surface, width, height)
         self.achievements = achievements
-        self.icon = pygame.image.load(ACHIEVEMENT_ICON_PATH).convert_alpha()
+        self.icon = load_icon(ACHIEVEMENT_ICON_PATH)
         self.tint = ACHIEVEMENT_COLOUR
-        self.icon = pygame.transform.smoothscale(self.icon, (32, 32))
         self.icon = tint_surface(self.icon, self.tint)
 
-    def draw(self) -> None:
-        super().draw()
+    def content_key(self) -> tuple:
+        return tuple(self.achievements.unlocked)
+
+    def render(self, surface: pygame.Surface) -> None:
+        super().render(surface)
         # header
         header_rect = pygame.Rect(0, 0, self.width, 100)
-        pygame.draw.rect(self.surface, WHITE, header_rect)
-        pygame.draw.rect(self.surface, BLACK, header_rect, 6)
+        pygame.draw.rect(surface, WHITE, header_rect)
+        pygame.draw.rect(surface, BLACK, header_rect, 6)
 
         # icon + title
-        self.surface.blit(self.icon, (40, 34))
+        surface.blit(self.icon, (40, 34))
         title = self.font.render("Unlocked Achievements", True, BLACK)
-        self.surface.blit(title, (100, 40))
+        surface.blit(title, (100, 40))
 
         # check if any achievements exist
         if not self.achievements.unlocked:
             placeholder = self.font.render("None yet...", True, GRAY)
-            self.surface.blit(
+            surface.blit(
                 placeholder,
                 (
                     self.width // 2 - placeholder.get_width() // 2,
@@ -81,7 +91,7 @@ class AchievementsOverlay(Overlay):
 
         # entries
         y_base = 140
-        for i, key in enumerate(self.achievements.unlocked or ["None yet..."]):
+        for i, key in enumerate(tuple(self.achievements.unlocked)):
             ach = self.achievements.achievements.get(key)
             if not ach:
                 continue
@@ -89,15 +99,15 @@ class AchievementsOverlay(Overlay):
             y = y_base + i * 60  # extra spacing for description line
 
             # coloured square accent (as before)
-            pygame.draw.rect(self.surface, self.tint, (80, y + 8, 20, 20))
+            pygame.draw.rect(surface, self.tint, (80, y + 8, 20, 20))
 
             # title (same position as before)
             title_surf = self.font.render(ach.title, True, BLACK)
-            self.surface.blit(title_surf, (120, y))
+            surface.blit(title_surf, (120, y))
 
             # description line below title
             desc_surf = self.desc_font.render(ach.description, True, GRAY)
-            self.surface.blit(desc_surf, (120, y + 28))
+            surface.blit(desc_surf, (120, y + 28))
 
 
 class RulesOverlay(Overlay):
@@ -108,27 +118,29 @@ class RulesOverlay(Overlay):
     ) -> None:
         super().__init__(surface, width, height)
         self.rules = rules
-        self.icon = pygame.image.load(RULE_ICON_PATH).convert_alpha()
+        self.icon = load_icon(RULE_ICON_PATH)
         self.tint = RULE_COLOUR
-        self.icon = pygame.transform.smoothscale(self.icon, (32, 32))
         self.icon = tint_surface(self.icon, self.tint)
 
-    def draw(self) -> None:
-        super().draw()
+    def content_key(self) -> tuple:
+        return tuple(self.rules.unlocked)
+
+    def render(self, surface: pygame.Surface) -> None:
+        super().render(surface)
         # header
         header_rect = pygame.Rect(0, 0, self.width, 100)
-        pygame.draw.rect(self.surface, WHITE, header_rect)
-        pygame.draw.rect(self.surface, BLACK, header_rect, 6)
+        pygame.draw.rect(surface, WHITE, header_rect)
+        pygame.draw.rect(surface, BLACK, header_rect, 6)
 
         # Icon + Heading
-        self.surface.blit(self.icon, (40, 34))
+        surface.blit(self.icon, (40, 34))
         title = self.font.render("Discovered Rules", True, BLACK)
-        self.surface.blit(title, (100, 40))
+        surface.blit(title, (100, 40))
 
         # no rules yet
         if not self.rules.unlocked:
             placeholder = self.font.render("No rules discovered.", True, GRAY)
-            self.surface.blit(
+            surface.blit(
                 placeholder,
                 (
                     self.width // 2 - placeholder.get_width() // 2,
@@ -139,14 +151,14 @@ class RulesOverlay(Overlay):
 
         # list entries
         y_base = 140
-        for i, key in enumerate(self.rules.unlocked):
+        for i, key in enumerate(tuple(self.rules.unlocked)):
             rule = self.rules.rules.get(key)
             if not rule:
                 continue
 
             y = y_base + i * 60
-            pygame.draw.rect(self.surface, self.tint, (80, y + 8, 20, 20))
+            pygame.draw.rect(surface, self.tint, (80, y + 8, 20, 20))
             title_surf = self.font.render(rule.title, True, BLACK)
-            self.surface.blit(title_surf, (120, y))
+            surface.blit(title_surf, (120, y))
             desc_surf = self.desc_font.render(rule.description, True, GRAY)
-            self.surface.blit(desc_surf, (120, y + 28))
+            surface.blit(desc_surf, (120, y + 28))
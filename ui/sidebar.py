@@ -9,6 +9,7 @@ import pygame
 from core.game_model import GameState
 from ui.button import Button
 from ui.colors import ACHIEVEMENT_COLOUR, BLACK, RULE_COLOUR, WHITE
+from ui.layer import CachedLayer
 
 
 class Sidebar:
@@ -70,13 +71,23 @@ class Sidebar:
             ),
         }
 
+        self.layer = CachedLayer(self.rect.size, self._render)
+
     def draw(self) -> None:
-        """Render the sidebar UI elements."""
-        pygame.draw.rect(self.surface, WHITE, self.rect)
-        pygame.draw.rect(self.surface, BLACK, self.rect, width=3)
+        """Blit the sidebar, re-rendering it only if a button changed its look."""
+        key = tuple(button.render_key for button in self.buttons.values())
+        self.surface.blit(self.layer.get(key), self.rect.topleft)
+
+    def _render(self, surface: pygame.Surface) -> None:
+        """Render the sidebar UI elements into the cached layer."""
+        local_rect = surface.get_rect()
+        pygame.draw.rect(surface, WHITE, local_rect)
+        pygame.draw.rect(surface, BLACK, local_rect, width=3)
 
         for button in self.buttons.values():
-            button.draw(self.surface)
+            surface.blit(
+                button.image, button.rect.move(-self.rect.x, -self.rect.y).topleft
+            )
 
     def handle_event(self, event: pygame.event.Event) -> str | None:
         """Delegate events only if relevant buttons are enabled."""
@@ -1,6 +1,15 @@
+from functools import cache
+
 import pygame
 
 
+@cache
+def load_icon(path: str, size: int = 32) -> pygame.Surface:
+    """Load and scale an icon once per process (shared, must not be drawn on)."""
+    icon = pygame.image.load(path).convert_alpha()
+    return pygame.transform.smoothscale(icon, (size, size))
+
+
 def tint_surface(
     surface: pygame.Surface, tint_color: tuple[int, int, int]
 ) -> pygame.Surface:
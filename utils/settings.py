@@ -1,14 +1,24 @@
 """Constants used across the Game of Life simulation."""
 
 # Cells
-TILE_SIZE = 25
+TILE_SIZE = 25  # initial zoom (pixels per cell)
 
 # Grid dimensions (in cells)
 GRID_WIDTH = 40
 GRID_HEIGHT = 30
-# Grid dimensions (in pixel)
-GRID_PIXEL_WIDTH = GRID_WIDTH * TILE_SIZE
-GRID_PIXEL_HEIGHT = GRID_HEIGHT * TILE_SIZE
+# Grid viewport dimensions (in pixel), independent of the board size
+GRID_PIXEL_WIDTH = 1000
+GRID_PIXEL_HEIGHT = 750
+
+# Camera
+# pixels per cell; fractions are level-of-detail zooms (one pixel per 1/x cells)
+ZOOM_LEVELS = (
+    *(1 / 2**i for i in range(7, 0, -1)),
+    *(1, 2, 3, 4, 6, 8, 12, 16, 25, 32, 48, 64),
+)
+GRID_LINE_MIN_ZOOM = 6  # hide grid lines and cell outlines below this zoom
+LOD_POOLING = "max"  # "max" keeps single cells visible, "mean" shows density
+PAN_STEP = 50  # pixels per arrow-key press
 # Sidebar dimensions (in pixels)
 SIDEBAR_WIDTH = 200
 
@@ -19,3 +29,104 @@ TOTAL_HEIGHT = GRID_PIXEL_HEIGHT
 # Game Speed
 FPS = 30
 STEP_INTERVAL = 0.3  # seconds per simulation step
+IDLE_MAX_WAIT = 5.0  # seconds the idle loop may block waiting for input
+
+# Sound
+SYNTH_BUFFER_MS = 150  # length of the synthesized sound of one generation
+SYNTH_VOLUME = 0.5  # peak level of the synthesized effects (0-1)
+
+# Meta-Progression
+META_QUEUE_SIZE = 4  # pending generations before the analysis worker drops some
+META_FRAME_BUDGET = 0.008  # seconds of analysis per frame (1 / FPS)
+META_SCAN_ROWS = 64  # board rows searched for patterns per analysis slice
+META_MAX_STRIDE = 64  # analyze at least every n-th generation when falling behind
+
+# Presentation
+DIRTY_RECTS = True  # only push changed screen areas to the display
+DIRTY_BLOCK_SIZE = 8  # cells per edge of a dirty-region block
+DIRTY_MAX_FRACTION = 0.4  # dirty area (of the window) above which we flip fully
+
+# Simulation engines (see core/engines)
+# auto | dense | packed | sparse | tiled | parallel | memo | numba | cluster
+ENGINE = "auto"
+ENGINE_CALIBRATION_PATH = "engine_calibration.json"  # cached per machine
+ENGINE_CALIBRATION_SIZES = (64, 256, 1024)  # board edges timed at calibration
+ENGINE_CALIBRATION_DENSITIES = (0.02, 0.1, 0.35)  # initial soup densities timed
+ENGINE_CALIBRATION_TIME = 0.02  # seconds of stepping per engine and board
+ENGINE_REEVALUATE_INTERVAL = 50  # generations between engine re-evaluations
+ENGINE_SWITCH_GAIN = 1.2  # predicted speedup needed to switch engines
+ENGINE_TILE_SIZE = 32  # cells per tile edge of the tiled engine
+ENGINE_MIN_BAND_ROWS = 64  # rows per band (at least) of the parallel engine
+ENGINE_MEMO_CACHE_SIZE = 1 << 16  # tile transitions kept by the memo engine
+
+# Multiple worlds (see core/services/world_scheduler.py)
+WORLD_FRAME_BUDGET = 0.02  # seconds of stepping per frame, shared by all worlds
+WORLD_MAX_LAG = 1.0  # seconds a world may fall behind before generations are skipped
+WORLD_MISSED_NOTIFICATIONS = 3  # off-screen notifications shown when focusing a world
+
+# Cluster backend (ENGINE = "cluster", see core/services/cluster.py)
+CLUSTER_WORKERS = 4  # worker processes, one rectangular block of the board each
+CLUSTER_HOST = "127.0.0.1"  # coordinator address, "0.0.0.0" to accept other nodes
+CLUSTER_PORT = 0  # 0 picks a free port (local workers only)
+CLUSTER_SPAWN = True  # start local workers, otherwise wait for remote ones
+CLUSTER_TIMEOUT = 10.0  # seconds without an answer before a worker counts as failed
+CLUSTER_CHECKPOINT_INTERVAL = 100  # generations between checkpoints of the blocks
+CLUSTER_CHECKPOINT_DIR = "cluster_checkpoints"
+
+# Persistence
+SAVE_PATH = "savegame.gols"
+AUTOSAVE_INTERVAL = 30.0  # seconds between background saves
+
+# History (rewind and scrubbing)
+JOURNAL_DIR = "journal"
+JOURNAL_KEYFRAME_INTERVAL = 64  # generations between full boards in the journal
+JOURNAL_BUDGET = 64 * 2**20  # bytes on disk before the oldest history is dropped
+
+# Live board export (shared memory, for external tools)
+SHARED_BOARD = False  # publish the board for `python -m core.services.shared_board`
+SHARED_BOARD_NAME = "game_of_life_board"
+
+# Spectator streaming (TCP)
+SPECTATOR_SERVER = False  # for `python -m core.services.spectator_server`
+SPECTATOR_HOST = "127.0.0.1"
+SPECTATOR_PORT = 7667
+SPECTATOR_CLIENT_QUEUE = 32  # messages a spectator may lag behind before skipping
+
+# Metrics endpoint (Prometheus text format, see core/services/metrics.py)
+METRICS_SERVER = False  # serve http://METRICS_HOST:METRICS_PORT/metrics
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9464
+
+# Chunked world store (boards larger than memory)
+WORLD_CHUNK_SIZE = 64  # cells per chunk edge
+WORLD_REGION_SIZE = 32  # chunks per region file edge
+WORLD_CACHE_CHUNKS = 4096  # unpacked chunks kept in memory
+WORLD_OPEN_REGIONS = 64  # region files kept memory-mapped
+WORLD_DIRECTORY = None  # play on a chunked world in this directory, not in memory
+WORLD_WIDTH = 65536  # cells, a multiple of WORLD_CHUNK_SIZE
+WORLD_HEIGHT = 65536
+WORLD_ANALYSIS_CHUNKS = 64  # changed chunks per generation handed to the analyzers
+WORLD_ANALYSIS_MARGIN = 8  # cells around each of them (> largest pattern extent)
+
+# Soup search (headless census, `python -m core.services.soup_search`)
+SEARCH_SOUP_SIZE = 16  # cells per edge of a random soup
+SEARCH_DENSITY = 0.5  # chance of a soup cell being alive
+SEARCH_BOARD_SIZE = 96  # torus the soups evolve on
+SEARCH_MAX_GENERATIONS = 4000  # soups still active after this count as unstable
+SEARCH_MAX_PERIOD = 15  # longest oscillator period that counts as stable
+SEARCH_BATCH = 64  # soups stepped together per worker task
+SEARCH_SAMPLES = 3  # soup numbers kept per object, to reproduce rare finds
+
+# Pattern catalogue (see core/catalogue.py)
+PATTERN_CATALOGUE_PATH = "patterns.sqlite"  # built on the first start
+PATTERN_HOT_CACHE_SIZE = 4096  # recent lookups kept in memory
+
+# Recording
+RECORDINGS_DIR = "recordings"
+RECORDING_FORMAT = "frames"  # frames | gif | apng (need Pillow) | board
+RECORDER_QUEUE_SIZE = 64  # frames waiting for the encoder before dropping
+RECORDER_MAX_STRIDE = 16  # record at least every n-th generation under load
+
+# Caches
+TEXT_CACHE_SIZE = 256  # rendered text surfaces
+NOTIFICATION_CACHE_SIZE = 32  # rendered notification cards